@@ -0,0 +1,101 @@
+"""
+Access token verification throughput.
+
+    python -m src.benchmarks.access_tokens --tokens 2000 --rounds 20
+
+Compares the cached-key verifier with a naive one that decodes the header
+and derives the HMAC key for every token, and with the per-request
+user + group lookup the tokens replace.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database.models.base import Base
+from src.database.models.users import UserGroupEnum, UserGroupModel, UserModel
+from src.database.synthetic import seed_synthetic
+from src.security.access_tokens import AccessTokenManager, Denylist, KeyRing
+
+SECRET = "benchmark-secret"
+
+
+def naive_verify(token: str) -> dict:
+    def decode(segment: str) -> bytes:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+    header, payload, signature = token.split(".")
+    if json.loads(decode(header))["alg"] != "HS256":
+        raise ValueError("Unexpected algorithm.")
+    expected = hmac.new(
+        SECRET.encode(), f"{header}.{payload}".encode(), hashlib.sha256
+    ).digest()
+    if not hmac.compare_digest(expected, decode(signature)):
+        raise ValueError("Invalid signature.")
+    claims = json.loads(decode(payload))
+    if claims["exp"] <= time.time():
+        raise ValueError("Token has expired.")
+    return claims
+
+
+def measure(verify: Callable[[str], object], tokens: list[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            verify(token)
+    return len(tokens) * rounds / (time.perf_counter() - started)
+
+
+async def measure_db_lookup(users: int, lookups: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'tokens.db')}"
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await seed_synthetic(connection, users * 10)
+        stmt = select(UserModel.is_active, UserGroupModel.name).join(
+            UserGroupModel, UserModel.group_id == UserGroupModel.id
+        )
+        async with AsyncSession(engine) as session:
+            started = time.perf_counter()
+            for index in range(lookups):
+                await session.execute(stmt.where(UserModel.id == index % users + 1))
+            elapsed = time.perf_counter() - started
+        await engine.dispose()
+    return lookups / elapsed
+
+
+def main(tokens: int, rounds: int) -> None:
+    manager = AccessTokenManager(KeyRing(SECRET), 900, Denylist(900))
+    issued = [
+        manager.issue(index, UserGroupEnum.USER) for index in range(1, tokens + 1)
+    ]
+    for index in range(0, tokens, 10):
+        manager.denylist.revoke(f"{index:032x}", int(time.time()) + 900)
+
+    cached = measure(manager.verify, issued, rounds)
+    naive = measure(naive_verify, issued, rounds)
+    database = asyncio.run(measure_db_lookup(users=1000, lookups=2000))
+
+    print(f"cached-key verify:  {cached:12,.0f} tokens/s")
+    print(f"naive verify:       {naive:12,.0f} tokens/s  (x{cached / naive:.1f})")
+    print(f"DB user lookup:     {database:12,.0f} lookups/s (x{cached / database:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.tokens, args.rounds)
@@ -0,0 +1,60 @@
+import json
+import platform
+from datetime import datetime, timezone
+from typing import Any
+
+# Metrics compared against the baseline and whether higher values are better.
+COMPARED = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "rps": True}
+
+
+def save_baseline(
+    path: str, results: dict[str, dict], settings: dict[str, Any]
+) -> None:
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": settings,
+        "endpoints": results,
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(document, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def load_baseline(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare(
+    baseline: dict[str, dict], current: dict[str, dict], tolerance: float
+) -> tuple[list[str], list[str]]:
+    """
+    Compare per-endpoint results with a baseline.
+
+    Returns report lines and the subset describing regressions, i.e. a
+    latency that grew, or a throughput that dropped, by more than
+    ``tolerance`` (a fraction: 0.2 allows 20%).
+    """
+    lines, regressions = [], []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            lines.append(f"{name:<28} (not in baseline)")
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            before, after = reference[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            line = (
+                f"{name:<28} {metric:<7} {before:>10.2f} -> {after:>10.2f} "
+                f"({change:+.1%})"
+            )
+            if worse > tolerance:
+                line += "  REGRESSION"
+                regressions.append(line)
+            lines.append(line)
+    for name in baseline.keys() - current.keys():
+        lines.append(f"{name:<28} (missing from this run)")
+    return lines, regressions
@@ -0,0 +1,264 @@
+"""
+Synthetic data at benchmark scale, written through the existing models.
+
+    python -m src.benchmarks.data --scale 100k --database-url sqlite+aiosqlite:///bench.db
+
+The catalog goes through the regular CSV seeder, so its batching and search
+index maintenance are part of what gets exercised; users, refresh tokens,
+carts, orders and payments are bulk inserted in batches.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from src.database.models.base import Base
+from src.database.models.carts import CartModel
+from src.database.models.movies import MovieModel
+from src.database.models.orders import OrderItemModel, OrderModel, OrderStatusEnum
+from src.database.models.payments import (
+    PaymentItemsModel,
+    PaymentModel,
+    PaymentStatusEnum,
+)
+from src.database.models.users import (
+    RefreshTokenModel,
+    UserGroupEnum,
+    UserGroupModel,
+    UserModel,
+)
+from src.database.populate import CSVDatabaseSeeder, chunked
+from src.orders.ownership import backfill_ownership
+from src.orders.popularity import reconcile_movie_stats
+from src.database.search import create_search_index
+from src.database.synthetic import write_synthetic_csv
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BATCH_SIZE = 5_000
+
+
+async def seed_catalog(connection: AsyncConnection, movies: int, seed: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "movies.csv")
+        write_synthetic_csv(csv_path, movies, seed)
+        async with AsyncSession(bind=connection) as session:
+            await CSVDatabaseSeeder(csv_path, session, batch_size=BATCH_SIZE).seed()
+
+
+async def next_id(connection: AsyncConnection, model: type[Base]) -> int:
+    return (
+        await connection.execute(select(func.coalesce(func.max(model.id), 0)))
+    ).scalar_one() + 1
+
+
+async def seed_users(
+    connection: AsyncConnection, users: int, tokens_per_user: int, seed: int
+) -> int:
+    """
+    Insert ``users`` users with their refresh tokens; returns the first id.
+    """
+    rng = random.Random(seed)
+    group_id = (
+        await connection.execute(
+            select(UserGroupModel.id).where(UserGroupModel.name == UserGroupEnum.USER)
+        )
+    ).scalar_one_or_none()
+    if group_id is None:
+        group_id = (
+            await connection.execute(
+                insert(UserGroupModel)
+                .values(name=UserGroupEnum.USER)
+                .returning(UserGroupModel.id)
+            )
+        ).scalar_one()
+
+    first_id = await next_id(connection, UserModel)
+    now = datetime.now(timezone.utc)
+    for batch in chunked(range(users), BATCH_SIZE):
+        await connection.execute(
+            insert(UserModel),
+            [
+                {
+                    "email": f"bench{first_id + index}@example.com",
+                    "hashed_password": "x",
+                    "is_active": True,
+                    "group_id": group_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in batch
+            ],
+        )
+    for batch in chunked(range(users * tokens_per_user), BATCH_SIZE):
+        await connection.execute(
+            insert(RefreshTokenModel),
+            [
+                {
+                    "user_id": first_id + index // tokens_per_user,
+                    "token": f"bench-token-{first_id}-{index}",
+                    # Roughly a third are already expired, as in production.
+                    "expires_at": now + timedelta(days=rng.randint(-15, 30)),
+                }
+                for index in batch
+            ],
+        )
+    return first_id
+
+
+async def seed_orders(
+    connection: AsyncConnection,
+    first_user_id: int,
+    users: int,
+    orders_per_user: int,
+    items_per_order: int,
+    seed: int,
+) -> int:
+    """
+    Give every user a cart and ``orders_per_user`` orders of distinct movies.
+    Four in five orders are paid, with a successful payment and its items;
+    the rest stay pending. Returns the number of orders.
+    """
+    rng = random.Random(seed)
+    prices = dict(
+        (await connection.execute(select(MovieModel.id, MovieModel.price))).all()
+    )
+    movie_ids = list(prices)
+    if not movie_ids:
+        return 0
+
+    first_cart_id = await next_id(connection, CartModel)
+    for batch in chunked(range(users), BATCH_SIZE):
+        await connection.execute(
+            insert(CartModel),
+            [
+                {"id": first_cart_id + index, "user_id": first_user_id + index}
+                for index in batch
+            ],
+        )
+
+    order_id = await next_id(connection, OrderModel)
+    order_item_id = await next_id(connection, OrderItemModel)
+    payment_id = await next_id(connection, PaymentModel)
+    orders, items, payments, payment_items = [], [], [], []
+
+    async def flush() -> None:
+        for model, rows in (
+            (OrderModel, orders),
+            (OrderItemModel, items),
+            (PaymentModel, payments),
+            (PaymentItemsModel, payment_items),
+        ):
+            if rows:
+                await connection.execute(insert(model), rows)
+            rows.clear()
+
+    for index in range(users * orders_per_user):
+        user_index = index // orders_per_user
+        paid = rng.random() < 0.8
+        chosen = rng.sample(movie_ids, min(items_per_order, len(movie_ids)))
+        total = sum(prices[movie_id] for movie_id in chosen)
+        orders.append(
+            {
+                "id": order_id,
+                "user_id": first_user_id + user_index,
+                "cart_id": first_cart_id + user_index,
+                "status": OrderStatusEnum.PAID if paid else OrderStatusEnum.PENDING,
+                "total_amount": total,
+            }
+        )
+        if paid:
+            payments.append(
+                {
+                    "id": payment_id,
+                    "user_id": first_user_id + user_index,
+                    "order_id": order_id,
+                    "status": PaymentStatusEnum.SUCCESSFUL,
+                    "amount": total,
+                    "external_payment_id": f"bench-payment-{payment_id}",
+                }
+            )
+        for movie_id in chosen:
+            items.append(
+                {
+                    "id": order_item_id,
+                    "order_id": order_id,
+                    "movie_id": movie_id,
+                    "price_at_order": prices[movie_id],
+                }
+            )
+            if paid:
+                payment_items.append(
+                    {
+                        "payment_id": payment_id,
+                        "order_item_id": order_item_id,
+                        "price_at_payment": prices[movie_id],
+                    }
+                )
+            order_item_id += 1
+        order_id += 1
+        payment_id += paid
+        if len(items) >= BATCH_SIZE:
+            await flush()
+    await flush()
+    return users * orders_per_user
+
+
+async def generate(
+    connection: AsyncConnection,
+    movies: int,
+    users: int | None = None,
+    tokens_per_user: int = 3,
+    orders_per_user: int = 2,
+    items_per_order: int = 3,
+    seed: int = 42,
+) -> dict[str, int]:
+    """
+    Create the schema if needed and fill it with ``movies`` catalog rows and
+    ``users`` (default: one per ten movies) users with refresh tokens, carts,
+    orders and payments.
+    """
+    await connection.run_sync(Base.metadata.create_all)
+    await connection.run_sync(create_search_index)
+
+    users = movies // 10 if users is None else users
+    await seed_catalog(connection, movies, seed)
+    first_user_id = await seed_users(connection, users, tokens_per_user, seed)
+    orders = await seed_orders(
+        connection, first_user_id, users, orders_per_user, items_per_order, seed
+    )
+    async with AsyncSession(bind=connection) as session:
+        await backfill_ownership(session)
+        await reconcile_movie_stats(session)
+    return {
+        "movies": movies,
+        "users": users,
+        "refresh_tokens": users * tokens_per_user,
+        "orders": orders,
+    }
+
+
+async def main(database_url: str, movies: int, users: int | None, seed: int) -> None:
+    engine = create_async_engine(database_url)
+    started = time.perf_counter()
+    async with engine.begin() as connection:
+        counts = await generate(connection, movies, users, seed=seed)
+    await engine.dispose()
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+    print(f"Generated {summary} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, SCALES[args.scale], args.users, args.seed))
@@ -0,0 +1,252 @@
+"""
+In-process load driver for the API.
+
+    python -m src.benchmarks.load --scale 10k --requests 500 --concurrency 16
+    python -m src.benchmarks.load --save src/benchmarks/baseline.json
+    python -m src.benchmarks.load --compare src/benchmarks/baseline.json
+
+Requests go through ``httpx.AsyncClient`` over an ASGI transport straight into
+``src.main.app``, so the numbers include routing, validation, serialization
+and the database, but no network. Without ``--database-url`` a throwaway
+SQLite database is generated at the requested scale first.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Callable
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.benchmarks.baseline import compare, load_baseline, save_baseline
+from src.benchmarks.data import SCALES, generate
+from src.config.dependencies import get_settings
+from src.database import get_db, get_read_db
+from src.database.models.movies import MovieModel
+from src.database.session_postgresql import create_pooled_engine
+from src.database.session_sqlite import create_sqlite_engine
+from src.database.synthetic import DESCRIPTION_WORDS
+from src.main import app
+
+API = "/api/v1"
+
+
+@dataclass
+class Endpoint:
+    name: str
+    # Builds (path, query params, headers) for one request.
+    build: Callable[[random.Random], tuple[str, dict, dict]]
+
+
+def catalog_endpoints(max_movie_id: int) -> list[Endpoint]:
+    return [
+        Endpoint("movies.list", lambda rng: (f"{API}/movies/", {"limit": 20}, {})),
+        Endpoint(
+            "movies.list.deep",
+            lambda rng: (
+                f"{API}/movies/",
+                {"limit": 20, "cursor": rng.randint(1, max_movie_id)},
+                {},
+            ),
+        ),
+        Endpoint(
+            "movies.list.filtered",
+            lambda rng: (
+                f"{API}/movies/",
+                {"genre": rng.choice(["Drama", "Western"]), "imdb_min": 7},
+                {},
+            ),
+        ),
+        Endpoint(
+            "movies.detail",
+            lambda rng: (f"{API}/movies/{rng.randint(1, max_movie_id)}/", {}, {}),
+        ),
+        Endpoint(
+            "movies.search",
+            lambda rng: (
+                f"{API}/movies/search/",
+                {"q": " ".join(rng.sample(DESCRIPTION_WORDS, 2))},
+                {},
+            ),
+        ),
+        Endpoint("movies.genres", lambda rng: (f"{API}/movies/genres/", {}, {})),
+    ]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    endpoint: Endpoint,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    """
+    Send ``requests`` requests to one endpoint from ``concurrency`` workers
+    and summarize their latencies.
+    """
+    rng = random.Random(seed)
+    plan = [endpoint.build(rng) for _ in range(requests)]
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while plan:
+            path, params, headers = plan.pop()
+            started = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def bind_app(write_engine: AsyncEngine, read_engine: AsyncEngine) -> None:
+    write_factory = async_sessionmaker(
+        write_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    read_factory = async_sessionmaker(
+        read_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_db() -> AsyncGenerator[AsyncSession, None]:
+        async with write_factory() as session:
+            yield session
+
+    async def override_read_db() -> AsyncGenerator[AsyncSession, None]:
+        async with read_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_read_db
+
+
+def create_engines(database_url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    settings = get_settings()
+    if database_url.startswith("postgresql"):
+        engine = create_pooled_engine(database_url, settings)
+        return engine, engine
+    return (
+        create_sqlite_engine(database_url, settings),
+        create_sqlite_engine(database_url, settings, read_only=True),
+    )
+
+
+async def run(
+    database_url: str, requests: int, concurrency: int, warmup: int, seed: int
+) -> dict[str, dict]:
+    write_engine, read_engine = create_engines(database_url)
+    bind_app(write_engine, read_engine)
+    try:
+        async with AsyncSession(read_engine) as session:
+            max_movie_id = (
+                await session.execute(select(func.max(MovieModel.id)))
+            ).scalar_one()
+        if not max_movie_id:
+            raise SystemExit("The database has no movies; generate data first.")
+
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for endpoint in catalog_endpoints(max_movie_id):
+                await drive(client, endpoint, warmup, concurrency, seed + 1)
+                results[endpoint.name] = await drive(
+                    client, endpoint, requests, concurrency, seed
+                )
+        return results
+    finally:
+        app.dependency_overrides.clear()
+        await write_engine.dispose()
+        await read_engine.dispose()
+
+
+def print_results(results: dict[str, dict]) -> None:
+    print(
+        f"{'endpoint':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'req/s':>9} {'errors':>7}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<28} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+            f"{result['p99_ms']:>9.2f} {result['rps']:>9.1f} {result['errors']:>7}"
+        )
+
+
+async def main(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url
+        if database_url is None:
+            path = os.path.join(directory, "benchmark.db")
+            database_url = f"sqlite+aiosqlite:///{path}"
+            engine, _ = create_engines(database_url)
+            async with engine.begin() as connection:
+                await generate(connection, SCALES[args.scale], seed=args.seed)
+            await engine.dispose()
+
+        results = await run(
+            database_url, args.requests, args.concurrency, args.warmup, args.seed
+        )
+
+    print_results(results)
+    run_settings = {
+        "scale": args.scale,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    if args.save:
+        save_baseline(args.save, results, run_settings)
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline["settings"] != run_settings:
+            print(f"Warning: baseline was recorded with {baseline['settings']}")
+        lines, regressions = compare(baseline["endpoints"], results, args.tolerance)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", metavar="PATH", default=None)
+    parser.add_argument("--compare", metavar="PATH", default=None)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown before a metric counts as a regression.",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
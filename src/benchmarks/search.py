@@ -0,0 +1,130 @@
+"""
+Compare ranked full-text search with the ``LIKE '%term%'`` baseline.
+
+    python -m src.benchmarks.search --movies 50000 --rounds 200
+
+Without ``--database-url`` a throwaway SQLite database is seeded with a
+synthetic catalog first.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database.models.base import Base
+from src.database.models.movies import (
+    DirectorModel,
+    MovieModel,
+    MoviesDirectorsModel,
+    StarModel,
+    StarsMoviesModel,
+)
+from src.database.search import create_search_index, search_movie_ids
+from src.database.synthetic import DESCRIPTION_WORDS, seed_synthetic
+
+PAGE_SIZE = 20
+
+
+async def like_search(session: AsyncSession, query: str) -> list[int]:
+    pattern = f"%{query}%"
+    stmt = (
+        select(MovieModel.id)
+        .where(
+            or_(
+                MovieModel.name.ilike(pattern),
+                MovieModel.description.ilike(pattern),
+                MovieModel.id.in_(
+                    select(StarsMoviesModel.c.movie_id)
+                    .join(StarModel)
+                    .where(StarModel.name.ilike(pattern))
+                ),
+                MovieModel.id.in_(
+                    select(MoviesDirectorsModel.c.movie_id)
+                    .join(DirectorModel)
+                    .where(DirectorModel.name.ilike(pattern))
+                ),
+            )
+        )
+        .order_by(MovieModel.id.desc())
+        .limit(PAGE_SIZE)
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def fts_search(session: AsyncSession, query: str) -> list[int]:
+    return await search_movie_ids(session, query, limit=PAGE_SIZE)
+
+
+async def measure(
+    session: AsyncSession,
+    search: Callable[[AsyncSession, str], Awaitable[list[int]]],
+    queries: list[str],
+) -> list[float]:
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        await search(session, query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:>6}: mean {statistics.mean(timings):7.2f} ms, "
+        f"p50 {statistics.median(timings):7.2f} ms, p95 {p95:7.2f} ms"
+    )
+
+
+async def main(database_url: str | None, movies: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        if database_url is None:
+            database_url = f"sqlite+aiosqlite:///{os.path.join(directory, 'b.db')}"
+            engine = create_async_engine(database_url)
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.run_sync(create_search_index)
+                started = time.perf_counter()
+                await seed_synthetic(connection, movies)
+                print(f"Seeded {movies} movies in {time.perf_counter() - started:.1f}s")
+        else:
+            engine = create_async_engine(database_url)
+
+        rng = random.Random(7)
+        queries = [
+            " ".join(rng.sample(DESCRIPTION_WORDS, rng.choice((1, 2))))
+            for _ in range(rounds)
+        ]
+        async with AsyncSession(engine) as session:
+            # Warm the page cache for both paths before timing anything.
+            await like_search(session, queries[0])
+            await fts_search(session, queries[0])
+
+            like_timings = await measure(session, like_search, queries)
+            fts_timings = await measure(session, fts_search, queries)
+        await engine.dispose()
+
+    report("LIKE", like_timings)
+    report("FTS", fts_timings)
+    print(
+        "speedup (mean): "
+        f"{statistics.mean(like_timings) / statistics.mean(fts_timings):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--movies", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.movies, args.rounds))
@@ -0,0 +1,158 @@
+"""
+Response encoding cost of a movie listing page.
+
+    python -m src.benchmarks.serialization --movies 100 --rounds 300
+
+Each round turns one page of movies with a certification and nested
+genres, stars and directors into response bytes:
+
+- ``JSONResponse``: the ORM graph validated into ``MovieListResponseSchema``,
+  dumped to Python objects and rendered by ``JSONResponse`` (a route with
+  ``response_class=JSONResponse``);
+- ``pydantic dump_json``: the same model serialized by pydantic's own JSON
+  encoder, FastAPI's default for routes returning models;
+- ``FastJSONResponse``: the rows the listing reads turned into dicts by
+  :func:`src.database.movie_items.build_movie_items` and encoded directly.
+
+Everything is in memory, so only CPU spent after the queries is compared.
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import Callable
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    StarModel,
+)
+from src.database.movie_items import build_movie_items
+from src.routes.responses import FastJSONResponse, dumps, orjson
+from src.schemas.movies import MovieListResponseSchema
+
+GENRES, STARS, DIRECTORS = 3, 5, 2
+
+
+def make_rows(movies: int) -> tuple[list[tuple], dict[str, list[tuple]]]:
+    """
+    Movie and link rows as the listing statements return them.
+    """
+    rng = random.Random(0)
+    rows, links = [], {"genres": [], "stars": [], "directors": []}
+    for movie_id in range(movies, 0, -1):
+        certification = rng.randint(1, 5)
+        rows.append(
+            (
+                movie_id,
+                f"Movie {movie_id}: a title with some length",
+                rng.randint(1950, 2024),
+                rng.randint(80, 200),
+                round(rng.uniform(1, 10), 1),
+                Decimal(rng.randint(199, 2999)).scaleb(-2),
+                certification,
+                f"Certification {certification}",
+            )
+        )
+        for key, count, pool in (
+            ("genres", GENRES, 20),
+            ("stars", STARS, 5000),
+            ("directors", DIRECTORS, 1000),
+        ):
+            for entity_id in sorted(rng.sample(range(1, pool + 1), count)):
+                links[key].append((movie_id, entity_id, f"{key} {entity_id}"))
+    return rows, links
+
+
+def make_movies(rows: list[tuple], links: dict[str, list[tuple]]) -> list[MovieModel]:
+    """
+    The same page as transient mapped instances, as the ORM path loads it.
+    """
+    models = {"genres": GenreModel, "stars": StarModel, "directors": DirectorModel}
+    entities: dict[tuple[str, int], object] = {}
+    nested: dict[int, dict[str, list]] = {}
+    for key, key_rows in links.items():
+        for movie_id, entity_id, name in key_rows:
+            entity = entities.setdefault(
+                (key, entity_id), models[key](id=entity_id, name=name)
+            )
+            nested.setdefault(movie_id, {}).setdefault(key, []).append(entity)
+    certifications: dict[int, CertificationModel] = {}
+    movies = []
+    for movie_id, name, year, time_, imdb, price, cert_id, cert_name in rows:
+        certification = certifications.setdefault(
+            cert_id, CertificationModel(id=cert_id, name=cert_name)
+        )
+        movies.append(
+            MovieModel(
+                id=movie_id,
+                name=name,
+                year=year,
+                time=time_,
+                imdb=imdb,
+                price=price,
+                certification=certification,
+                **nested[movie_id],
+            )
+        )
+    return movies
+
+
+def measure(render: Callable[[], bytes], rounds: int) -> tuple[float, int]:
+    body = render()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        render()
+    return (time.perf_counter() - started) / rounds, len(body)
+
+
+def main(movies: int, rounds: int) -> None:
+    rows, links = make_rows(movies)
+    orm_movies = make_movies(rows, links)
+
+    def model() -> MovieListResponseSchema:
+        return MovieListResponseSchema.model_validate(
+            {"movies": orm_movies, "next_cursor": None, "limit": movies},
+            from_attributes=True,
+        )
+
+    def json_response() -> bytes:
+        return JSONResponse(model().model_dump(mode="json")).body
+
+    def pydantic_json() -> bytes:
+        return Response(model().model_dump_json(), media_type="application/json").body
+
+    def fast_json() -> bytes:
+        items = build_movie_items(rows, links)
+        page = {"movies": list(items.values()), "next_cursor": None, "limit": movies}
+        return FastJSONResponse(page).body
+
+    assert dumps(model().model_dump(mode="json")) == fast_json(), "output differs"
+
+    encoder = "orjson" if orjson is not None else "json"
+    results = [
+        ("JSONResponse", measure(json_response, rounds)),
+        ("pydantic dump_json", measure(pydantic_json, rounds)),
+        (f"FastJSONResponse ({encoder})", measure(fast_json, rounds)),
+    ]
+    baseline = results[0][1][0]
+    print(f"{movies} movies x ({GENRES} genres, {STARS} stars, {DIRECTORS} directors)")
+    for name, (seconds, size) in results:
+        print(
+            f"{name:28} {seconds * 1000:8.3f} ms/page  {size:,} bytes"
+            f"  (x{baseline / seconds:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--movies", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+    main(args.movies, args.rounds)
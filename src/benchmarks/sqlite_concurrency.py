@@ -0,0 +1,121 @@
+"""
+Mixed reader/writer throughput on SQLite: default rollback journal on a single
+engine versus WAL with pragmas and a separate read-only pool.
+
+    python -m src.benchmarks.sqlite_concurrency --readers 16 --writers 4 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.config.dependencies import get_settings
+from src.database.models.base import Base
+from src.database.models.movies import MovieModel
+from src.database.models.users import RefreshTokenModel
+from src.database.session_sqlite import create_sqlite_engine
+from src.database.synthetic import seed_synthetic
+from src.routes.movies import MOVIE_LOAD_OPTIONS
+
+
+async def reader(factory: async_sessionmaker, deadline: float, counts: dict) -> None:
+    cursor = None
+    while time.perf_counter() < deadline:
+        async with factory() as session:
+            stmt = select(MovieModel).order_by(MovieModel.id.desc()).limit(20)
+            if cursor:
+                stmt = stmt.where(MovieModel.id < cursor)
+            movies = (
+                (await session.execute(stmt.options(*MOVIE_LOAD_OPTIONS)))
+                .scalars()
+                .all()
+            )
+            cursor = movies[-1].id if len(movies) == 20 else None
+        counts["reads"] += 1
+
+
+async def writer(
+    factory: async_sessionmaker, deadline: float, counts: dict, worker: int
+) -> None:
+    sequence = 0
+    while time.perf_counter() < deadline:
+        async with factory() as session:
+            await session.execute(
+                insert(RefreshTokenModel).values(
+                    user_id=1,
+                    token=f"bench-{worker}-{sequence}-{time.perf_counter_ns()}",
+                    expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+                )
+            )
+            await session.commit()
+        sequence += 1
+        counts["writes"] += 1
+
+
+async def run_mode(
+    path: str, tuned: bool, readers: int, writers: int, seconds: float
+) -> dict:
+    settings = get_settings().copy(update={"SQLITE_WAL_MODE": tuned})
+    url = f"sqlite+aiosqlite:///{path}"
+    write_engine = create_sqlite_engine(url, settings)
+    read_engine: AsyncEngine = (
+        create_sqlite_engine(url, settings, read_only=True) if tuned else write_engine
+    )
+    write_factory = async_sessionmaker(write_engine, class_=AsyncSession)
+    read_factory = async_sessionmaker(read_engine, class_=AsyncSession)
+
+    counts = {"reads": 0, "writes": 0}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(
+        *(reader(read_factory, deadline, counts) for _ in range(readers)),
+        *(writer(write_factory, deadline, counts, i) for i in range(writers)),
+    )
+    await write_engine.dispose()
+    await read_engine.dispose()
+    return {key: value / seconds for key, value in counts.items()}
+
+
+async def prepare(path: str, movies: int) -> None:
+    settings = get_settings().copy(update={"SQLITE_WAL_MODE": False})
+    engine = create_sqlite_engine(f"sqlite+aiosqlite:///{path}", settings)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await seed_synthetic(connection, movies)
+    await engine.dispose()
+
+
+async def main(movies: int, readers: int, writers: int, seconds: float) -> None:
+    results = {}
+    for tuned in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "concurrency.db")
+            await prepare(path, movies)
+            results[tuned] = await run_mode(path, tuned, readers, writers, seconds)
+
+    for tuned, result in results.items():
+        label = "WAL + read pool" if tuned else "rollback journal"
+        print(
+            f"{label:>16}: {result['reads']:8.1f} reads/s, "
+            f"{result['writes']:8.1f} writes/s"
+        )
+    baseline, tuned = results[False], results[True]
+    print(
+        f"read throughput x{tuned['reads'] / max(baseline['reads'], 1e-9):.1f}, "
+        f"write throughput x{tuned['writes'] / max(baseline['writes'], 1e-9):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--movies", type=int, default=5_000)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.movies, args.readers, args.writers, args.seconds))
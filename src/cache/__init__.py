@@ -0,0 +1,4 @@
+from src.cache.memory import TTLCache
+from src.cache.catalog import CatalogCache, catalog_cache
+from src.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from src.cache.shared import Cache, create_cache
@@ -0,0 +1,107 @@
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager, suppress
+from typing import Any, Iterator
+
+import numpy as np
+
+MAGIC = b"NPARRAYS"
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_array_file(
+    path: str, arrays: dict[str, np.ndarray], meta: dict[str, Any]
+) -> None:
+    """
+    Write named arrays plus JSON-serializable ``meta`` into one file that
+    :func:`open_array_file` maps without copying.
+
+    The file is written next to ``path`` and renamed over it, so readers see
+    either the old or the new file, never a partial one. Processes that still
+    map the old file keep using it until they reopen.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"meta": meta, "arrays": layout}).encode()
+    data_start = _align(_PREFIX.size + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_PREFIX.pack(MAGIC, len(header)))
+            file.write(header)
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(array.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+
+def open_array_file(path: str) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """
+    Map a file written by :func:`write_array_file` read-only and return its
+    arrays as zero-copy views, plus its metadata. The mapping is shared with
+    every other process reading the same file and lives as long as the
+    arrays do.
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_size = _PREFIX.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an array file.")
+    header = json.loads(buffer[_PREFIX.size : _PREFIX.size + header_size])
+    data_start = _align(_PREFIX.size + header_size)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        if not all(shape):
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.frombuffer(
+            buffer,
+            dtype=dtype,
+            count=int(np.prod(shape)),
+            offset=data_start + spec["offset"],
+        ).reshape(shape)
+    return arrays, header["meta"]
+
+
+@contextmanager
+def try_lock(path: str) -> Iterator[bool]:
+    """
+    Hold an exclusive ``flock`` on ``path`` (created if needed) for the
+    block; yields False instead of waiting when another process holds it.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+        else:
+            yield True
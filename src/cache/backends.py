@@ -0,0 +1,111 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from src.cache.memory import MISSING, TTLCache
+
+
+class CacheBackend(ABC):
+    """
+    Minimal byte-oriented key/value store behind :class:`src.cache.shared.Cache`.
+
+    The operations mirror the Redis commands the cache relies on so that a
+    Redis client can implement them one-to-one.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        The value of ``key``, or None if it is absent or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Store ``value``, expiring after ``ttl`` seconds when given.
+        """
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Store ``value`` only if ``key`` is absent (``SET NX``). Returns whether
+        the value was stored.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Remove ``key`` if present.
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process backend on top of :class:`TTLCache`. Keys without a TTL use
+    the cache's default one, so every entry is eventually evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._cache.get(key)
+        return None if value is MISSING else value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        # No await between the check and the write, so this is atomic within
+        # the event loop.
+        if self._cache.get(key) is not MISSING:
+            return False
+        self._cache.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend for any ``redis.asyncio``-compatible client: redis-py, fakeredis
+    or :class:`src.cache.fake_redis.FakeRedis`.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package to be installed."
+            ) from exc
+        return cls(redis.from_url(url))
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return None if ttl is None else max(int(ttl * 1000), 1)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.client.set(key, value, px=self._px(ttl))
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(await self.client.set(key, value, px=self._px(ttl), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,206 @@
+from collections import Counter
+from itertools import chain
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.cache.memory import MISSING, TTLCache
+from src.config.dependencies import get_settings
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    MoviesGenresModel,
+    StarModel,
+)
+
+# Which cached namespaces a flushed instance of each model makes stale.
+# Movie changes alter genre movie counts through the ``movie_genres`` links.
+INVALIDATED_BY = {
+    GenreModel: ("genres",),
+    CertificationModel: ("certifications",),
+    StarModel: ("stars",),
+    DirectorModel: ("directors",),
+    MovieModel: ("genre_counts",),
+}
+
+SESSION_INFO_KEY = "catalog_cache_invalidate"
+
+
+class CatalogCache:
+    """
+    Read-through cache for the small, read-mostly catalog reference tables.
+
+    Keys are ``(namespace, name)`` tuples so a write to one table only drops
+    that table's entries. Genres and certifications are cached as whole
+    name -> id maps; stars and directors, which grow with the catalog, are
+    cached per looked up name.
+
+    Flush events only see ORM writes, not Core bulk writes such as the CSV
+    seeder's (which may run in another process), so unknown names are never
+    cached: a name missing from the cache is looked up again, and a genre or
+    certification map that lacks a name the table has is dropped.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    async def _get_or_load(
+        self, key: tuple[str, Any], loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        namespace = key[0]
+        value = self._cache.get(key)
+        if value is not MISSING:
+            self.hits[namespace] += 1
+            return value
+        self.misses[namespace] += 1
+        value = await loader()
+        if value is not None:
+            self._cache.set(key, value)
+        return value
+
+    async def _name_map(self, session: AsyncSession, model: type) -> dict[str, int]:
+        result = await session.execute(select(model.name, model.id))
+        return dict(result.tuples().all())
+
+    async def _lookup_id(
+        self, session: AsyncSession, model: type, name: str
+    ) -> Optional[int]:
+        result = await session.execute(select(model.id).where(model.name == name))
+        return result.scalar_one_or_none()
+
+    async def genre_ids(self, session: AsyncSession) -> dict[str, int]:
+        return await self._get_or_load(
+            ("genres", "ids"), lambda: self._name_map(session, GenreModel)
+        )
+
+    async def certification_ids(self, session: AsyncSession) -> dict[str, int]:
+        return await self._get_or_load(
+            ("certifications", "ids"),
+            lambda: self._name_map(session, CertificationModel),
+        )
+
+    async def _map_id(
+        self,
+        session: AsyncSession,
+        model: type,
+        namespace: str,
+        ids: dict[str, int],
+        name: str,
+    ) -> Optional[int]:
+        if name in ids:
+            return ids[name]
+        id_ = await self._lookup_id(session, model, name)
+        if id_ is not None:
+            self.invalidate((namespace,))
+        return id_
+
+    async def genre_id(self, session: AsyncSession, name: str) -> Optional[int]:
+        return await self._map_id(
+            session, GenreModel, "genres", await self.genre_ids(session), name
+        )
+
+    async def certification_id(self, session: AsyncSession, name: str) -> Optional[int]:
+        return await self._map_id(
+            session,
+            CertificationModel,
+            "certifications",
+            await self.certification_ids(session),
+            name,
+        )
+
+    async def star_id(self, session: AsyncSession, name: str) -> Optional[int]:
+        return await self._get_or_load(
+            ("stars", name), lambda: self._lookup_id(session, StarModel, name)
+        )
+
+    async def director_id(self, session: AsyncSession, name: str) -> Optional[int]:
+        return await self._get_or_load(
+            ("directors", name), lambda: self._lookup_id(session, DirectorModel, name)
+        )
+
+    async def genres_with_counts(
+        self, session: AsyncSession
+    ) -> list[tuple[int, str, int]]:
+        async def load() -> list[tuple[int, str, int]]:
+            result = await session.execute(
+                select(
+                    GenreModel.id,
+                    GenreModel.name,
+                    func.count(MoviesGenresModel.c.movie_id),
+                )
+                .outerjoin(MoviesGenresModel)
+                .group_by(GenreModel.id, GenreModel.name)
+                .order_by(GenreModel.name)
+            )
+            return list(result.tuples().all())
+
+        return await self._get_or_load(("genre_counts", "list"), load)
+
+    async def certifications(self, session: AsyncSession) -> list[tuple[int, str]]:
+        async def load() -> list[tuple[int, str]]:
+            result = await session.execute(
+                select(CertificationModel.id, CertificationModel.name).order_by(
+                    CertificationModel.name
+                )
+            )
+            return list(result.tuples().all())
+
+        return await self._get_or_load(("certifications", "list"), load)
+
+    def invalidate(self, namespaces: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop every entry of ``namespaces``, or everything when omitted.
+        """
+        if namespaces is None:
+            self._cache.clear()
+            return
+        namespaces = set(namespaces)
+        if "genres" in namespaces:
+            namespaces.add("genre_counts")
+        for key in self._cache:
+            if key[0] in namespaces:
+                self._cache.delete(key)
+
+    def stats(self) -> dict[str, Any]:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {
+            **self._cache.stats(),
+            "namespaces": {
+                namespace: {
+                    "hits": self.hits[namespace],
+                    "misses": self.misses[namespace],
+                }
+                for namespace in namespaces
+            },
+        }
+
+
+settings = get_settings()
+catalog_cache = CatalogCache(
+    maxsize=settings.CATALOG_CACHE_MAX_SIZE, ttl=settings.CATALOG_CACHE_TTL
+)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_catalog_changes(session: Session, flush_context: Any) -> None:
+    stale = session.info.setdefault(SESSION_INFO_KEY, set())
+    for instance in chain(session.new, session.dirty, session.deleted):
+        stale.update(INVALIDATED_BY.get(type(instance), ()))
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_catalog_cache(session: Session) -> None:
+    stale = session.info.pop(SESSION_INFO_KEY, None)
+    if stale:
+        catalog_cache.invalidate(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_catalog_changes(session: Session) -> None:
+    session.info.pop(SESSION_INFO_KEY, None)
@@ -0,0 +1,473 @@
+"""
+Build the columnar catalog snapshot served by the movie listing.
+
+    python -m src.cache.catalog_snapshot [--force]
+
+The app rebuilds the snapshot whenever the catalog changed, checking every
+``CATALOG_SNAPSHOT_REFRESH_INTERVAL`` seconds; this command does it on demand.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import Table, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cache.arrays import open_array_file, try_lock, write_array_file
+from src.config.dependencies import get_settings
+from src.database import AsyncSessionLocal
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarModel,
+    StarsMoviesModel,
+)
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+FETCH_BATCH_SIZE = 10_000
+# Rows checked by the first step of a filtered listing scan.
+SCAN_CHUNK_SIZE = 1024
+ENTITIES = {
+    "genre": GenreModel,
+    "star": StarModel,
+    "director": DirectorModel,
+    "certification": CertificationModel,
+}
+# Movie <-> entity association tables and their entity column.
+LINKS: dict[str, tuple[Table, str]] = {
+    "genre": (MoviesGenresModel, "genre_id"),
+    "star": (StarsMoviesModel, "star_id"),
+    "director": (MoviesDirectorsModel, "director_id"),
+}
+MOVIE_COLUMNS = {
+    "year": np.int32,
+    "time": np.int32,
+    "imdb": np.float64,
+    "votes": np.int64,
+    "meta_score": np.float64,
+    "gross": np.float64,
+    "price_cents": np.int64,
+    "certification_id": np.int64,
+    "version": np.int64,
+    "updated_at": np.int64,
+}
+
+
+def _as_micros(value: datetime) -> int:
+    # SQLite hands back naive datetimes; everything is stored in UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _pack_strings(values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    UTF-8 encode ``values`` into one byte buffer plus ``len + 1`` offsets;
+    string ``i`` is ``data[offsets[i]:offsets[i + 1]]``.
+    """
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _csr(
+    rows: np.ndarray, columns: np.ndarray, n_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Group ``columns`` by ``rows`` (``0 <= row < n_rows``) into CSR
+    ``(indptr, values)``, values ascending within a row.
+    """
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, columns[order]
+
+
+class CatalogSnapshot:
+    """
+    Read-only columnar copy of the catalog.
+
+    Movies are rows ordered by id: one NumPy array per scalar column, names
+    and descriptions as offset-indexed UTF-8 buffers. Each entity family
+    has sorted ids plus names, and each link family is stored twice as CSR:
+    movie row -> entity ids, and entity position -> movie rows, so filters
+    by genre, star or director read only the matching movies.
+
+    All arrays can be views over a shared ``mmap``; nothing is copied per
+    worker, and no ORM object is ever built.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict[str, Any]) -> None:
+        self.arrays = arrays
+        self.marker = meta["marker"]
+        self.movie_ids = arrays["movie_ids"]
+
+    def __len__(self) -> int:
+        return len(self.movie_ids)
+
+    @classmethod
+    async def build(cls, session: AsyncSession) -> "CatalogSnapshot":
+        # Read the marker first so changes made while building trigger
+        # another rebuild instead of being missed.
+        marker = await catalog_marker(session)
+        arrays: dict[str, np.ndarray] = {}
+        columns: dict[str, list] = {name: [] for name in MOVIE_COLUMNS}
+        movie_ids, names, descriptions = [], [], []
+        result = await session.stream(
+            select(
+                MovieModel.id,
+                MovieModel.name,
+                MovieModel.description,
+                MovieModel.year,
+                MovieModel.time,
+                MovieModel.imdb,
+                MovieModel.votes,
+                MovieModel.meta_score,
+                MovieModel.gross,
+                MovieModel.price,
+                MovieModel.certification_id,
+                MovieModel.version,
+                MovieModel.updated_at,
+            )
+            .order_by(MovieModel.id)
+            .execution_options(yield_per=FETCH_BATCH_SIZE)
+        )
+        async for row in result:
+            movie_ids.append(row.id)
+            names.append(row.name)
+            descriptions.append(row.description)
+            columns["year"].append(row.year)
+            columns["time"].append(row.time)
+            columns["imdb"].append(row.imdb)
+            columns["votes"].append(row.votes)
+            columns["meta_score"].append(
+                np.nan if row.meta_score is None else row.meta_score
+            )
+            columns["gross"].append(np.nan if row.gross is None else row.gross)
+            columns["price_cents"].append(int(Decimal(row.price) * 100))
+            columns["certification_id"].append(row.certification_id)
+            columns["version"].append(row.version)
+            columns["updated_at"].append(_as_micros(row.updated_at))
+
+        arrays["movie_ids"] = np.asarray(movie_ids, dtype=np.int64)
+        for name, dtype in MOVIE_COLUMNS.items():
+            arrays[name] = np.asarray(columns[name], dtype=dtype)
+        arrays["name_offsets"], arrays["name_data"] = _pack_strings(names)
+        arrays["description_offsets"], arrays["description_data"] = _pack_strings(
+            descriptions
+        )
+
+        for kind, model in ENTITIES.items():
+            rows = (
+                await session.execute(select(model.id, model.name).order_by(model.id))
+            ).all()
+            entity_names = [name for _, name in rows]
+            arrays[f"{kind}_ids"] = np.asarray([id_ for id_, _ in rows], dtype=np.int64)
+            offsets, data = _pack_strings(entity_names)
+            arrays[f"{kind}_name_offsets"], arrays[f"{kind}_name_data"] = offsets, data
+            # Positions sorted by name, for binary search lookups by name.
+            arrays[f"{kind}_by_name"] = np.asarray(
+                sorted(range(len(entity_names)), key=entity_names.__getitem__),
+                dtype=np.int64,
+            )
+
+        n_movies = len(movie_ids)
+        for kind, (table, column) in LINKS.items():
+            pairs = np.asarray(
+                (
+                    await session.execute(select(table.c.movie_id, table.c[column]))
+                ).all(),
+                dtype=np.int64,
+            ).reshape(-1, 2)
+            entity_ids = arrays[f"{kind}_ids"]
+            movie_rows = np.searchsorted(arrays["movie_ids"], pairs[:, 0])
+            positions = np.searchsorted(entity_ids, pairs[:, 1])
+            # Drop links to rows created after the movies were read.
+            known = (movie_rows < n_movies) & (positions < len(entity_ids))
+            known[known] = (
+                arrays["movie_ids"][movie_rows[known]] == pairs[known, 0]
+            ) & (entity_ids[positions[known]] == pairs[known, 1])
+            movie_rows, positions = movie_rows[known], positions[known]
+            arrays[f"{kind}_indptr"], arrays[f"{kind}_links"] = _csr(
+                movie_rows, entity_ids[positions], n_movies
+            )
+            arrays[f"{kind}_movie_indptr"], arrays[f"{kind}_movie_rows"] = _csr(
+                positions, movie_rows, len(entity_ids)
+            )
+        return cls(arrays, {"marker": marker})
+
+    def save(self, path: str) -> None:
+        write_array_file(path, self.arrays, {"marker": self.marker})
+
+    @classmethod
+    def load(cls, path: str) -> "CatalogSnapshot":
+        return cls(*open_array_file(path))
+
+    def _string(self, prefix: str, index: int) -> str:
+        offsets = self.arrays[f"{prefix}_offsets"]
+        data = self.arrays[f"{prefix}_data"]
+        return data[offsets[index] : offsets[index + 1]].tobytes().decode()
+
+    def _entity_position(self, kind: str, entity_id: int) -> Optional[int]:
+        ids = self.arrays[f"{kind}_ids"]
+        position = int(np.searchsorted(ids, entity_id))
+        if position < len(ids) and ids[position] == entity_id:
+            return position
+        return None
+
+    def _entity(self, kind: str, entity_id: int) -> dict[str, Any]:
+        position = self._entity_position(kind, entity_id)
+        return {"id": entity_id, "name": self._string(f"{kind}_name", position)}
+
+    def entity_id(self, kind: str, name: str) -> Optional[int]:
+        """
+        Id of the genre, star, director or certification named ``name``.
+        """
+        by_name = self.arrays[f"{kind}_by_name"]
+        prefix = f"{kind}_name"
+        found = bisect_left(
+            range(len(by_name)),
+            name,
+            key=lambda index: self._string(prefix, by_name[index]),
+        )
+        if found < len(by_name) and self._string(prefix, by_name[found]) == name:
+            return int(self.arrays[f"{kind}_ids"][by_name[found]])
+        return None
+
+    def movie_rows(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 20,
+        year: Optional[int] = None,
+        imdb_min: Optional[float] = None,
+        imdb_max: Optional[float] = None,
+        genre_id: Optional[int] = None,
+        star_id: Optional[int] = None,
+        director_id: Optional[int] = None,
+        certification_id: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Rows of up to ``limit`` movies matching the listing filters, newest
+        (highest id) first and below ``cursor`` when given, mirroring
+        ``apply_movie_filters`` plus keyset pagination.
+
+        Rows are in id order, so an unfiltered page is a slice. Otherwise
+        the candidates, all rows or the movies of the given genre, star and
+        director, are scanned backwards from the cursor in chunks that
+        double in size, stopping once the page is full.
+        """
+        end = len(self)
+        if cursor is not None:
+            end = int(np.searchsorted(self.movie_ids, cursor))
+        candidates: Optional[np.ndarray] = None
+        for kind, entity_id in (
+            ("genre", genre_id),
+            ("star", star_id),
+            ("director", director_id),
+        ):
+            if entity_id is None:
+                continue
+            position = self._entity_position(kind, entity_id)
+            if position is None:
+                return np.empty(0, dtype=np.int64)
+            indptr = self.arrays[f"{kind}_movie_indptr"]
+            rows = self.arrays[f"{kind}_movie_rows"][
+                indptr[position] : indptr[position + 1]
+            ]
+            rows = rows[: np.searchsorted(rows, end)]
+            candidates = (
+                rows
+                if candidates is None
+                else np.intersect1d(candidates, rows, assume_unique=True)
+            )
+        predicates = [
+            (self.arrays[name], compare, value)
+            for name, compare, value in (
+                ("year", np.equal, year),
+                ("imdb", np.greater_equal, imdb_min),
+                ("imdb", np.less_equal, imdb_max),
+                ("certification_id", np.equal, certification_id),
+            )
+            if value is not None
+        ]
+        if candidates is None and not predicates:
+            return np.arange(end - 1, max(end - limit, 0) - 1, -1)
+
+        found: list[np.ndarray] = []
+        missing = limit
+        stop = end if candidates is None else len(candidates)
+        chunk = SCAN_CHUNK_SIZE
+        while stop > 0 and missing > 0:
+            start = max(stop - chunk, 0)
+            # Plain slices of the columns when scanning every row.
+            index = slice(start, stop) if candidates is None else candidates[start:stop]
+            mask = np.ones(stop - start, dtype=bool)
+            for column, compare, value in predicates:
+                mask &= compare(column[index], value)
+            if candidates is None:
+                matched = np.flatnonzero(mask) + start
+            else:
+                matched = index[mask]
+            found.append(matched[::-1][:missing])
+            missing -= len(found[-1])
+            stop, chunk = start, chunk * 2
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+    def versions(self, rows: np.ndarray) -> list[tuple[int, int]]:
+        return list(
+            zip(self.movie_ids[rows].tolist(), self.arrays["version"][rows].tolist())
+        )
+
+    def last_modified(self, rows: np.ndarray) -> Optional[datetime]:
+        if not len(rows):
+            return None
+        micros = int(self.arrays["updated_at"][rows].max())
+        return EPOCH + timedelta(microseconds=micros)
+
+    def list_item(self, row: int) -> dict[str, Any]:
+        """
+        One movie in the shape of ``MovieListItemSchema``.
+        """
+        arrays = self.arrays
+        item = {
+            "id": int(self.movie_ids[row]),
+            "name": self._string("name", row),
+            "year": int(arrays["year"][row]),
+            "time": int(arrays["time"][row]),
+            "imdb": float(arrays["imdb"][row]),
+            "price": Decimal(int(arrays["price_cents"][row])).scaleb(-2),
+            "certification": self._entity(
+                "certification", int(arrays["certification_id"][row])
+            ),
+        }
+        for kind in LINKS:
+            indptr = arrays[f"{kind}_indptr"]
+            links = arrays[f"{kind}_links"][indptr[row] : indptr[row + 1]]
+            item[f"{kind}s"] = [
+                self._entity(kind, entity_id) for entity_id in links.tolist()
+            ]
+        return item
+
+
+async def catalog_marker(session: AsyncSession) -> list:
+    """
+    Cheap fingerprint of the catalog: the latest movie change plus the row
+    count of every table the snapshot reads. Link edits are expected to
+    come with an update of the movie.
+    """
+    counts = [
+        select(func.count()).select_from(model).scalar_subquery()
+        for model in ENTITIES.values()
+    ]
+    row = (
+        await session.execute(
+            select(func.max(MovieModel.updated_at), func.count(MovieModel.id), *counts)
+        )
+    ).one()
+    latest, *totals = row
+    return [_as_micros(latest) if latest else None, *totals]
+
+
+class CatalogSnapshotStore:
+    """
+    Per-process handle on the snapshot file shared by all workers; see
+    :class:`src.recommendations.RecommendationEngine` for the scheme.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_mtime: Optional[int] = None
+
+    def get(self) -> Optional[CatalogSnapshot]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return self._snapshot
+        if mtime != self._loaded_mtime:
+            self._snapshot = CatalogSnapshot.load(self.path)
+            self._loaded_mtime = mtime
+        return self._snapshot
+
+    async def refresh(self, session: AsyncSession, force: bool = False) -> bool:
+        """
+        Rebuild the snapshot file if the catalog changed since it was built.
+        Returns False if it did not, or another process is rebuilding it.
+        """
+        with try_lock(f"{self.path}.lock") as locked:
+            if not locked:
+                return False
+            current = self.get()
+            if (
+                not force
+                and current is not None
+                and current.marker == await catalog_marker(session)
+            ):
+                return False
+            snapshot = await CatalogSnapshot.build(session)
+            await asyncio.to_thread(snapshot.save, self.path)
+        self.get()
+        return True
+
+
+catalog_snapshot = CatalogSnapshotStore(get_settings().CATALOG_SNAPSHOT_PATH)
+
+
+async def run_snapshot_refresh(
+    session_factory: async_sessionmaker, interval: float
+) -> None:
+    """
+    Background loop running :meth:`CatalogSnapshotStore.refresh` every
+    ``interval`` seconds until cancelled, starting immediately.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                if await catalog_snapshot.refresh(session):
+                    logger.info(
+                        "Catalog snapshot rebuilt (%s movies)",
+                        len(catalog_snapshot.get()),
+                    )
+        except Exception:
+            logger.exception("Catalog snapshot refresh failed")
+        await asyncio.sleep(interval)
+
+
+async def main(force: bool) -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        rebuilt = await catalog_snapshot.refresh(session, force=force)
+    snapshot = catalog_snapshot.get()
+    state = "rebuilt" if rebuilt else "already up to date"
+    print(
+        f"Catalog snapshot {state}: {len(snapshot) if snapshot else 0} movies, "
+        f"{time.perf_counter() - started:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild even if nothing changed."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.force))
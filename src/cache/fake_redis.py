@@ -0,0 +1,71 @@
+import time
+from typing import Callable, Optional, Union
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the subset of the ``redis.asyncio.Redis`` client
+    used by :class:`src.cache.backends.RedisBackend`.
+
+    Values are stored as bytes and expire like Redis keys do, so the Redis
+    code path can be exercised without a server. It is shared by all users of
+    one instance, which makes it usable to simulate several workers.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic) -> None:
+        self._timer = timer
+        self._data: dict[str, tuple[Optional[float], bytes]] = {}
+
+    @staticmethod
+    def _encode(value: Union[bytes, str, int, float]) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _live(self, name: str) -> Optional[bytes]:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._timer():
+            del self._data[name]
+            return None
+        return value
+
+    async def get(self, name: str) -> Optional[bytes]:
+        return self._live(name)
+
+    async def set(
+        self,
+        name: str,
+        value: Union[bytes, str, int, float],
+        ex: Optional[float] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        if nx and self._live(name) is not None:
+            return None
+        expires_at = None
+        if px is not None:
+            expires_at = self._timer() + px / 1000
+        elif ex is not None:
+            expires_at = self._timer() + ex
+        self._data[name] = (expires_at, self._encode(value))
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        current = self._live(name)
+        number = (int(current) if current is not None else 0) + amount
+        expires_at = self._data[name][0] if current is not None else None
+        self._data[name] = (expires_at, self._encode(number))
+        return number
+
+    async def flushall(self) -> bool:
+        self._data.clear()
+        return True
+
+    async def aclose(self) -> None:
+        pass
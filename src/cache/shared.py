@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+import zlib
+from collections import Counter
+from typing import Any, Awaitable, Callable, Optional
+
+from src.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from src.cache.memory import MISSING
+from src.config.settings import BaseAppSettings
+
+# First byte of every stored payload. Pickled payloads of earlier versions
+# used 0 and 1; they are read as misses.
+RAW = b"\x02"
+COMPRESSED = b"\x03"
+COMPRESS_MIN_SIZE = 1024
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode ``value`` as compact JSON, deflating larger payloads.
+
+    Only data goes into the shared backend, nothing that runs code when
+    read back: values must be JSON types, and tuples come back as lists.
+    """
+    payload = json.dumps(value, separators=(",", ":"), allow_nan=False).encode()
+    if len(payload) >= COMPRESS_MIN_SIZE:
+        return COMPRESSED + zlib.compress(payload, 1)
+    return RAW + payload
+
+
+def loads(data: bytes) -> Any:
+    marker, payload = data[:1], data[1:]
+    if marker == COMPRESSED:
+        payload = zlib.decompress(payload)
+    elif marker != RAW:
+        raise ValueError(f"Unknown cache payload marker {marker!r}.")
+    return json.loads(payload)
+
+
+class Cache:
+    """
+    Namespaced object cache over a :class:`CacheBackend`.
+
+    Keys are stored as ``{prefix}:{namespace}:{generation}:{key}``. Each
+    namespace has a generation in the backend, a clock reading in
+    nanoseconds; ``invalidate`` replaces it with a new one, which orphans
+    every entry of the namespace at once (they expire on their own) and is
+    visible to all workers sharing the backend.
+
+    ``get_or_set`` protects loaders from stampedes at two levels: concurrent
+    misses inside one process await a single in-flight load, and across
+    processes a short ``SET NX`` lock lets one worker recompute while the
+    others poll for its result.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        prefix: str = "cinema",
+        default_ttl: float = 300,
+        lock_timeout: float = 5.0,
+        lock_poll_interval: float = 0.05,
+    ) -> None:
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.counters: Counter[str] = Counter()
+
+    async def _generation(self, namespace: str) -> bytes:
+        key = f"{self.prefix}:{namespace}:generation"
+        generation = await self.backend.get(key)
+        if generation is None:
+            # The key may have expired or been evicted; a new clock reading
+            # never brings entries of an earlier generation back to life.
+            await self.backend.add(key, str(time.time_ns()).encode())
+            generation = await self.backend.get(key) or b"0"
+        return generation
+
+    async def make_key(self, namespace: str, key: str) -> str:
+        generation = (await self._generation(namespace)).decode()
+        return f"{self.prefix}:{namespace}:{generation}:{key}"
+
+    async def _read(self, full_key: str) -> Any:
+        data = await self.backend.get(full_key)
+        if data is None:
+            return MISSING
+        try:
+            return loads(data)
+        except ValueError:
+            # Written in another format; the next load overwrites it.
+            return MISSING
+
+    async def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        value = await self._read(await self.make_key(namespace, key))
+        if value is MISSING:
+            self.counters["misses"] += 1
+            return default
+        self.counters["hits"] += 1
+        return value
+
+    async def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        full_key = await self.make_key(namespace, key)
+        await self.backend.set(full_key, dumps(value), ttl or self.default_ttl)
+
+    async def delete(self, namespace: str, key: str) -> None:
+        await self.backend.delete(await self.make_key(namespace, key))
+
+    async def invalidate(self, namespace: str) -> None:
+        # Not INCR: on a lost key it would restart at a value used before.
+        await self.backend.set(
+            f"{self.prefix}:{namespace}:generation", str(time.time_ns()).encode()
+        )
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        full_key = await self.make_key(namespace, key)
+        value = await self._read(full_key)
+        if value is not MISSING:
+            self.counters["hits"] += 1
+            return value
+        self.counters["misses"] += 1
+
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved even when nobody else was waiting.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[full_key] = future
+        try:
+            value = await self._fill(full_key, loader, ttl or self.default_ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[full_key]
+
+    async def _fill(
+        self, full_key: str, loader: Callable[[], Awaitable[Any]], ttl: float
+    ) -> Any:
+        lock_key = f"{full_key}:lock"
+        locked = await self.backend.add(lock_key, b"1", self.lock_timeout)
+        if not locked:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.lock_poll_interval)
+                value = await self._read(full_key)
+                if value is not MISSING:
+                    self.counters["lock_waits"] += 1
+                    return value
+                locked = await self.backend.add(lock_key, b"1", self.lock_timeout)
+                if locked:
+                    break
+            # Past the deadline the holder is assumed gone; recompute anyway.
+        try:
+            self.counters["loads"] += 1
+            value = await loader()
+            await self.backend.set(full_key, dumps(value), ttl)
+            return value
+        finally:
+            if locked:
+                await self.backend.delete(lock_key)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.counters["hits"],
+            "misses": self.counters["misses"],
+            "loads": self.counters["loads"],
+            "coalesced": self.counters["coalesced"],
+            "lock_waits": self.counters["lock_waits"],
+        }
+
+
+def create_cache(settings: BaseAppSettings) -> Cache:
+    if settings.CACHE_BACKEND == "redis":
+        backend: CacheBackend = RedisBackend.from_url(settings.CACHE_REDIS_URL)
+    else:
+        backend = MemoryBackend(
+            maxsize=settings.CACHE_MAX_SIZE, ttl=settings.CACHE_DEFAULT_TTL
+        )
+    return Cache(
+        backend,
+        prefix=settings.CACHE_KEY_PREFIX,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        lock_timeout=settings.CACHE_LOCK_TIMEOUT,
+    )
@@ -1,2 +1,2 @@
-from config.settings import BaseAppSettings
-from config.dependencies import get_settings
+from src.config.settings import BaseAppSettings
+from src.config.dependencies import get_settings
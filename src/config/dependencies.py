@@ -1,6 +1,14 @@
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from config.settings import BaseAppSettings, TestingSettings, Settings
+from src.config.settings import BaseAppSettings, TestingSettings, Settings
+
+if TYPE_CHECKING:
+    from src.cache.shared import Cache
+    from src.notifications.mail import EmailSender
+    from src.payments.provider import PaymentProviderClient
+    from src.ratelimit.limiter import RateLimiter
 
 
 def get_settings() -> BaseAppSettings:
@@ -8,3 +16,46 @@ def get_settings() -> BaseAppSettings:
     if environment == "testing":
         return TestingSettings()
     return Settings()
+
+
+@lru_cache
+def get_cache() -> "Cache":
+    """
+    Process-wide cache shared by the routes; override it in tests with
+    ``app.dependency_overrides[get_cache]``.
+    """
+    # Imported lazily: src.cache itself depends on get_settings.
+    from src.cache.shared import create_cache
+
+    return create_cache(get_settings())
+
+
+@lru_cache
+def get_payment_provider() -> "PaymentProviderClient":
+    """
+    Process-wide payment provider client; tests point it at the fake
+    provider with ``app.dependency_overrides[get_payment_provider]``.
+    """
+    from src.payments.provider import create_payment_provider
+
+    return create_payment_provider(get_settings())
+
+
+@lru_cache
+def get_email_sender() -> "EmailSender":
+    """
+    Process-wide email sender used by the email jobs.
+    """
+    from src.notifications.mail import create_email_sender
+
+    return create_email_sender(get_settings())
+
+
+@lru_cache
+def get_rate_limiter() -> "RateLimiter":
+    """
+    Process-wide rate limiter of the ``rate_limit`` dependencies.
+    """
+    from src.ratelimit.limiter import create_rate_limiter
+
+    return create_rate_limiter(get_settings())
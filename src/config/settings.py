@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 
-from pydantic.v1 import BaseSettings
+from pydantic.v1 import BaseSettings, validator
 
 from dotenv import load_dotenv
 
@@ -16,6 +16,272 @@ class BaseAppSettings(BaseSettings):
     PATH_TO_MOVIES_CSV: str = str(
         BASE_DIR / "database" / "seed_data" / "imdb_movies.csv"
     )
+    SEED_BATCH_SIZE: int = int(os.getenv("SEED_BATCH_SIZE", 1000))
+
+    # Full SQLAlchemy URL; a bare filesystem path is treated as a SQLite file.
+    DATABASE_URL: str = ""
+
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
+    SQLITE_WAL_MODE: bool = os.getenv("SQLITE_WAL_MODE", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    # Negative values are KiB, positive values are pages (SQLite semantics).
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -64000))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+
+    CATALOG_CACHE_TTL: float = float(os.getenv("CATALOG_CACHE_TTL", 300))
+    CATALOG_CACHE_MAX_SIZE: int = int(os.getenv("CATALOG_CACHE_MAX_SIZE", 10_000))
+    # Columnar catalog copy, memory-mapped by every worker, that serves the
+    # movie listing. Checked for catalog changes every interval, which is how
+    # far listings may lag writes; 0 disables it and the listing queries the
+    # database.
+    CATALOG_SNAPSHOT_PATH: str = os.getenv(
+        "CATALOG_SNAPSHOT_PATH",
+        str(BASE_DIR / "database" / "source" / "catalog.snapshot"),
+    )
+    CATALOG_SNAPSHOT_REFRESH_INTERVAL: float = float(
+        os.getenv("CATALOG_SNAPSHOT_REFRESH_INTERVAL", 30)
+    )
+    # Admin bulk transfer: movies read per export page and rows written per
+    # import transaction.
+    CATALOG_EXPORT_PAGE_SIZE: int = int(os.getenv("CATALOG_EXPORT_PAGE_SIZE", 1000))
+    CATALOG_IMPORT_BATCH_SIZE: int = int(os.getenv("CATALOG_IMPORT_BATCH_SIZE", 1000))
+
+    # Cache shared by all workers: "memory" (per process) or "redis".
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX: str = os.getenv("CACHE_KEY_PREFIX", "cinema")
+    CACHE_DEFAULT_TTL: float = float(os.getenv("CACHE_DEFAULT_TTL", 300))
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", 10_000))
+    CACHE_LOCK_TIMEOUT: float = float(os.getenv("CACHE_LOCK_TIMEOUT", 5))
+    SEARCH_CACHE_TTL: float = float(os.getenv("SEARCH_CACHE_TTL", 60))
+
+    # Seconds clients may reuse a movie response before revalidating it.
+    MOVIE_CACHE_MAX_AGE: int = int(os.getenv("MOVIE_CACHE_MAX_AGE", 60))
+    # Listing routes encode their rows directly (orjson when installed)
+    # instead of going through pydantic response models.
+    FAST_JSON_RESPONSES: bool = (
+        os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
+    )
+
+    # Per-client limits on expensive routes (login, registration, emails,
+    # password reset completion, checkout), by user for signed-in requests
+    # and by address otherwise.
+    # RATE_LIMITS overrides the defaults in src/ratelimit/limiter.py, e.g.
+    # "login=20/60,checkout.admin=off". Buckets live in each process
+    # ("memory") or in Redis at CACHE_REDIS_URL, shared by all workers
+    # ("redis"). A client may also run at most RATE_LIMIT_CONCURRENCY
+    # requests to a limited route at once (per process, 0 disables).
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMITS: str = os.getenv("RATE_LIMITS", "")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100_000))
+    RATE_LIMIT_CONCURRENCY: int = int(os.getenv("RATE_LIMIT_CONCURRENCY", 2))
+
+    # HS256 key for access tokens; retired keys stay valid for verification
+    # (comma separated) until the tokens they signed have expired.
+    JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "change-me-in-production")
+    JWT_PREVIOUS_SECRET_KEYS: str = os.getenv("JWT_PREVIOUS_SECRET_KEYS", "")
+    ACCESS_TOKEN_LIFETIME_MINUTES: int = int(
+        os.getenv("ACCESS_TOKEN_LIFETIME_MINUTES", 15)
+    )
+    REFRESH_TOKEN_LIFETIME_DAYS: int = int(os.getenv("REFRESH_TOKEN_LIFETIME_DAYS", 7))
+    # Per-process cache of refresh token lookups; a revoked token may still
+    # validate (but never rotate) on another worker for up to this long.
+    TOKEN_CACHE_TTL: float = float(os.getenv("TOKEN_CACHE_TTL", 30))
+    TOKEN_CACHE_NEGATIVE_TTL: float = float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL", 5))
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 50_000))
+    # Seconds between expired token purges; 0 disables the background task.
+    TOKEN_PURGE_INTERVAL: float = float(os.getenv("TOKEN_PURGE_INTERVAL", 3600))
+    TOKEN_PURGE_BATCH_SIZE: int = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", 1000))
+
+    # scrypt cost parameters; changing them rehashes passwords on next login.
+    PASSWORD_SCRYPT_N: int = int(os.getenv("PASSWORD_SCRYPT_N", 2**14))
+    PASSWORD_SCRYPT_R: int = int(os.getenv("PASSWORD_SCRYPT_R", 8))
+    PASSWORD_SCRYPT_P: int = int(os.getenv("PASSWORD_SCRYPT_P", 1))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+    )
+    # Hash/verify calls allowed to run or wait at once, and how long a caller
+    # waits for a slot before the request is answered with 503.
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(
+        os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 1.0)
+    )
+
+    # Requests running more SQL statements than this are logged (N+1 hunting).
+    QUERY_COUNT_WARNING_THRESHOLD: int = int(
+        os.getenv("QUERY_COUNT_WARNING_THRESHOLD", 15)
+    )
+
+    # Purchases count half as much towards "trending" after this many days.
+    # Aggregates are rebuilt from paid orders every interval (0 disables).
+    MOVIE_TRENDING_HALF_LIFE_DAYS: float = float(
+        os.getenv("MOVIE_TRENDING_HALF_LIFE_DAYS", 7.0)
+    )
+    MOVIE_STATS_RECONCILE_INTERVAL: float = float(
+        os.getenv("MOVIE_STATS_RECONCILE_INTERVAL", 3600)
+    )
+
+    # Similar/recommended movies index, memory-mapped by every worker. One
+    # worker refreshes it from the catalog every interval (0 disables).
+    RECOMMENDATION_INDEX_PATH: str = os.getenv(
+        "RECOMMENDATION_INDEX_PATH",
+        str(BASE_DIR / "database" / "source" / "recommendations.idx"),
+    )
+    RECOMMENDATION_REFRESH_INTERVAL: float = float(
+        os.getenv("RECOMMENDATION_REFRESH_INTERVAL", 300)
+    )
+
+    # Uploaded avatars and posters, stored by content hash. Resizing runs in
+    # a process pool with bounded admission, like password hashing.
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", str(BASE_DIR.parent / "media"))
+    MEDIA_UPLOAD_MAX_BYTES: int = int(
+        os.getenv("MEDIA_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+    )
+    MEDIA_MAX_IMAGE_PIXELS: int = int(os.getenv("MEDIA_MAX_IMAGE_PIXELS", 40_000_000))
+    MEDIA_PROCESS_WORKERS: int = int(
+        os.getenv("MEDIA_PROCESS_WORKERS", min(2, os.cpu_count() or 1))
+    )
+    MEDIA_PROCESS_MAX_PENDING: int = int(os.getenv("MEDIA_PROCESS_MAX_PENDING", 8))
+    MEDIA_PROCESS_QUEUE_TIMEOUT: float = float(
+        os.getenv("MEDIA_PROCESS_QUEUE_TIMEOUT", 5.0)
+    )
+
+    # Background jobs. Every app process runs a worker unless JOBS_RUN_IN_APP
+    # is false, in which case run `python -m src.jobs.worker` separately.
+    # Failed jobs are retried with exponential backoff up to the attempt cap.
+    JOBS_RUN_IN_APP: bool = os.getenv("JOBS_RUN_IN_APP", "true").lower() == "true"
+    JOB_WORKER_CONCURRENCY: int = int(os.getenv("JOB_WORKER_CONCURRENCY", 4))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", 300))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+    JOB_RETRY_BASE_SECONDS: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", 10))
+    JOB_RETRY_MAX_SECONDS: float = float(os.getenv("JOB_RETRY_MAX_SECONDS", 3600))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", 7))
+
+    # Outgoing email: "file" writes .eml files to EMAIL_FILE_DIR, "smtp" sends
+    # through SMTP_HOST (a local stand-in such as MailHog works).
+    EMAIL_BACKEND: str = os.getenv("EMAIL_BACKEND", "file")
+    EMAIL_SENDER: str = os.getenv(
+        "EMAIL_SENDER", "Online Cinema <no-reply@cinema.local>"
+    )
+    EMAIL_FILE_DIR: str = os.getenv("EMAIL_FILE_DIR", str(BASE_DIR.parent / "emails"))
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "localhost")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", 1025))
+    SMTP_USERNAME: str = os.getenv("SMTP_USERNAME", "")
+    SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "false").lower() == "true"
+    SMTP_TIMEOUT: float = float(os.getenv("SMTP_TIMEOUT", 10.0))
+    # Links in emails point here.
+    APP_BASE_URL: str = os.getenv("APP_BASE_URL", "http://localhost:8000")
+    ACTIVATION_TOKEN_LIFETIME_HOURS: int = int(
+        os.getenv("ACTIVATION_TOKEN_LIFETIME_HOURS", 24)
+    )
+    PASSWORD_RESET_TOKEN_LIFETIME_HOURS: int = int(
+        os.getenv("PASSWORD_RESET_TOKEN_LIFETIME_HOURS", 1)
+    )
+
+    # Payment provider API. Webhooks are HMAC-signed with the shared secret and
+    # rejected when their timestamp is further off than the tolerance.
+    PAYMENT_PROVIDER_URL: str = os.getenv(
+        "PAYMENT_PROVIDER_URL", "http://localhost:8001"
+    )
+    PAYMENT_PROVIDER_API_KEY: str = os.getenv("PAYMENT_PROVIDER_API_KEY", "test-key")
+    PAYMENT_PROVIDER_TIMEOUT: float = float(os.getenv("PAYMENT_PROVIDER_TIMEOUT", 10.0))
+    PAYMENT_WEBHOOK_SECRET: str = os.getenv(
+        "PAYMENT_WEBHOOK_SECRET", "change-me-in-production"
+    )
+    PAYMENT_WEBHOOK_TOLERANCE_SECONDS: int = int(
+        os.getenv("PAYMENT_WEBHOOK_TOLERANCE_SECONDS", 300)
+    )
+
+    @validator("DATABASE_URL", always=True)
+    def assemble_database_url(cls, value: str, values: dict) -> str:
+        value = value or values["PATH_TO_DB"]
+        if "://" not in value:
+            return f"sqlite+aiosqlite:///{value}"
+        return value
+
+    @validator("CACHE_BACKEND")
+    def validate_cache_backend(cls, value: str) -> str:
+        if value not in ("memory", "redis"):
+            raise ValueError("CACHE_BACKEND must be 'memory' or 'redis'.")
+        return value
+
+    @validator("RATE_LIMIT_BACKEND")
+    def validate_rate_limit_backend(cls, value: str) -> str:
+        if value not in ("memory", "redis"):
+            raise ValueError("RATE_LIMIT_BACKEND must be 'memory' or 'redis'.")
+        return value
+
+    @validator("EMAIL_BACKEND")
+    def validate_email_backend(cls, value: str) -> str:
+        if value not in ("file", "smtp"):
+            raise ValueError("EMAIL_BACKEND must be 'file' or 'smtp'.")
+        return value
+
+    @validator("MOVIE_TRENDING_HALF_LIFE_DAYS")
+    def validate_half_life(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("MOVIE_TRENDING_HALF_LIFE_DAYS must be positive.")
+        return value
+
+    @validator("PASSWORD_SCRYPT_N")
+    def validate_scrypt_n(cls, value: int) -> int:
+        if value < 2 or value & (value - 1):
+            raise ValueError("PASSWORD_SCRYPT_N must be a power of two.")
+        return value
+
+    @validator(
+        "PASSWORD_HASH_WORKERS",
+        "PASSWORD_HASH_MAX_PENDING",
+        "MEDIA_PROCESS_WORKERS",
+        "MEDIA_PROCESS_MAX_PENDING",
+        "JOB_WORKER_CONCURRENCY",
+        "JOB_MAX_ATTEMPTS",
+        "CATALOG_EXPORT_PAGE_SIZE",
+        "CATALOG_IMPORT_BATCH_SIZE",
+        "RATE_LIMIT_MAX_KEYS",
+    )
+    def validate_positive(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("Value must be at least 1.")
+        return value
+
+    @validator("DB_POOL_SIZE")
+    def validate_pool_size(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("DB_POOL_SIZE must be at least 1.")
+        return value
+
+    @validator("DB_MAX_OVERFLOW", "DB_STATEMENT_CACHE_SIZE", "RATE_LIMIT_CONCURRENCY")
+    def validate_non_negative(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("Value must not be negative.")
+        return value
+
+    @validator("DB_POOL_TIMEOUT")
+    def validate_pool_timeout(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("DB_POOL_TIMEOUT must be positive.")
+        return value
+
+    @validator("DB_POOL_RECYCLE")
+    def validate_pool_recycle(cls, value: int) -> int:
+        # -1 disables recycling, mirroring SQLAlchemy's own default.
+        if value < -1 or value == 0:
+            raise ValueError("DB_POOL_RECYCLE must be -1 or a positive number.")
+        return value
+
+    @property
+    def is_postgresql(self) -> bool:
+        return self.DATABASE_URL.startswith("postgresql")
 
 
 class Settings(BaseAppSettings):
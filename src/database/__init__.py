@@ -1 +1,27 @@
+from src.config.dependencies import get_settings
 from src.database.models.base import Base
+
+# Register every model so string relationships between modules resolve.
+from src.database.models import (  # noqa: F401,E402
+    users,
+    movies,
+    carts,
+    orders,
+    payments,
+    jobs,
+)
+
+if get_settings().is_postgresql:
+    from src.database.session_postgresql import (
+        AsyncPostgresqlSessionLocal as AsyncSessionLocal,
+        get_postgresql_db as get_db,
+        get_postgresql_db as get_read_db,
+        postgresql_engine as engine,
+    )
+else:
+    from src.database.session_sqlite import (
+        AsyncSQLiteSessionLocal as AsyncSessionLocal,
+        get_sqlite_db as get_db,
+        get_sqlite_read_db as get_read_db,
+        sqlite_engine as engine,
+    )
@@ -4,8 +4,16 @@ from logging.config import fileConfig
 from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
 
-from database.models import users, movies, orders, payments  # noqa: F401
-from database.models.base import Base
+from src.config.dependencies import get_settings
+from src.database.models import (  # noqa: F401
+    users,
+    movies,
+    carts,
+    orders,
+    payments,
+    jobs,
+)
+from src.database.models.base import Base
 
 
 config = context.config
@@ -15,6 +23,8 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+config.set_main_option("sqlalchemy.url", get_settings().DATABASE_URL)
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -0,0 +1,52 @@
+"""purchased movies
+
+Revision ID: 3f6c0a9d8b52
+Revises: e2a94b7c5d18
+Create Date: 2026-10-18 21:47:09.334812
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6c0a9d8b52"
+down_revision: Union[str, None] = "e2a94b7c5d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "purchased_movies",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "acquired_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "movie_id"),
+    )
+    op.create_index(
+        "ix_purchased_movies_order_id",
+        "purchased_movies",
+        ["order_id"],
+        unique=False,
+    )
+    # Existing paid orders are loaded with `python -m src.orders.ownership`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_purchased_movies_order_id", table_name="purchased_movies")
+    op.drop_table("purchased_movies")
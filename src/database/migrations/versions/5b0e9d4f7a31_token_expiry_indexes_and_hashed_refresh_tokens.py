@@ -0,0 +1,59 @@
+"""token expiry indexes and hashed refresh tokens
+
+Revision ID: 5b0e9d4f7a31
+Revises: ac2ad763af62
+Create Date: 2026-10-18 19:02:17.410583
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e9d4f7a31"
+down_revision: Union[str, None] = "ac2ad763af62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_activation_tokens_expires_at",
+        "activation_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_password_reset_tokens_expires_at",
+        "password_reset_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+    # Refresh tokens are now stored as SHA-256 hex digests; hash the plain
+    # tokens issued so far so existing sessions keep working.
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, token FROM refresh_tokens")).all()
+    if rows:
+        connection.execute(
+            sa.text("UPDATE refresh_tokens SET token = :token WHERE id = :id"),
+            [
+                {"id": id_, "token": hashlib.sha256(token.encode()).hexdigest()}
+                for id_, token in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Hashes cannot be turned back into tokens; hashed rows are dropped.
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index(
+        "ix_password_reset_tokens_expires_at", table_name="password_reset_tokens"
+    )
+    op.drop_index("ix_activation_tokens_expires_at", table_name="activation_tokens")
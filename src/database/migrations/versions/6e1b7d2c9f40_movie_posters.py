@@ -0,0 +1,30 @@
+"""movie posters
+
+Revision ID: 6e1b7d2c9f40
+Revises: 9a4e2d7f1c63
+Create Date: 2026-10-18 23:12:40.518306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1b7d2c9f40"
+down_revision: Union[str, None] = "9a4e2d7f1c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("movies", sa.Column("poster", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Plain ALTER TABLE keeps the search triggers on movies; see ac2ad763af62.
+    op.execute("ALTER TABLE movies DROP COLUMN poster")
@@ -0,0 +1,103 @@
+"""carts and orders
+
+Revision ID: 8d3f1c6a2e47
+Revises: 5b0e9d4f7a31
+Create Date: 2026-10-18 20:14:52.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f1c6a2e47"
+down_revision: Union[str, None] = "5b0e9d4f7a31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "carts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "cart_items",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("cart_id", sa.Integer(), nullable=False),
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "added_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["cart_id"], ["carts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "cart_id", "movie_id", name="uq_cart_items_cart_id_movie_id"
+        ),
+    )
+    op.create_index("ix_cart_items_movie_id", "cart_items", ["movie_id"], unique=False)
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "PAID", "CANCELED", name="orderstatusenum"),
+            nullable=False,
+        ),
+        sa.Column("total_amount", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("cart_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["cart_id"], ["carts.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_orders_user_id_status", "orders", ["user_id", "status"], unique=False
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("price_at_order", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"]),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_order_items_order_id", "order_items", ["order_id"], unique=False
+    )
+    op.create_index(
+        "ix_order_items_movie_id", "order_items", ["movie_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_order_items_movie_id", table_name="order_items")
+    op.drop_index("ix_order_items_order_id", table_name="order_items")
+    op.drop_table("order_items")
+    op.drop_index("ix_orders_user_id_status", table_name="orders")
+    op.drop_table("orders")
+    sa.Enum(name="orderstatusenum").drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_cart_items_movie_id", table_name="cart_items")
+    op.drop_table("cart_items")
+    op.drop_table("carts")
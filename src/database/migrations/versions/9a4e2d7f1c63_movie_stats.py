@@ -0,0 +1,55 @@
+"""movie stats
+
+Revision ID: 9a4e2d7f1c63
+Revises: 3f6c0a9d8b52
+Create Date: 2026-10-18 22:31:26.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4e2d7f1c63"
+down_revision: Union[str, None] = "3f6c0a9d8b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "movie_stats",
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("purchase_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.DECIMAL(precision=12, scale=2), nullable=False),
+        sa.Column("purchases_30d", sa.Integer(), nullable=False),
+        sa.Column("trending_score", sa.Float(), nullable=False),
+        sa.Column("last_purchased_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("movie_id"),
+    )
+    op.create_index(
+        "ix_movie_stats_popular",
+        "movie_stats",
+        ["purchase_count", "movie_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_movie_stats_trending",
+        "movie_stats",
+        ["trending_score", "movie_id"],
+        unique=False,
+    )
+    # Filled from existing paid orders by `python -m src.orders.popularity`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_movie_stats_trending", table_name="movie_stats")
+    op.drop_index("ix_movie_stats_popular", table_name="movie_stats")
+    op.drop_table("movie_stats")
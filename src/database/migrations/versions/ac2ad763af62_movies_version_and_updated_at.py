@@ -0,0 +1,47 @@
+"""movies version and updated_at
+
+Revision ID: ac2ad763af62
+Revises: c75c7f7a82f9
+Create Date: 2026-10-18 13:05:52.774120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ac2ad763af62"
+down_revision: Union[str, None] = "c75c7f7a82f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "movies",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    # SQLite cannot ADD COLUMN with a non-constant default, so start from a
+    # constant and stamp existing rows afterwards.
+    op.add_column(
+        "movies",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default="1970-01-01 00:00:00",
+            nullable=False,
+        ),
+    )
+    op.execute("UPDATE movies SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Plain ALTER TABLE (SQLite >= 3.35) keeps the search triggers on movies,
+    # which a batch table rebuild would drop.
+    op.execute("ALTER TABLE movies DROP COLUMN updated_at")
+    op.execute("ALTER TABLE movies DROP COLUMN version")
@@ -0,0 +1,69 @@
+"""catalog and token indexes
+
+Revision ID: c115ab1af6d4
+Revises: 1c93b8f130a5
+Create Date: 2026-10-18 10:12:41.530218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c115ab1af6d4"
+down_revision: Union[str, None] = "1c93b8f130a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_movies_year_id", "movies", ["year", "id"], unique=False)
+    op.create_index("ix_movies_imdb", "movies", ["imdb"], unique=False)
+    op.create_index(
+        "ix_movies_certification_id_id",
+        "movies",
+        ["certification_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_movie_genres_genre_id_movie_id",
+        "movie_genres",
+        ["genre_id", "movie_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_movie_stars_star_id_movie_id",
+        "movie_stars",
+        ["star_id", "movie_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_movie_directors_director_id_movie_id",
+        "movie_directors",
+        ["director_id", "movie_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.drop_index(
+        "ix_movie_directors_director_id_movie_id", table_name="movie_directors"
+    )
+    op.drop_index("ix_movie_stars_star_id_movie_id", table_name="movie_stars")
+    op.drop_index("ix_movie_genres_genre_id_movie_id", table_name="movie_genres")
+    op.drop_index("ix_movies_certification_id_id", table_name="movies")
+    op.drop_index("ix_movies_imdb", table_name="movies")
+    op.drop_index("ix_movies_year_id", table_name="movies")
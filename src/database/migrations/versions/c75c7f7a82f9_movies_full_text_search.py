@@ -0,0 +1,221 @@
+"""movies full text search
+
+Revision ID: c75c7f7a82f9
+Revises: c115ab1af6d4
+Create Date: 2026-10-18 11:40:07.218415
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c75c7f7a82f9"
+down_revision: Union[str, None] = "c115ab1af6d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The search structures as of this revision, copied rather than imported from
+# src.database.search so that later changes there do not rewrite history.
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        name, description, stars, directors,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts (rowid, name, description, stars, directors)
+        VALUES (NEW.id, NEW.name, NEW.description, '', '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update
+    AFTER UPDATE OF name, description ON movies BEGIN
+        UPDATE movies_fts SET name = NEW.name, description = NEW.description
+        WHERE rowid = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        DELETE FROM movies_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movie_stars_fts_insert
+    AFTER INSERT ON movie_stars BEGIN
+        UPDATE movies_fts SET stars = (
+            SELECT coalesce(group_concat(e.name, ' '), '')
+            FROM movie_stars AS l JOIN stars AS e ON e.id = l.star_id
+            WHERE l.movie_id = NEW.movie_id
+        )
+        WHERE rowid = NEW.movie_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movie_stars_fts_delete
+    AFTER DELETE ON movie_stars BEGIN
+        UPDATE movies_fts SET stars = (
+            SELECT coalesce(group_concat(e.name, ' '), '')
+            FROM movie_stars AS l JOIN stars AS e ON e.id = l.star_id
+            WHERE l.movie_id = OLD.movie_id
+        )
+        WHERE rowid = OLD.movie_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movie_directors_fts_insert
+    AFTER INSERT ON movie_directors BEGIN
+        UPDATE movies_fts SET directors = (
+            SELECT coalesce(group_concat(e.name, ' '), '')
+            FROM movie_directors AS l JOIN directors AS e ON e.id = l.director_id
+            WHERE l.movie_id = NEW.movie_id
+        )
+        WHERE rowid = NEW.movie_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movie_directors_fts_delete
+    AFTER DELETE ON movie_directors BEGIN
+        UPDATE movies_fts SET directors = (
+            SELECT coalesce(group_concat(e.name, ' '), '')
+            FROM movie_directors AS l JOIN directors AS e ON e.id = l.director_id
+            WHERE l.movie_id = OLD.movie_id
+        )
+        WHERE rowid = OLD.movie_id;
+    END
+    """,
+    """
+    INSERT INTO movies_fts (rowid, name, description, stars, directors)
+    SELECT
+        m.id,
+        m.name,
+        m.description,
+        coalesce((
+            SELECT group_concat(s.name, ' ') FROM movie_stars AS ms
+            JOIN stars AS s ON s.id = ms.star_id WHERE ms.movie_id = m.id
+        ), ''),
+        coalesce((
+            SELECT group_concat(d.name, ' ') FROM movie_directors AS md
+            JOIN directors AS d ON d.id = md.director_id WHERE md.movie_id = m.id
+        ), '')
+    FROM movies AS m
+    WHERE m.id NOT IN (SELECT rowid FROM movies_fts)
+    """,
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS movies_fts_insert",
+    "DROP TRIGGER IF EXISTS movies_fts_update",
+    "DROP TRIGGER IF EXISTS movies_fts_delete",
+    "DROP TRIGGER IF EXISTS movie_stars_fts_insert",
+    "DROP TRIGGER IF EXISTS movie_stars_fts_delete",
+    "DROP TRIGGER IF EXISTS movie_directors_fts_insert",
+    "DROP TRIGGER IF EXISTS movie_directors_fts_delete",
+    "DROP TABLE IF EXISTS movies_fts",
+)
+
+POSTGRESQL_DROP_TRIGGERS = (
+    "DROP TRIGGER IF EXISTS movies_search_vector_update ON movies",
+    "DROP TRIGGER IF EXISTS movie_stars_search_vector_update ON movie_stars",
+    "DROP TRIGGER IF EXISTS movie_directors_search_vector_update ON movie_directors",
+)
+
+POSTGRESQL_UPGRADE = (
+    "ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION movies_search_document(
+        target_id integer, title text, body text
+    ) RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce((
+                SELECT string_agg(s.name, ' ') FROM movie_stars AS ms
+                JOIN stars AS s ON s.id = ms.star_id WHERE ms.movie_id = target_id
+            ), '')), 'B')
+            || setweight(to_tsvector('english', coalesce((
+                SELECT string_agg(d.name, ' ') FROM movie_directors AS md
+                JOIN directors AS d ON d.id = md.director_id
+                WHERE md.movie_id = target_id
+            ), '')), 'B')
+            || setweight(to_tsvector('english', coalesce(body, '')), 'C')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movies_search_vector_trigger() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := movies_search_document(
+            NEW.id, NEW.name, NEW.description
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movie_links_search_vector_trigger()
+    RETURNS trigger AS $$
+    DECLARE
+        target integer;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            target := OLD.movie_id;
+        ELSE
+            target := NEW.movie_id;
+        END IF;
+        UPDATE movies
+        SET search_vector = movies_search_document(id, name, description)
+        WHERE id = target;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    *POSTGRESQL_DROP_TRIGGERS,
+    """
+    CREATE TRIGGER movies_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description ON movies
+    FOR EACH ROW EXECUTE FUNCTION movies_search_vector_trigger()
+    """,
+    """
+    CREATE TRIGGER movie_stars_search_vector_update
+    AFTER INSERT OR DELETE ON movie_stars
+    FOR EACH ROW EXECUTE FUNCTION movie_links_search_vector_trigger()
+    """,
+    """
+    CREATE TRIGGER movie_directors_search_vector_update
+    AFTER INSERT OR DELETE ON movie_directors
+    FOR EACH ROW EXECUTE FUNCTION movie_links_search_vector_trigger()
+    """,
+    "UPDATE movies SET search_vector = movies_search_document(id, name, description)",
+    "CREATE INDEX IF NOT EXISTS ix_movies_search_vector "
+    "ON movies USING GIN (search_vector)",
+)
+
+POSTGRESQL_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_movies_search_vector",
+    *POSTGRESQL_DROP_TRIGGERS,
+    "DROP FUNCTION IF EXISTS movie_links_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS movies_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS movies_search_document(integer, text, text)",
+    "ALTER TABLE movies DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def _execute_all(postgresql: Sequence[str], sqlite: Sequence[str]) -> None:
+    connection = op.get_bind()
+    statements = postgresql if connection.dialect.name == "postgresql" else sqlite
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _execute_all(POSTGRESQL_UPGRADE, SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _execute_all(POSTGRESQL_DOWNGRADE, SQLITE_DOWNGRADE)
@@ -0,0 +1,94 @@
+"""payments
+
+Revision ID: e2a94b7c5d18
+Revises: 8d3f1c6a2e47
+Create Date: 2026-10-18 21:03:40.551927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a94b7c5d18"
+down_revision: Union[str, None] = "8d3f1c6a2e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "payments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING",
+                "PAID",
+                "SUCCESSFUL",
+                "CANCELED",
+                "REFUNDED",
+                name="paymentstatusenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("amount", sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column("external_payment_id", sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("external_payment_id"),
+    )
+    op.create_index("ix_payments_order_id", "payments", ["order_id"], unique=False)
+    op.create_table(
+        "payment_items",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("payment_id", sa.Integer(), nullable=False),
+        sa.Column("order_item_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "price_at_payment", sa.DECIMAL(precision=10, scale=2), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["order_item_id"], ["order_items.id"]),
+        sa.ForeignKeyConstraint(["payment_id"], ["payments.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_payment_items_payment_id", "payment_items", ["payment_id"], unique=False
+    )
+    op.create_table(
+        "payment_webhook_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("event_id", sa.String(length=255), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("external_payment_id", sa.String(length=255), nullable=False),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("payment_webhook_events")
+    op.drop_index("ix_payment_items_payment_id", table_name="payment_items")
+    op.drop_table("payment_items")
+    op.drop_index("ix_payments_order_id", table_name="payments")
+    op.drop_table("payments")
+    sa.Enum(name="paymentstatusenum").drop(op.get_bind(), checkfirst=True)
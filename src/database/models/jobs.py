@@ -0,0 +1,66 @@
+import enum
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.models.base import Base
+
+
+class JobStatusEnum(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobModel(Base):
+    """
+    One unit of background work. A worker claims a queued job by flipping it
+    to running with a lease (``locked_until``); a job whose lease ran out,
+    e.g. because its worker died, is queued again.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    task: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[JobStatusEnum] = mapped_column(
+        Enum(JobStatusEnum), nullable=False, default=JobStatusEnum.QUEUED
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Jobs enqueued with the same key exist once, e.g. one purge per period
+    # however many workers schedule it.
+    dedupe_key: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, unique=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        # Claiming reads the oldest due queued jobs; lease recovery and
+        # cleanup scan running and finished jobs through the same index.
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, task='{self.task}', status={self.status})>"
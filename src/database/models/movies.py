@@ -1,6 +1,8 @@
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import (
+    DateTime,
     String,
     Float,
     Text,
@@ -11,6 +13,7 @@ from sqlalchemy import (
     Column,
     UUID,
     Integer,
+    Index,
 )
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
@@ -32,6 +35,7 @@ MoviesGenresModel = Table(
         primary_key=True,
         nullable=False,
     ),
+    Index("ix_movie_genres_genre_id_movie_id", "genre_id", "movie_id"),
 )
 
 StarsMoviesModel = Table(
@@ -49,6 +53,7 @@ StarsMoviesModel = Table(
         primary_key=True,
         nullable=False,
     ),
+    Index("ix_movie_stars_star_id_movie_id", "star_id", "movie_id"),
 )
 
 MoviesDirectorsModel = Table(
@@ -66,6 +71,7 @@ MoviesDirectorsModel = Table(
         primary_key=True,
         nullable=False,
     ),
+    Index("ix_movie_directors_director_id_movie_id", "director_id", "movie_id"),
 )
 
 
@@ -141,6 +147,16 @@ class MovieModel(Base):
     gross: Mapped[float] = mapped_column(Float, nullable=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2))
+    # Media key ("posters/<sha256>") of the uploaded poster renditions.
+    poster: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Bumped on every ORM update of the row; backs ETags and optimistic locking.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
 
     certification_id: Mapped[int] = mapped_column(
         ForeignKey("certifications.id"), nullable=False
@@ -163,7 +179,11 @@ class MovieModel(Base):
 
     __table_args__ = (
         UniqueConstraint("name", "year", "time", name="unique_movie_constraint"),
+        Index("ix_movies_year_id", "year", "id"),
+        Index("ix_movies_imdb", "imdb"),
+        Index("ix_movies_certification_id_id", "certification_id", "id"),
     )
+    __mapper_args__ = {"version_id_col": version}
 
     @classmethod
     def default_order_by(cls):
@@ -171,3 +191,45 @@ class MovieModel(Base):
 
     def __repr__(self):
         return f"<Movie(name='{self.name}', year='{self.year}', meta_score={self.meta_score})>"
+
+
+class MovieStatsModel(Base):
+    """
+    Per-movie purchase aggregates, updated as orders are paid or refunded and
+    periodically reconciled from paid orders (see ``src.orders.popularity``).
+
+    ``trending_score`` sums an exponentially growing weight per purchase, so
+    ordering by the stored value equals ordering by a time-decayed purchase
+    count without rewriting every row as time passes.
+    """
+
+    __tablename__ = "movie_stats"
+
+    movie_id: Mapped[int] = mapped_column(
+        ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True
+    )
+    purchase_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    purchases_30d: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trending_score: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    last_purchased_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    __table_args__ = (
+        Index("ix_movie_stats_popular", "purchase_count", "movie_id"),
+        Index("ix_movie_stats_trending", "trending_score", "movie_id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<MovieStats(movie_id={self.movie_id}, "
+            f"purchase_count={self.purchase_count}, "
+            f"trending_score={self.trending_score})>"
+        )
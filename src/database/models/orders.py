@@ -1,15 +1,17 @@
 import enum
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
-from sqlalchemy import ForeignKey, DateTime, func, Numeric, Enum
+from sqlalchemy import ForeignKey, DateTime, func, Numeric, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from database.models.users import UserModel
-from database.models.movies import MovieModel
-from database.models.payments import PaymentModel
-from database import Base
+from src.database.models.base import Base
+from src.database.models.carts import CartModel
+from src.database.models.movies import MovieModel
+
+if TYPE_CHECKING:
+    from src.database.models.users import UserModel
 
 
 class OrderStatusEnum(str, enum.Enum):
@@ -38,13 +40,13 @@ class OrderModel(Base):
     order_items: Mapped[List["OrderItemModel"]] = relationship(
         back_populates="order", cascade="all, delete"
     )
-    cart: Mapped["CartModel"] = relationship(  # noqa: F821
-        "CartModel", back_populates="orders", cascade="all, delete"
-    )
-    payments: Mapped[List["PaymentModel"]] = relationship(
+    cart: Mapped["CartModel"] = relationship("CartModel", back_populates="orders")
+    payments: Mapped[List["PaymentModel"]] = relationship(  # noqa: F821
         "PaymentModel", back_populates="order", cascade="all, delete"
     )
 
+    __table_args__ = (Index("ix_orders_user_id_status", "user_id", "status"),)
+
 
 class OrderItemModel(Base):
     __tablename__ = "order_items"
@@ -56,3 +58,36 @@ class OrderItemModel(Base):
 
     order: Mapped["OrderModel"] = relationship(back_populates="order_items")
     movie: Mapped["MovieModel"] = relationship("MovieModel")
+    payment_items: Mapped[List["PaymentItemsModel"]] = relationship(  # noqa: F821
+        "PaymentItemsModel", back_populates="order_item"
+    )
+
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_movie_id", "movie_id"),
+    )
+
+
+class PurchasedMovieModel(Base):
+    """
+    Movies a user owns, one row per (user, movie), kept in step with paid
+    orders so ownership checks are primary key lookups instead of joins
+    through orders and order items.
+    """
+
+    __tablename__ = "purchased_movies"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    movie_id: Mapped[int] = mapped_column(
+        ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True
+    )
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False
+    )
+    acquired_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (Index("ix_purchased_movies_order_id", "order_id"),)
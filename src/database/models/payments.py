@@ -1,15 +1,17 @@
-import datetime
+from datetime import datetime
+from decimal import Decimal
 from enum import Enum
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
-from sqlalchemy import Integer, DateTime, String, DECIMAL, ForeignKey, func
+from sqlalchemy import Integer, DateTime, String, DECIMAL, ForeignKey, func, Index
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import Enum as SQLAlchemyEnum
 
-from database.models.users import UserModel
-from database.models.movies import MovieModel
-from database.models.orders import OrderModel, OrderItemModel
-from database.models.base import Base
+from src.database.models.base import Base
+from src.database.models.orders import OrderModel, OrderItemModel
+
+if TYPE_CHECKING:
+    from src.database.models.users import UserModel
 
 
 class PaymentStatusEnum(str, Enum):
@@ -21,9 +23,9 @@ class PaymentStatusEnum(str, Enum):
 
 
 class PaymentModel(Base):
-    tablename = "payments"
+    __tablename__ = "payments"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, auto_increment=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -32,18 +34,22 @@ class PaymentModel(Base):
     status: Mapped[PaymentStatusEnum] = mapped_column(
         SQLAlchemyEnum(PaymentStatusEnum), nullable=False
     )
-    amount: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
+    # The provider's payment id doubles as the idempotency key: a payment is
+    # recorded at most once however often its creation is retried.
     external_payment_id: Mapped[Optional[str]] = mapped_column(
-        String(255), nullable=True
+        String(255), nullable=True, unique=True
     )
 
     user: Mapped["UserModel"] = relationship(back_populates="payments")
     order: Mapped["OrderModel"] = relationship(back_populates="payments")
     payment_items: Mapped[List["PaymentItemsModel"]] = relationship(
-        back_populates="payment"
+        back_populates="payment", cascade="all, delete"
     )
 
-    def repr(self) -> str:
+    __table_args__ = (Index("ix_payments_order_id", "order_id"),)
+
+    def __repr__(self) -> str:
         return (
             f"<PaymentModel(id={self.id}, user_id={self.user_id}, order_id={self.order_id}, "
             f"amount={self.amount}, status='{self.status}', created_at='{self.created_at}')>"
@@ -51,20 +57,45 @@ class PaymentModel(Base):
 
 
 class PaymentItemsModel(Base):
-    tablename = "payment_items"
+    __tablename__ = "payment_items"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, auto_increment=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     payment_id: Mapped[int] = mapped_column(ForeignKey("payments.id"), nullable=False)
     order_item_id: Mapped[int] = mapped_column(
         ForeignKey("order_items.id"), nullable=False
     )
-    price_at_payment: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
+    price_at_payment: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
 
     payment: Mapped["PaymentModel"] = relationship(back_populates="payment_items")
     order_item: Mapped["OrderItemModel"] = relationship(back_populates="payment_items")
 
-    def repr(self) -> str:
+    __table_args__ = (Index("ix_payment_items_payment_id", "payment_id"),)
+
+    def __repr__(self) -> str:
         return (
             f"<PaymentItemsModel(id={self.id}, payment_id={self.payment_id}, "
             f"order_item_id={self.order_item_id}, price_at_payment={self.price_at_payment})>"
         )
+
+
+class PaymentWebhookEventModel(Base):
+    """
+    Provider webhook deliveries already processed. The unique ``event_id``
+    makes a redelivered event a no-op insert.
+    """
+
+    __tablename__ = "payment_webhook_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    external_payment_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PaymentWebhookEventModel(event_id='{self.event_id}', "
+            f"event_type='{self.event_type}')>"
+        )
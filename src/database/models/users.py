@@ -4,7 +4,17 @@ from datetime import datetime, timezone, date, timedelta
 from typing import List, Optional
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Enum, Boolean, DateTime, ForeignKey, Date, Text
+from sqlalchemy import (
+    Integer,
+    String,
+    Enum,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Date,
+    Text,
+    Index,
+)
 
 from src.database.models.base import Base
 from src.database.models.utils import generate_token
@@ -75,6 +85,15 @@ class UserModel(Base):
     refresh_tokens: Mapped[List["RefreshTokenModel"]] = relationship(
         "RefreshTokenModel", back_populates="user", cascade="all, delete-orphan"
     )
+    cart: Mapped[Optional["CartModel"]] = relationship(  # noqa: F821
+        "CartModel", back_populates="user", cascade="all, delete-orphan"
+    )
+    orders: Mapped[List["OrderModel"]] = relationship(  # noqa: F821
+        "OrderModel", back_populates="user"
+    )
+    payments: Mapped[List["PaymentModel"]] = relationship(  # noqa: F821
+        "PaymentModel", back_populates="user"
+    )
 
 
 class UserProfileModel(Base):
@@ -125,6 +144,8 @@ class ActivationTokenModel(TokenBaseModel):
         "UserModel", back_populates="activation_token"
     )
 
+    __table_args__ = (Index("ix_activation_tokens_expires_at", "expires_at"),)
+
 
 class PasswordResetToken(TokenBaseModel):
     __tablename__ = "password_reset_tokens"
@@ -136,6 +157,8 @@ class PasswordResetToken(TokenBaseModel):
         "UserModel", back_populates="password_reset_token"
     )
 
+    __table_args__ = (Index("ix_password_reset_tokens_expires_at", "expires_at"),)
+
 
 class RefreshTokenModel(TokenBaseModel):
     __tablename__ = "refresh_tokens"
@@ -146,3 +169,8 @@ class RefreshTokenModel(TokenBaseModel):
         nullable=False,
     )
     user: Mapped[UserModel] = relationship("UserModel", back_populates="refresh_tokens")
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
@@ -0,0 +1,391 @@
+import argparse
+import asyncio
+import csv
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy import Executable, Table, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.dependencies import get_cache, get_settings
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarModel,
+    StarsMoviesModel,
+)
+from src.database.search import (
+    SEARCH_CACHE_NAMESPACE,
+    has_search_index,
+    refresh_search_documents,
+    resume_search_triggers,
+    suspend_search_triggers,
+)
+from src.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Keeps ``IN (...)`` lookups below the bound parameter limit of older SQLite builds.
+MAX_LOOKUP_PARAMS = 900
+
+MOVIE_COLUMNS = (
+    "uuid",
+    "name",
+    "year",
+    "time",
+    "imdb",
+    "votes",
+    "meta_score",
+    "gross",
+    "description",
+    "price",
+    "certification_id",
+)
+
+
+def insert_for(
+    session: AsyncSession, table: Table
+) -> postgresql.Insert | sqlite.Insert:
+    """
+    Return a dialect specific INSERT construct, so ON CONFLICT clauses are
+    available for both SQLite and PostgreSQL.
+    """
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def split_names(value: str | list[str] | None) -> list[str]:
+    """
+    Names from a comma separated string (CSV) or a list (JSON), deduplicated
+    in order.
+    """
+    if not value:
+        return []
+    names = value.split(",") if isinstance(value, str) else value
+    return list(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+
+def to_float(value: str | float | None) -> float | None:
+    if isinstance(value, str):
+        value = value.replace(",", "").strip() or None
+    return None if value is None else float(value)
+
+
+def to_int(value: str | int) -> int:
+    return int(value.replace(",", "")) if isinstance(value, str) else int(value)
+
+
+class InvalidMovieRowError(ValueError):
+    pass
+
+
+@dataclass
+class MovieRow:
+    movie: dict
+    certification: str
+    genres: list[str]
+    stars: list[str]
+    directors: list[str]
+
+
+def parse_movie_row(row: dict) -> MovieRow:
+    """
+    Validate and normalize one catalog row: a CSV row of strings or the
+    equivalent decoded JSON object, where numbers may be numbers and the
+    genres, stars and directors may be lists.
+    """
+    try:
+        name = row["name"].strip()
+        certification = row["certification"].strip()
+        if not name or not certification:
+            raise ValueError("name and certification must not be empty")
+        try:
+            price = Decimal(str(row.get("price") or "0")).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            price = Decimal("0.00")
+        movie = {
+            "uuid": uuid.uuid4(),
+            "name": name,
+            "year": to_int(row["year"]),
+            "time": to_int(row["time"]),
+            "imdb": float(row["imdb"]),
+            "votes": to_int(row["votes"]),
+            "meta_score": to_float(row.get("meta_score")),
+            "gross": to_float(row.get("gross")),
+            "description": row.get("description") or "",
+            "price": price,
+        }
+        return MovieRow(
+            movie,
+            certification,
+            split_names(row.get("genres")),
+            split_names(row.get("stars")),
+            split_names(row.get("directors")),
+        )
+    except KeyError as error:
+        raise InvalidMovieRowError(f"Missing field {error}.") from None
+    except (AttributeError, TypeError, ValueError) as error:
+        raise InvalidMovieRowError(f"Invalid value: {error}.") from None
+
+
+class MovieUpserter:
+    """
+    Writes batches of parsed catalog rows, inserting new movies and updating
+    existing ones matched on ``unique_movie_constraint`` (name, year, time).
+
+    Reference tables (genres, stars, directors, certifications) are resolved
+    through in-memory name -> id maps, so each name costs one round-trip the
+    first time it is seen and nothing afterwards. Movies and association rows
+    are written with multi-row ``INSERT ... ON CONFLICT`` statements; the
+    genres, stars and directors of an upserted movie replace its previous
+    ones. When
+    the full-text search index exists, its triggers are suspended for each
+    batch and the touched documents are rebuilt once per batch.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._ids: dict[type, dict[str, int]] = {
+            GenreModel: {},
+            StarModel: {},
+            DirectorModel: {},
+            CertificationModel: {},
+        }
+        self._search_index: bool | None = None
+
+    async def _execute_many(self, stmt: Executable, rows: list[dict]) -> list:
+        """
+        Execute ``stmt`` for all ``rows`` at once. SQLAlchemy renders this as
+        multi-row ``INSERT ... VALUES`` pages ("insertmanyvalues") from a single
+        cached compilation, keeping each page below the driver bound parameter
+        limit. Returns the rows from RETURNING, if any.
+        """
+        if not rows:
+            return []
+        result = await self._session.execute(stmt, rows)
+        return result.all() if result.returns_rows else []
+
+    async def _resolve_names(self, model: type, names: set[str]) -> dict[str, int]:
+        known = self._ids[model]
+        missing = [name for name in names if name not in known]
+        if missing:
+            stmt = insert_for(self._session, model.__table__).on_conflict_do_nothing(
+                index_elements=["name"]
+            )
+            await self._execute_many(stmt, [{"name": name} for name in missing])
+            for part in chunked(missing, MAX_LOOKUP_PARAMS):
+                result = await self._session.execute(
+                    select(model.name, model.id).where(model.name.in_(part))
+                )
+                known.update(result.tuples().all())
+        return known
+
+    async def _upsert_movies(self, movies: list[dict]) -> dict[tuple, int]:
+        table = MovieModel.__table__
+        stmt = insert_for(self._session, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name", "year", "time"],
+            set_={
+                **{
+                    column: stmt.excluded[column]
+                    for column in MOVIE_COLUMNS
+                    if column not in ("uuid", "name", "year", "time")
+                },
+                "version": table.c.version + 1,
+                "updated_at": datetime.now(timezone.utc),
+            },
+        ).returning(table.c.id, table.c.name, table.c.year, table.c.time)
+        returned = await self._execute_many(stmt, movies)
+        return {(name, year, duration): id_ for id_, name, year, duration in returned}
+
+    async def _unlink(self, movie_ids: list[int]) -> None:
+        for table in (MoviesGenresModel, StarsMoviesModel, MoviesDirectorsModel):
+            for part in chunked(movie_ids, MAX_LOOKUP_PARAMS):
+                await self._session.execute(
+                    delete(table).where(table.c.movie_id.in_(part))
+                )
+
+    async def _link(
+        self,
+        table: Table,
+        column: str,
+        model: type,
+        links: list[tuple[int, list[str]]],
+    ) -> None:
+        ids = self._ids[model]
+        rows = [
+            {"movie_id": movie_id, column: ids[name]}
+            for movie_id, names in links
+            for name in names
+        ]
+        stmt = insert_for(self._session, table).on_conflict_do_nothing()
+        await self._execute_many(stmt, rows)
+
+    async def _upsert_chunk(self, chunk: list[MovieRow]) -> None:
+        genres, stars, directors = set(), set(), set()
+        certifications = set()
+        for row in chunk:
+            genres.update(row.genres)
+            stars.update(row.stars)
+            directors.update(row.directors)
+            certifications.add(row.certification)
+
+        await self._resolve_names(GenreModel, genres)
+        await self._resolve_names(StarModel, stars)
+        await self._resolve_names(DirectorModel, directors)
+        certification_ids = await self._resolve_names(
+            CertificationModel, certifications
+        )
+
+        # The last occurrence of a (name, year, time) key wins, as an upsert
+        # may not touch the same row twice within one statement.
+        movies: dict[tuple, MovieRow] = {}
+        for row in chunk:
+            key = (row.movie["name"], row.movie["year"], row.movie["time"])
+            movies[key] = row
+
+        connection = await self._session.connection()
+        if self._search_index is None:
+            self._search_index = await connection.run_sync(has_search_index)
+        if self._search_index:
+            await connection.run_sync(suspend_search_triggers)
+
+        movie_ids = await self._upsert_movies(
+            [
+                {
+                    **row.movie,
+                    "certification_id": certification_ids[row.certification],
+                }
+                for row in movies.values()
+            ]
+        )
+
+        genre_links, star_links, director_links = [], [], []
+        for key, row in movies.items():
+            movie_id = movie_ids[key]
+            genre_links.append((movie_id, row.genres))
+            star_links.append((movie_id, row.stars))
+            director_links.append((movie_id, row.directors))
+
+        await self._unlink(list(movie_ids.values()))
+        await self._link(MoviesGenresModel, "genre_id", GenreModel, genre_links)
+        await self._link(StarsMoviesModel, "star_id", StarModel, star_links)
+        await self._link(
+            MoviesDirectorsModel, "director_id", DirectorModel, director_links
+        )
+
+        if self._search_index:
+            await connection.run_sync(
+                refresh_search_documents, list(movie_ids.values())
+            )
+            await connection.run_sync(resume_search_triggers)
+
+    async def upsert(self, chunk: list[MovieRow]) -> int:
+        """
+        Write ``chunk`` in one transaction and commit it. Returns the number
+        of rows written.
+        """
+        try:
+            await self._upsert_chunk(chunk)
+            await self._session.commit()
+        except Exception:
+            await self._session.rollback()
+            raise
+        return len(chunk)
+
+
+class CSVDatabaseSeeder(MovieUpserter):
+    """
+    Streams the movies CSV into the database in fixed size batches.
+
+    Expected columns: name, year, time, imdb, votes, meta_score, gross,
+    description, price, certification, genres, stars, directors. The last
+    three hold comma separated names.
+    """
+
+    def __init__(
+        self, csv_file_path: str, session: AsyncSession, batch_size: int = 1000
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        super().__init__(session)
+        self._csv_file_path = csv_file_path
+        self._batch_size = batch_size
+
+    async def is_db_populated(self) -> bool:
+        result = await self._session.execute(select(MovieModel.id).limit(1))
+        return result.scalar_one_or_none() is not None
+
+    def _read_rows(self) -> Iterator[MovieRow]:
+        with open(self._csv_file_path, newline="", encoding="utf-8") as csv_file:
+            for row in csv.DictReader(csv_file):
+                yield parse_movie_row(row)
+
+    async def seed(self) -> int:
+        """
+        Load the whole CSV, committing once per batch.
+
+        Returns the number of processed CSV rows.
+        """
+        total = 0
+        started = time.perf_counter()
+        for chunk in chunked(self._read_rows(), self._batch_size):
+            total += await self.upsert(chunk)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Seeded %d rows (%.0f rows/sec)", total, total / max(elapsed, 1e-9)
+            )
+        return total
+
+
+async def main(csv_path: str | None = None, batch_size: int | None = None) -> None:
+    settings = get_settings()
+    csv_path = csv_path or settings.PATH_TO_MOVIES_CSV
+    batch_size = batch_size or settings.SEED_BATCH_SIZE
+
+    async with AsyncSessionLocal() as session:
+        seeder = CSVDatabaseSeeder(csv_path, session, batch_size=batch_size)
+        if await seeder.is_db_populated():
+            print("Database is already populated, upserting on top of it.")
+
+        started = time.perf_counter()
+        total = await seeder.seed()
+        elapsed = time.perf_counter() - started
+
+    # Running workers sharing a Redis cache drop their search results.
+    cache = get_cache()
+    await cache.invalidate(SEARCH_CACHE_NAMESPACE)
+    await cache.close()
+
+    print(
+        f"Seeded {total} rows in {elapsed:.2f}s "
+        f"({total / max(elapsed, 1e-9):.0f} rows/sec, batch size {batch_size})."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the movies catalog from CSV.")
+    parser.add_argument("--csv", dest="csv_path", default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.csv_path, args.batch_size))
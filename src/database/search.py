@@ -0,0 +1,339 @@
+"""
+Full-text search over movie titles, descriptions, stars and directors.
+
+SQLite keeps an FTS5 virtual table ``movies_fts`` (rowid = ``movies.id``) in
+sync through triggers on ``movies``, ``movie_stars`` and ``movie_directors``.
+PostgreSQL stores a weighted ``tsvector`` in ``movies.search_vector`` behind a
+GIN index, maintained by triggers on the same tables.
+
+Bulk writers (e.g. the CSV seeder) suspend the triggers for the duration of a
+batch and rebuild the touched documents once at the end with
+:func:`refresh_search_documents`, instead of rewriting every document once per
+inserted link.
+"""
+
+import re
+from typing import Iterable, Sequence
+
+from sqlalchemy import Connection, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SQLITE_DOCUMENT = """
+    SELECT
+        m.id,
+        m.name,
+        m.description,
+        coalesce((
+            SELECT group_concat(s.name, ' ') FROM movie_stars AS ms
+            JOIN stars AS s ON s.id = ms.star_id WHERE ms.movie_id = m.id
+        ), ''),
+        coalesce((
+            SELECT group_concat(d.name, ' ') FROM movie_directors AS md
+            JOIN directors AS d ON d.id = md.director_id WHERE md.movie_id = m.id
+        ), '')
+    FROM movies AS m
+"""
+
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        name, description, stars, directors,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+
+SQLITE_TRIGGERS = {
+    "movies_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+            INSERT INTO movies_fts (rowid, name, description, stars, directors)
+            VALUES (NEW.id, NEW.name, NEW.description, '', '');
+        END
+    """,
+    "movies_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS movies_fts_update
+        AFTER UPDATE OF name, description ON movies BEGIN
+            UPDATE movies_fts SET name = NEW.name, description = NEW.description
+            WHERE rowid = NEW.id;
+        END
+    """,
+    "movies_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+            DELETE FROM movies_fts WHERE rowid = OLD.id;
+        END
+    """,
+    **{
+        f"{link}_fts_{event.lower()}": f"""
+            CREATE TRIGGER IF NOT EXISTS {link}_fts_{event.lower()}
+            AFTER {event} ON {link} BEGIN
+                UPDATE movies_fts SET {column} = (
+                    SELECT coalesce(group_concat(e.name, ' '), '')
+                    FROM {link} AS l JOIN {entity} AS e ON e.id = l.{foreign_key}
+                    WHERE l.movie_id = {row}.movie_id
+                )
+                WHERE rowid = {row}.movie_id;
+            END
+        """
+        for link, entity, foreign_key, column in (
+            ("movie_stars", "stars", "star_id", "stars"),
+            ("movie_directors", "directors", "director_id", "directors"),
+        )
+        for event, row in (("INSERT", "NEW"), ("DELETE", "OLD"))
+    },
+}
+
+SQLITE_BACKFILL = f"""
+    INSERT INTO movies_fts (rowid, name, description, stars, directors)
+    {SQLITE_DOCUMENT}
+    WHERE m.id NOT IN (SELECT rowid FROM movies_fts)
+"""
+
+POSTGRESQL_FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION movies_search_document(
+        target_id integer, title text, body text
+    ) RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce((
+                SELECT string_agg(s.name, ' ') FROM movie_stars AS ms
+                JOIN stars AS s ON s.id = ms.star_id WHERE ms.movie_id = target_id
+            ), '')), 'B')
+            || setweight(to_tsvector('english', coalesce((
+                SELECT string_agg(d.name, ' ') FROM movie_directors AS md
+                JOIN directors AS d ON d.id = md.director_id
+                WHERE md.movie_id = target_id
+            ), '')), 'B')
+            || setweight(to_tsvector('english', coalesce(body, '')), 'C')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movies_search_vector_trigger() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := movies_search_document(
+            NEW.id, NEW.name, NEW.description
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movie_links_search_vector_trigger()
+    RETURNS trigger AS $$
+    DECLARE
+        target integer;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            target := OLD.movie_id;
+        ELSE
+            target := NEW.movie_id;
+        END IF;
+        UPDATE movies
+        SET search_vector = movies_search_document(id, name, description)
+        WHERE id = target;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+# trigger name -> (table, CREATE TRIGGER statement)
+POSTGRESQL_TRIGGERS = {
+    "movies_search_vector_update": (
+        "movies",
+        """
+        CREATE TRIGGER movies_search_vector_update
+        BEFORE INSERT OR UPDATE OF name, description ON movies
+        FOR EACH ROW EXECUTE FUNCTION movies_search_vector_trigger()
+        """,
+    ),
+    **{
+        f"{link}_search_vector_update": (
+            link,
+            f"""
+            CREATE TRIGGER {link}_search_vector_update
+            AFTER INSERT OR DELETE ON {link}
+            FOR EACH ROW EXECUTE FUNCTION movie_links_search_vector_trigger()
+            """,
+        )
+        for link in ("movie_stars", "movie_directors")
+    },
+}
+
+SQLITE_SEARCH = text(
+    """
+    SELECT rowid AS id
+    FROM movies_fts
+    WHERE movies_fts MATCH :query
+    ORDER BY bm25(movies_fts, 10.0, 1.0, 4.0, 4.0)
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+POSTGRESQL_SEARCH = text(
+    """
+    SELECT id
+    FROM movies, websearch_to_tsquery('english', :query) AS query
+    WHERE search_vector @@ query
+    ORDER BY ts_rank(search_vector, query) DESC, id DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Shared cache namespace of ranked id lists; catalog writers invalidate it.
+SEARCH_CACHE_NAMESPACE = "search"
+
+
+def _execute_all(connection: Connection, statements: Iterable[str]) -> None:
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def _is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def _postgresql_triggers(action: str) -> Iterable[str]:
+    for name, (table, _) in POSTGRESQL_TRIGGERS.items():
+        if action == "DROP":
+            yield f"DROP TRIGGER IF EXISTS {name} ON {table}"
+        else:
+            yield f"ALTER TABLE {table} {action} TRIGGER {name}"
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the dialect specific search structures and backfill them from the
+    existing catalog. Safe to call on a database that already has them.
+    """
+    if _is_postgresql(connection):
+        _execute_all(
+            connection,
+            (
+                "ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector",
+                *POSTGRESQL_FUNCTIONS,
+                *_postgresql_triggers("DROP"),
+                *(create for _, create in POSTGRESQL_TRIGGERS.values()),
+                "UPDATE movies "
+                "SET search_vector = movies_search_document(id, name, description)",
+                "CREATE INDEX IF NOT EXISTS ix_movies_search_vector "
+                "ON movies USING GIN (search_vector)",
+            ),
+        )
+    else:
+        _execute_all(
+            connection, (SQLITE_TABLE, *SQLITE_TRIGGERS.values(), SQLITE_BACKFILL)
+        )
+
+
+def drop_search_index(connection: Connection) -> None:
+    if _is_postgresql(connection):
+        _execute_all(
+            connection,
+            (
+                "DROP INDEX IF EXISTS ix_movies_search_vector",
+                *_postgresql_triggers("DROP"),
+                "DROP FUNCTION IF EXISTS movie_links_search_vector_trigger()",
+                "DROP FUNCTION IF EXISTS movies_search_vector_trigger()",
+                "DROP FUNCTION IF EXISTS movies_search_document(integer, text, text)",
+                "ALTER TABLE movies DROP COLUMN IF EXISTS search_vector",
+            ),
+        )
+    else:
+        _execute_all(
+            connection,
+            (
+                *(f"DROP TRIGGER IF EXISTS {name}" for name in SQLITE_TRIGGERS),
+                "DROP TABLE IF EXISTS movies_fts",
+            ),
+        )
+
+
+def has_search_index(connection: Connection) -> bool:
+    if _is_postgresql(connection):
+        stmt = (
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'movies' AND column_name = 'search_vector'"
+        )
+    else:
+        stmt = (
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'"
+        )
+    return connection.exec_driver_sql(stmt).first() is not None
+
+
+def suspend_search_triggers(connection: Connection) -> None:
+    """
+    Stop per-row document maintenance inside the current transaction. Both
+    backends have transactional DDL, so other connections never observe the
+    triggers missing and a rollback restores them.
+    """
+    if _is_postgresql(connection):
+        _execute_all(connection, _postgresql_triggers("DISABLE"))
+    else:
+        _execute_all(
+            connection, (f"DROP TRIGGER IF EXISTS {name}" for name in SQLITE_TRIGGERS)
+        )
+
+
+def resume_search_triggers(connection: Connection) -> None:
+    if _is_postgresql(connection):
+        _execute_all(connection, _postgresql_triggers("ENABLE"))
+    else:
+        _execute_all(connection, SQLITE_TRIGGERS.values())
+
+
+def refresh_search_documents(connection: Connection, movie_ids: Sequence[int]) -> None:
+    """
+    Rebuild the search documents of ``movie_ids`` from the current rows.
+    """
+    if not movie_ids:
+        return
+    ids = bindparam("ids", expanding=True)
+    params = {"ids": list(movie_ids)}
+    if _is_postgresql(connection):
+        connection.execute(
+            text(
+                "UPDATE movies "
+                "SET search_vector = movies_search_document(id, name, description) "
+                "WHERE id IN :ids"
+            ).bindparams(ids),
+            params,
+        )
+        return
+    connection.execute(
+        text("DELETE FROM movies_fts WHERE rowid IN :ids").bindparams(ids), params
+    )
+    connection.execute(
+        text(
+            "INSERT INTO movies_fts (rowid, name, description, stars, directors) "
+            f"{SQLITE_DOCUMENT} WHERE m.id IN :ids"
+        ).bindparams(ids),
+        params,
+    )
+
+
+def to_fts5_query(query: str) -> str:
+    """
+    Turn free user input into a safe FTS5 expression: every word becomes a
+    quoted prefix term and all terms must match.
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
+
+
+async def search_movie_ids(
+    session: AsyncSession, query: str, limit: int, offset: int = 0
+) -> list[int]:
+    """
+    Return ids of the movies matching ``query``, best match first
+    (bm25 on SQLite, ts_rank on PostgreSQL).
+    """
+    params = {"limit": limit, "offset": offset}
+    if session.bind.dialect.name == "postgresql":
+        result = await session.execute(POSTGRESQL_SEARCH, {"query": query, **params})
+    else:
+        match = to_fts5_query(query)
+        if not match:
+            return []
+        result = await session.execute(SQLITE_SEARCH, {"query": match, **params})
+    return list(result.scalars().all())
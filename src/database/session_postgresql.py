@@ -0,0 +1,52 @@
+from typing import AsyncGenerator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.config.dependencies import get_settings
+from src.config.settings import BaseAppSettings
+from src.metrics.sql import instrument_engine
+
+
+def create_pooled_engine(url: str, settings: BaseAppSettings) -> AsyncEngine:
+    """
+    Build an async engine backed by a sized connection pool.
+
+    The pool options are driver agnostic, so the same factory also works for a
+    ``sqlite+aiosqlite`` URL when exercised locally. asyncpg additionally gets
+    its server-side prepared statement cache size.
+    """
+    connect_args = {}
+    if make_url(url).drivername == "postgresql+asyncpg":
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+    engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+settings = get_settings()
+
+postgresql_engine = create_pooled_engine(settings.DATABASE_URL, settings)
+AsyncPostgresqlSessionLocal = async_sessionmaker(
+    bind=postgresql_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def get_postgresql_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncPostgresqlSessionLocal() as session:
+        yield session
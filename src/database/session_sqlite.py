@@ -1,18 +1,68 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from src.config.dependencies import get_settings
+from src.config.settings import BaseAppSettings
+from src.metrics.sql import instrument_engine
+
+
+def create_sqlite_engine(
+    url: str, settings: BaseAppSettings, read_only: bool = False
+) -> AsyncEngine:
+    """
+    Build an aiosqlite engine. With ``SQLITE_WAL_MODE`` every new connection
+    switches to WAL with ``synchronous=NORMAL`` and the configured cache,
+    mmap and busy timeout, so readers no longer block on (or block) writers.
+    ``read_only`` connections additionally refuse any write.
+    """
+    engine = create_async_engine(url, echo=False)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ANN001
+        cursor = dbapi_connection.cursor()
+        if settings.SQLITE_WAL_MODE:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    instrument_engine(engine)
+    return engine
+
 
 settings = get_settings()
 
-SQLITE_DATABASE_URL = f"sqlite+aiosqlite:///{settings.PATH_TO_DB}"
-sqlite_engine = create_async_engine(SQLITE_DATABASE_URL, echo=False)
+SQLITE_DATABASE_URL = settings.DATABASE_URL
+sqlite_engine = create_sqlite_engine(SQLITE_DATABASE_URL, settings)
 AsyncSQLiteSessionLocal = async_sessionmaker(
     bind=sqlite_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# A separate pool for GET routes: in WAL mode these connections read from a
+# snapshot and never queue behind order or payment writes on the main pool.
+sqlite_read_engine = create_sqlite_engine(SQLITE_DATABASE_URL, settings, read_only=True)
+AsyncSQLiteReadSessionLocal = async_sessionmaker(
+    bind=sqlite_read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 async def get_sqlite_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSQLiteSessionLocal() as session:
         yield session
+
+
+async def get_sqlite_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSQLiteReadSessionLocal() as session:
+        yield session
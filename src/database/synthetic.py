@@ -0,0 +1,191 @@
+"""
+Synthetic catalog, users, refresh tokens and orders, for the query plan
+tests and the benchmarks. Rare values (certification ``NC-17``, the
+``Western`` genre) keep the selective listing filters selective.
+"""
+
+import csv
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.database.models.carts import CartModel
+from src.database.models.movies import MovieModel
+from src.database.models.orders import OrderItemModel, OrderModel, OrderStatusEnum
+from src.database.models.payments import PaymentModel, PaymentStatusEnum
+from src.database.models.users import (
+    RefreshTokenModel,
+    UserGroupEnum,
+    UserGroupModel,
+    UserModel,
+)
+from src.database.populate import CSVDatabaseSeeder
+
+RARE_CERTIFICATION = "NC-17"
+
+DESCRIPTION_WORDS = (
+    "love war family secret journey city night murder detective space ship "
+    "friend betrayal revenge dream island winter king queen empire soldier "
+    "robot future past heist prison escape river mountain village doctor "
+    "lawyer teacher artist music dance storm fire ocean desert ghost house "
+    "mystery crime truth lie brother sister mother father child hero villain"
+).split()
+
+
+def write_synthetic_csv(path: str, movies: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    genres = ["Drama", "Comedy", "Action", "Thriller", "Crime", "Romance"]
+    certifications = ["PG-13", "R", "PG", "G"]
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            [
+                "name",
+                "year",
+                "time",
+                "imdb",
+                "votes",
+                "meta_score",
+                "gross",
+                "description",
+                "price",
+                "certification",
+                "genres",
+                "stars",
+                "directors",
+            ]
+        )
+        for index in range(movies):
+            # A handful of rare values keep the selective filters selective.
+            certification = (
+                RARE_CERTIFICATION if index % 100 == 0 else rng.choice(certifications)
+            )
+            movie_genres = rng.sample(genres, 2)
+            if index % 50 == 0:
+                movie_genres.append("Western")
+            writer.writerow(
+                [
+                    f"Movie {index}",
+                    rng.randint(1930, 2024),
+                    rng.randint(70, 200),
+                    round(min(rng.gauss(6.5, 1.2), 10), 1),
+                    rng.randint(100, 2_000_000),
+                    rng.randint(20, 100),
+                    round(rng.uniform(0.1, 900), 2),
+                    " ".join(rng.choices(DESCRIPTION_WORDS, k=24)) + ".",
+                    f"{rng.uniform(1, 20):.2f}",
+                    certification,
+                    ", ".join(movie_genres),
+                    ", ".join(f"Star {rng.randint(0, movies)}" for _ in range(4)),
+                    f"Director {rng.randint(0, movies // 5)}",
+                ]
+            )
+
+
+async def seed_synthetic(connection: AsyncConnection, movies: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "movies.csv")
+        write_synthetic_csv(csv_path, movies)
+        async with AsyncSession(bind=connection) as session:
+            await CSVDatabaseSeeder(csv_path, session, batch_size=1000).seed()
+
+    group_id = (
+        await connection.execute(
+            insert(UserGroupModel)
+            .values(name=UserGroupEnum.USER)
+            .returning(UserGroupModel.id)
+        )
+    ).scalar_one()
+    now = datetime.now(timezone.utc)
+    users = movies // 10
+    await connection.execute(
+        insert(UserModel),
+        [
+            {
+                "email": f"user{index}@example.com",
+                "hashed_password": "x",
+                "is_active": True,
+                "group_id": group_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index in range(users)
+        ],
+    )
+    await connection.execute(
+        insert(RefreshTokenModel),
+        [
+            {
+                "user_id": index % users + 1,
+                "token": f"token-{index}",
+                "expires_at": now + timedelta(days=index % 30),
+            }
+            for index in range(users * 3)
+        ],
+    )
+
+
+async def seed_synthetic_orders(
+    connection: AsyncConnection, orders_per_user: int = 3, items_per_order: int = 2
+) -> None:
+    """
+    Give every user a cart and ``orders_per_user`` orders of
+    ``items_per_order`` movies, each with a payment: the latest order of a
+    user is pending, the others are paid. Expects no orders yet.
+    """
+    rng = random.Random(7)
+    user_ids = (await connection.scalars(select(UserModel.id))).all()
+    prices = dict(
+        (await connection.execute(select(MovieModel.id, MovieModel.price))).all()
+    )
+    movie_ids = list(prices)
+    cart_ids = (
+        await connection.scalars(
+            insert(CartModel).returning(CartModel.id, sort_by_parameter_order=True),
+            [{"user_id": user_id} for user_id in user_ids],
+        )
+    ).all()
+
+    orders, items, payments = [], [], []
+    for user_id, cart_id in zip(user_ids, cart_ids):
+        for index in range(orders_per_user):
+            order_id = len(orders) + 1
+            if index < orders_per_user - 1:
+                status = OrderStatusEnum.PAID, PaymentStatusEnum.SUCCESSFUL
+            else:
+                status = OrderStatusEnum.PENDING, PaymentStatusEnum.PENDING
+            picked = rng.sample(movie_ids, items_per_order)
+            total = sum(prices[movie_id] for movie_id in picked)
+            orders.append(
+                {
+                    "id": order_id,
+                    "user_id": user_id,
+                    "cart_id": cart_id,
+                    "status": status[0],
+                    "total_amount": total,
+                }
+            )
+            items.extend(
+                {
+                    "order_id": order_id,
+                    "movie_id": movie_id,
+                    "price_at_order": prices[movie_id],
+                }
+                for movie_id in picked
+            )
+            payments.append(
+                {
+                    "user_id": user_id,
+                    "order_id": order_id,
+                    "status": status[1],
+                    "amount": total,
+                    "external_payment_id": f"pay_synthetic_{order_id}",
+                }
+            )
+    await connection.execute(insert(OrderModel), orders)
+    await connection.execute(insert(OrderItemModel), items)
+    await connection.execute(insert(PaymentModel), payments)
@@ -0,0 +1,320 @@
+"""
+Streaming export and import of the movie catalog as NDJSON or CSV.
+
+Both formats carry one movie per record with the columns the CSV seeder
+reads (see :class:`src.database.populate.CSVDatabaseSeeder`), so an export
+can be imported again here or seeded from the command line. NDJSON keeps
+genres, stars and directors as lists; CSV joins them with ", ".
+"""
+
+import codecs
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarModel,
+    StarsMoviesModel,
+)
+from src.database.populate import (
+    InvalidMovieRowError,
+    MovieRow,
+    MovieUpserter,
+    parse_movie_row,
+)
+
+CATALOG_COLUMNS = (
+    "name",
+    "year",
+    "time",
+    "imdb",
+    "votes",
+    "meta_score",
+    "gross",
+    "description",
+    "price",
+    "certification",
+    "genres",
+    "stars",
+    "directors",
+)
+# (record key, link table, link column, name model) of every list column.
+NAME_LISTS = (
+    ("genres", MoviesGenresModel, "genre_id", GenreModel),
+    ("stars", StarsMoviesModel, "star_id", StarModel),
+    ("directors", MoviesDirectorsModel, "director_id", DirectorModel),
+)
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Characters; a longer record stops the import instead of being buffered.
+MAX_RECORD_LENGTH = 1024 * 1024
+
+
+class MalformedRecordError(ValueError):
+    """
+    The body cannot be read past ``line``.
+    """
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+async def _names_by_movie(
+    session: AsyncSession, table: Table, column: str, model: type, first: int, last: int
+) -> dict[int, list[str]]:
+    # Keyset pages cover a contiguous id range, so the links of a page are a
+    # primary key range scan rather than an ``IN (...)`` list.
+    result = await session.execute(
+        select(table.c.movie_id, model.name)
+        .join(model, model.id == table.c[column])
+        .where(table.c.movie_id.between(first, last))
+        .order_by(table.c.movie_id, model.name)
+    )
+    names: dict[int, list[str]] = {}
+    for movie_id, name in result:
+        names.setdefault(movie_id, []).append(name)
+    return names
+
+
+async def iter_catalog_pages(
+    session: AsyncSession, page_size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yield the catalog as pages of ``page_size`` records in id order.
+
+    Each page is four statements: the movies after the previous page's last
+    id, then their genres, stars and directors. The read transaction ends
+    after every page, so a long export pins neither a connection nor a
+    snapshot; movies changed while it runs are exported in whichever state
+    their page reads.
+    """
+    after = 0
+    while True:
+        movies = (
+            await session.execute(
+                select(
+                    MovieModel.id,
+                    MovieModel.name,
+                    MovieModel.year,
+                    MovieModel.time,
+                    MovieModel.imdb,
+                    MovieModel.votes,
+                    MovieModel.meta_score,
+                    MovieModel.gross,
+                    MovieModel.description,
+                    MovieModel.price,
+                    CertificationModel.name,
+                )
+                .join(
+                    CertificationModel,
+                    CertificationModel.id == MovieModel.certification_id,
+                )
+                .where(MovieModel.id > after)
+                .order_by(MovieModel.id)
+                .limit(page_size)
+            )
+        ).all()
+        if not movies:
+            await session.commit()
+            return
+        first, last = movies[0][0], movies[-1][0]
+        names = [
+            (key, await _names_by_movie(session, table, column, model, first, last))
+            for key, table, column, model in NAME_LISTS
+        ]
+        await session.commit()
+        yield [
+            {
+                **dict(zip(CATALOG_COLUMNS, row[1:])),
+                "price": None if row.price is None else float(row.price),
+                **{key: by_movie.get(row.id, []) for key, by_movie in names},
+            }
+            for row in movies
+        ]
+        after = last
+
+
+def encode_ndjson(records: list[dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for record in records
+    ).encode()
+
+
+def encode_csv(records: list[dict[str, Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(CATALOG_COLUMNS)
+    for record in records:
+        writer.writerow(
+            ", ".join(value) if isinstance(value, list) else value
+            for value in (record[column] for column in CATALOG_COLUMNS)
+        )
+    return buffer.getvalue().encode()
+
+
+async def export_catalog(
+    session: AsyncSession, format: str, page_size: int
+) -> AsyncIterator[bytes]:
+    """
+    The encoded catalog, one chunk per page; memory use is bounded by the
+    page size whatever the catalog size.
+    """
+    if format == "csv":
+        yield encode_csv([], header=True)
+    async for page in iter_catalog_pages(session, page_size):
+        yield encode_ndjson(page) if format == "ndjson" else encode_csv(page)
+
+
+async def _lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Decode a byte stream into lines (without terminators), holding at most
+    one partial line.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    number = 1
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.removesuffix("\r")
+                number += 1
+            if len(pending) > MAX_RECORD_LENGTH:
+                raise MalformedRecordError(number, "Record is too long.")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise MalformedRecordError(number, "Body is not valid UTF-8.") from None
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def parse_ndjson(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield ``(line number, record, None)`` for every JSON object line of an
+    NDJSON body, or ``(line number, None, error)`` for a malformed one.
+    Blank lines are skipped.
+    """
+    number = 0
+    async for line in _lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield number, None, f"Invalid JSON: {error}."
+            continue
+        if isinstance(record, dict):
+            yield number, record, None
+        else:
+            yield number, None, "Expected a JSON object."
+
+
+async def parse_csv(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield ``(line number, record, error)`` like :func:`parse_ndjson` for a
+    CSV body with a header row.
+
+    A quoted field may span lines, so lines are gathered until their quotes
+    balance, which is when a record is complete, and only then parsed.
+    """
+    header: Optional[list[str]] = None
+    record_lines: list[str] = []
+    quotes = size = number = start = 0
+    async for line in _lines(chunks):
+        number += 1
+        if not record_lines:
+            start = number
+        record_lines.append(line)
+        quotes += line.count('"')
+        size += len(line)
+        if quotes % 2:
+            if size > MAX_RECORD_LENGTH:
+                raise MalformedRecordError(start, "Record is too long.")
+            continue
+        text = "\n".join(record_lines)
+        record_lines, quotes, size = [], 0, 0
+        if not text.strip():
+            continue
+        try:
+            row = next(csv.reader([text], strict=True))
+        except csv.Error as error:
+            yield start, None, f"Invalid CSV: {error}."
+            continue
+        if header is None:
+            header = [column.strip().lstrip("\ufeff") for column in row]
+        elif len(row) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(row)}."
+        else:
+            yield start, dict(zip(header, row)), None
+    if record_lines:
+        yield start, None, "Unterminated quoted field."
+
+
+@dataclass
+class ImportResult:
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    # (line number, message) of the first failed records.
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    aborted: bool = False
+
+
+async def import_catalog(
+    session: AsyncSession,
+    records: AsyncIterable[tuple[int, Optional[dict], Optional[str]]],
+    batch_size: int,
+    max_errors: int = 100,
+) -> ImportResult:
+    """
+    Upsert parsed ``records`` in batches of ``batch_size``, each committed
+    as soon as it fills, so memory stays bounded by the batch whatever the
+    body size.
+
+    Invalid records are counted and skipped. A body that cannot be read any
+    further (e.g. an oversized record) stops the import with ``aborted``
+    set; the batches written before it are kept.
+    """
+    upserter = MovieUpserter(session)
+    result = ImportResult()
+    batch: list[MovieRow] = []
+    try:
+        async for number, record, error in records:
+            result.processed += 1
+            if record is not None:
+                try:
+                    batch.append(parse_movie_row(record))
+                except InvalidMovieRowError as invalid:
+                    error = str(invalid)
+            if error is not None:
+                result.failed += 1
+                if len(result.errors) < max_errors:
+                    result.errors.append((number, error))
+            if len(batch) >= batch_size:
+                result.imported += await upserter.upsert(batch)
+                batch = []
+    except MalformedRecordError as error:
+        result.aborted = True
+        result.errors.append((error.line, str(error)))
+    if batch:
+        result.imported += await upserter.upsert(batch)
+    return result
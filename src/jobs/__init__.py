@@ -0,0 +1,3 @@
+from src.jobs.queue import TASKS, JobContext, enqueue, register_task
+from src.jobs import tasks
+from src.jobs.worker import JobWorker, create_worker, run_job_worker
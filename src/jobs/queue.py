@@ -0,0 +1,268 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import case, delete, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.dependencies import get_settings
+from src.config.settings import BaseAppSettings
+from src.database.models.jobs import JobModel, JobStatusEnum
+from src.database.populate import insert_for
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    task: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+@dataclass
+class JobContext:
+    """
+    What task handlers get besides their payload. Handlers open their own
+    sessions, so a job's work commits independently of its bookkeeping.
+    """
+
+    session_factory: async_sessionmaker
+    settings: BaseAppSettings
+    services: dict[str, Any] = field(default_factory=dict)
+
+
+JobHandler = Callable[[JobContext, dict[str, Any]], Awaitable[None]]
+
+# Task name -> handler, filled by ``register_task``.
+TASKS: dict[str, JobHandler] = {}
+
+
+def register_task(name: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(handler: JobHandler) -> JobHandler:
+        TASKS[name] = handler
+        return handler
+
+    return decorator
+
+
+async def enqueue(
+    session: AsyncSession,
+    task: str,
+    payload: Optional[dict[str, Any]] = None,
+    *,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None,
+    dedupe_key: Optional[str] = None,
+) -> None:
+    """
+    Add a job in the caller's transaction: it becomes visible to workers
+    only if and when the caller commits, together with the change that
+    caused it. With ``dedupe_key``, a job already holding that key wins and
+    nothing is added.
+    """
+    stmt = insert_for(session, JobModel.__table__).values(
+        task=task,
+        payload=payload or {},
+        status=JobStatusEnum.QUEUED,
+        max_attempts=max_attempts or get_settings().JOB_MAX_ATTEMPTS,
+        run_at=run_at or datetime.now(timezone.utc),
+        dedupe_key=dedupe_key,
+    )
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["dedupe_key"])
+    await session.execute(stmt)
+
+
+async def claim_jobs(
+    session: AsyncSession, worker: str, limit: int, lease: timedelta
+) -> list[ClaimedJob]:
+    """
+    Atomically mark up to ``limit`` due jobs as running by ``worker`` and
+    return them, oldest first.
+
+    One ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+    RETURNING`` statement: on PostgreSQL concurrent workers skip each
+    other's rows instead of blocking on them. SQLite has no row locks and
+    drops the locking clause, but it runs the whole statement under its
+    single writer lock, so two workers still never claim the same job.
+    """
+    now = datetime.now(timezone.utc)
+    due = (
+        select(JobModel.id)
+        .where(JobModel.status == JobStatusEnum.QUEUED, JobModel.run_at <= now)
+        .order_by(JobModel.run_at, JobModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        update(JobModel)
+        .where(
+            JobModel.id.in_(due.scalar_subquery()),
+            JobModel.status == JobStatusEnum.QUEUED,
+        )
+        .values(
+            status=JobStatusEnum.RUNNING,
+            attempts=JobModel.attempts + 1,
+            locked_by=worker,
+            locked_until=now + lease,
+        )
+        .returning(
+            JobModel.id,
+            JobModel.task,
+            JobModel.payload,
+            JobModel.attempts,
+            JobModel.max_attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    jobs = [ClaimedJob(*row) for row in result]
+    await session.commit()
+    return sorted(jobs, key=lambda job: job.id)
+
+
+def retry_delay(attempts: int, settings: BaseAppSettings) -> timedelta:
+    """
+    Exponential backoff with jitter: about ``base * 2^(attempts - 1)``
+    seconds, capped, and spread over its upper half so failed jobs do not
+    retry in lockstep.
+    """
+    delay = min(
+        settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOB_RETRY_MAX_SECONDS,
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def _owned(job: ClaimedJob, worker: str) -> tuple:
+    # A worker only settles jobs it still holds; if its lease ran out and the
+    # job was claimed again, the new owner decides.
+    return (
+        JobModel.id == job.id,
+        JobModel.status == JobStatusEnum.RUNNING,
+        JobModel.locked_by == worker,
+    )
+
+
+async def complete_job(session: AsyncSession, job: ClaimedJob, worker: str) -> None:
+    await session.execute(
+        update(JobModel)
+        .where(*_owned(job, worker))
+        .values(
+            status=JobStatusEnum.SUCCEEDED,
+            locked_by=None,
+            locked_until=None,
+            finished_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def fail_job(
+    session: AsyncSession,
+    job: ClaimedJob,
+    worker: str,
+    error: str,
+    settings: BaseAppSettings,
+    retry: bool = True,
+) -> bool:
+    """
+    Record a failed attempt and queue the next one after a backoff, unless
+    attempts are exhausted or ``retry`` is false. Returns whether the job
+    will run again.
+    """
+    now = datetime.now(timezone.utc)
+    again = retry and job.attempts < job.max_attempts
+    values: dict[str, Any] = {"locked_by": None, "locked_until": None}
+    if again:
+        values.update(
+            status=JobStatusEnum.QUEUED,
+            run_at=now + retry_delay(job.attempts, settings),
+        )
+    else:
+        values.update(status=JobStatusEnum.FAILED, finished_at=now)
+    await session.execute(
+        update(JobModel)
+        .where(*_owned(job, worker))
+        .values(last_error=error[:2000], **values)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return again
+
+
+async def release_job(session: AsyncSession, job: ClaimedJob, worker: str) -> None:
+    """
+    Hand an interrupted job back without counting the attempt, e.g. when its
+    worker shuts down.
+    """
+    await session.execute(
+        update(JobModel)
+        .where(*_owned(job, worker))
+        .values(
+            status=JobStatusEnum.QUEUED,
+            attempts=JobModel.attempts - 1,
+            locked_by=None,
+            locked_until=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def recover_expired_leases(session: AsyncSession) -> int:
+    """
+    Queue again running jobs whose lease expired (their worker died or
+    hung), or fail them when they have no attempts left.
+    """
+    now = datetime.now(timezone.utc)
+    exhausted = JobModel.attempts >= JobModel.max_attempts
+    result = await session.execute(
+        update(JobModel)
+        .where(JobModel.status == JobStatusEnum.RUNNING, JobModel.locked_until < now)
+        .values(
+            # Typed literals: a bare enum member in CASE is bound as-is.
+            status=case(
+                (exhausted, literal(JobStatusEnum.FAILED, JobModel.status.type)),
+                else_=literal(JobStatusEnum.QUEUED, JobModel.status.type),
+            ),
+            finished_at=case((exhausted, now), else_=None),
+            last_error="Lease expired before the job finished.",
+            locked_by=None,
+            locked_until=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def purge_finished_jobs(
+    session: AsyncSession, older_than: timedelta, batch_size: int = 1000
+) -> int:
+    """
+    Delete succeeded and failed jobs finished more than ``older_than`` ago,
+    in batches of ``batch_size`` short transactions.
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    total = 0
+    while True:
+        finished = (
+            select(JobModel.id)
+            .where(
+                JobModel.status.in_([JobStatusEnum.SUCCEEDED, JobStatusEnum.FAILED]),
+                JobModel.finished_at < cutoff,
+            )
+            .limit(batch_size)
+        )
+        result = await session.execute(
+            delete(JobModel)
+            .where(JobModel.id.in_(finished.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
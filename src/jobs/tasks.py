@@ -0,0 +1,122 @@
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import select
+
+from src.config.dependencies import get_email_sender
+from src.config.settings import BaseAppSettings
+from src.database.models.users import (
+    ActivationTokenModel,
+    PasswordResetToken,
+    UserModel,
+)
+from src.jobs.queue import JobContext, purge_finished_jobs, register_task
+from src.notifications import render_email
+from src.orders.popularity import reconcile_movie_stats
+from src.security.purge import purge_expired_tokens
+from src.security.tokens import OneTimeTokenModel, issue_one_time_token
+
+
+def periodic_tasks(settings: BaseAppSettings) -> dict[str, float]:
+    """
+    Task name -> interval in seconds of the maintenance jobs workers
+    schedule; an interval of 0 disables the task.
+    """
+    return {
+        "purge_expired_tokens": settings.TOKEN_PURGE_INTERVAL,
+        "reconcile_movie_stats": settings.MOVIE_STATS_RECONCILE_INTERVAL,
+        "purge_finished_jobs": 24 * 3600,
+    }
+
+
+async def _send_token_email(
+    context: JobContext,
+    user_id: int,
+    model: OneTimeTokenModel,
+    template: str,
+    url: str,
+    lifetime_hours: int,
+    active: bool,
+) -> None:
+    """
+    Issue a fresh one-time token and mail it. The token is created here, not
+    when the job is enqueued, so it never sits in the jobs table; a retry
+    replaces the token of the failed attempt. Users no longer in the
+    ``active`` state the email is meant for are skipped.
+    """
+    settings = context.settings
+    async with context.session_factory() as session:
+        user = (
+            await session.execute(
+                select(UserModel.email).where(
+                    UserModel.id == user_id, UserModel.is_active.is_(active)
+                )
+            )
+        ).first()
+        if user is None:
+            return
+        token = await issue_one_time_token(
+            session, model, user_id, timedelta(hours=lifetime_hours)
+        )
+        await session.commit()
+    message = render_email(
+        template,
+        user.email,
+        settings.EMAIL_SENDER,
+        {
+            "token": token,
+            "lifetime_hours": lifetime_hours,
+            f"{url}_url": f"{settings.APP_BASE_URL}/{url}?token={token}",
+        },
+    )
+    sender = context.services.get("email_sender") or get_email_sender()
+    await sender.send(message)
+
+
+@register_task("send_activation_email")
+async def send_activation_email(context: JobContext, payload: dict[str, Any]) -> None:
+    await _send_token_email(
+        context,
+        payload["user_id"],
+        ActivationTokenModel,
+        template="activation",
+        url="activation",
+        lifetime_hours=context.settings.ACTIVATION_TOKEN_LIFETIME_HOURS,
+        active=False,
+    )
+
+
+@register_task("send_password_reset_email")
+async def send_password_reset_email(
+    context: JobContext, payload: dict[str, Any]
+) -> None:
+    await _send_token_email(
+        context,
+        payload["user_id"],
+        PasswordResetToken,
+        template="password_reset",
+        url="reset",
+        lifetime_hours=context.settings.PASSWORD_RESET_TOKEN_LIFETIME_HOURS,
+        active=True,
+    )
+
+
+@register_task("purge_expired_tokens")
+async def purge_tokens(context: JobContext, payload: dict[str, Any]) -> None:
+    await purge_expired_tokens(
+        context.session_factory, context.settings.TOKEN_PURGE_BATCH_SIZE
+    )
+
+
+@register_task("reconcile_movie_stats")
+async def reconcile_stats(context: JobContext, payload: dict[str, Any]) -> None:
+    async with context.session_factory() as session:
+        await reconcile_movie_stats(session)
+
+
+@register_task("purge_finished_jobs")
+async def purge_jobs(context: JobContext, payload: dict[str, Any]) -> None:
+    async with context.session_factory() as session:
+        await purge_finished_jobs(
+            session, timedelta(days=context.settings.JOB_RETENTION_DAYS)
+        )
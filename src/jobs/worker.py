@@ -0,0 +1,242 @@
+"""
+Run background jobs from the jobs table.
+
+    python -m src.jobs.worker [--concurrency N] [--burst]
+
+Any number of workers (and the app itself, with ``JOBS_RUN_IN_APP``) can
+share the table. ``--burst`` runs the jobs due now and exits instead of
+polling forever.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.dependencies import get_email_sender, get_settings
+from src.config.settings import BaseAppSettings
+from src.database import AsyncSessionLocal
+from src.jobs.queue import (
+    TASKS,
+    ClaimedJob,
+    JobContext,
+    claim_jobs,
+    complete_job,
+    enqueue,
+    fail_job,
+    recover_expired_leases,
+    release_job,
+)
+from src.jobs.tasks import periodic_tasks
+from src.metrics.registry import registry
+
+logger = logging.getLogger(__name__)
+
+JOBS_FINISHED = registry.counter(
+    "jobs_finished_total",
+    "Job attempts finished by this process, by outcome.",
+    ("task", "outcome"),
+)
+JOB_DURATION = registry.histogram(
+    "job_duration_seconds", "Time spent running a job attempt.", ("task",)
+)
+
+
+class UnknownTaskError(Exception):
+    pass
+
+
+class JobWorker:
+    """
+    Claims due jobs and runs up to ``concurrency`` of them at once as tasks
+    on the current event loop.
+
+    A free slot is refilled as soon as a job finishes; with every slot free
+    and nothing due, the worker polls every ``poll_interval`` seconds. Each
+    attempt must finish within ``lease``, after which any worker may take
+    the job over. Every ``MAINTENANCE_INTERVAL`` seconds the worker also
+    requeues jobs of dead workers and schedules the periodic tasks, once per
+    period across all workers thanks to their dedupe keys.
+    """
+
+    MAINTENANCE_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        settings: BaseAppSettings,
+        concurrency: int,
+        poll_interval: float,
+        lease: timedelta,
+        name: Optional[str] = None,
+        services: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.settings = settings
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.name = name or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.context = JobContext(session_factory, settings, services or {})
+
+    async def run(self, burst: bool = False) -> None:
+        running: set[asyncio.Task] = set()
+        next_maintenance = 0.0
+        try:
+            while True:
+                if time.monotonic() >= next_maintenance:
+                    await self._maintain(schedule=not burst)
+                    next_maintenance = time.monotonic() + self.MAINTENANCE_INTERVAL
+                claimed: list[ClaimedJob] = []
+                if len(running) < self.concurrency:
+                    try:
+                        async with self.session_factory() as session:
+                            claimed = await claim_jobs(
+                                session,
+                                self.name,
+                                self.concurrency - len(running),
+                                self.lease,
+                            )
+                    except Exception:
+                        logger.exception("Claiming jobs failed")
+                    running.update(
+                        asyncio.create_task(self._execute(job)) for job in claimed
+                    )
+                if not running:
+                    if burst:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                running -= done
+        finally:
+            # Cancelled jobs hand themselves back in ``_execute``.
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _maintain(self, schedule: bool) -> None:
+        try:
+            async with self.session_factory() as session:
+                recovered = await recover_expired_leases(session)
+                if recovered:
+                    logger.warning("Recovered %s jobs with expired leases", recovered)
+                if schedule:
+                    await self._schedule_periodic(session)
+        except Exception:
+            logger.exception("Job maintenance failed")
+
+    async def _schedule_periodic(self, session: AsyncSession) -> None:
+        now = time.time()
+        for task, interval in periodic_tasks(self.settings).items():
+            if interval <= 0:
+                continue
+            period = int(now // interval)
+            await enqueue(
+                session,
+                task,
+                run_at=datetime.fromtimestamp(period * interval, timezone.utc),
+                max_attempts=1,
+                dedupe_key=f"{task}:{period}",
+            )
+        await session.commit()
+
+    async def _settle(self, settle, job: ClaimedJob, *args: Any) -> Any:
+        # A job left unsettled (e.g. the database is unreachable) is picked
+        # up again once its lease expires.
+        try:
+            async with self.session_factory() as session:
+                return await settle(session, job, self.name, *args)
+        except Exception:
+            logger.exception("Could not record the outcome of job %s", job.id)
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        handler = TASKS.get(job.task)
+        started = time.perf_counter()
+        try:
+            if handler is None:
+                raise UnknownTaskError(f"No handler registered for '{job.task}'.")
+            await asyncio.wait_for(
+                handler(self.context, job.payload), self.lease.total_seconds()
+            )
+        except asyncio.CancelledError:
+            await asyncio.shield(self._settle(release_job, job))
+            raise
+        except Exception as error:
+            again = await self._settle(
+                fail_job,
+                job,
+                f"{type(error).__name__}: {error}",
+                self.settings,
+                handler is not None,
+            )
+            outcome = "retried" if again else "failed"
+            logger.warning(
+                "Job %s (%s) attempt %s/%s failed: %r",
+                job.id,
+                job.task,
+                job.attempts,
+                job.max_attempts,
+                error,
+            )
+        else:
+            await self._settle(complete_job, job)
+            outcome = "succeeded"
+        JOBS_FINISHED.inc(task=job.task, outcome=outcome)
+        JOB_DURATION.observe(time.perf_counter() - started, task=job.task)
+
+
+def create_worker(
+    session_factory: async_sessionmaker, concurrency: Optional[int] = None
+) -> JobWorker:
+    settings = get_settings()
+    return JobWorker(
+        session_factory,
+        settings,
+        concurrency=concurrency or settings.JOB_WORKER_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        lease=timedelta(seconds=settings.JOB_LEASE_SECONDS),
+    )
+
+
+async def run_job_worker(
+    session_factory: async_sessionmaker, concurrency: Optional[int] = None
+) -> None:
+    """
+    Background loop running a :class:`JobWorker` until cancelled.
+    """
+    await create_worker(session_factory, concurrency).run()
+
+
+async def main(concurrency: Optional[int], burst: bool) -> None:
+    worker = create_worker(AsyncSessionLocal, concurrency)
+    logger.info("Job worker %s started (%s slots)", worker.name, worker.concurrency)
+    try:
+        await worker.run(burst=burst)
+    finally:
+        await get_email_sender().close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--concurrency", type=int, help="Jobs run at once (JOB_WORKER_CONCURRENCY)."
+    )
+    parser.add_argument("--burst", action="store_true", help="Exit once no job is due.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.concurrency, args.burst))
@@ -1,15 +1,114 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
+
+from src.cache import Cache, catalog_cache
+from src.cache.catalog_snapshot import run_snapshot_refresh
+from src.config.dependencies import (
+    get_cache,
+    get_email_sender,
+    get_payment_provider,
+    get_rate_limiter,
+    get_settings,
+)
+from src.database import AsyncSessionLocal
+from src.jobs import run_job_worker
+from src.media import image_processor
+from src.metrics import MetricsMiddleware, registry
+from src.routes import (
+    accounts_router,
+    admin_router,
+    cart_router,
+    media_router,
+    movie_router,
+    orders_router,
+    payments_router,
+)
+from src.recommendations import run_recommendation_refresh
+from src.security.passwords import password_hasher
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    tasks = []
+    # Token purging and stats reconciliation run as periodic jobs, in here or
+    # in separate ``python -m src.jobs.worker`` processes.
+    if settings.JOBS_RUN_IN_APP:
+        tasks.append(asyncio.create_task(run_job_worker(AsyncSessionLocal)))
+    if settings.CATALOG_SNAPSHOT_REFRESH_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_snapshot_refresh(
+                    AsyncSessionLocal, settings.CATALOG_SNAPSHOT_REFRESH_INTERVAL
+                )
+            )
+        )
+    if settings.RECOMMENDATION_REFRESH_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_recommendation_refresh(
+                    AsyncSessionLocal, settings.RECOMMENDATION_REFRESH_INTERVAL
+                )
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hasher.shutdown()
+    image_processor.shutdown()
+    await get_cache().close()
+    await get_payment_provider().close()
+    await get_email_sender().close()
+    await get_rate_limiter().close()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Online Cinema",
     description="A digital platform that enables users to choose, watch, "
     "and purchase access to movies and other video content via the internet.",
 )
 
+app.add_middleware(
+    MetricsMiddleware,
+    query_threshold=settings.QUERY_COUNT_WARNING_THRESHOLD,
+)
+
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/cache")
+def cache_stats(cache: Cache = Depends(get_cache)):
+    return {"catalog": catalog_cache.stats(), "shared": cache.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=registry.CONTENT_TYPE)
+
+
 api_version_prefix = "/api/v1"
+
+app.include_router(movie_router, prefix=f"{api_version_prefix}/movies", tags=["movies"])
+app.include_router(
+    accounts_router, prefix=f"{api_version_prefix}/accounts", tags=["accounts"]
+)
+app.include_router(cart_router, prefix=f"{api_version_prefix}/cart", tags=["cart"])
+app.include_router(
+    payments_router, prefix=f"{api_version_prefix}/payments", tags=["payments"]
+)
+app.include_router(
+    orders_router, prefix=f"{api_version_prefix}/orders", tags=["orders"]
+)
+app.include_router(media_router, prefix=f"{api_version_prefix}/media", tags=["media"])
+app.include_router(admin_router, prefix=f"{api_version_prefix}/admin", tags=["admin"])
@@ -0,0 +1,9 @@
+from src.media.images import PROFILES, ImageProfile, InvalidImageError
+from src.media.uploads import UploadError, UploadTooLargeError, receive_upload
+from src.media.service import (
+    ImageProcessor,
+    ImageProcessorBusyError,
+    MediaStorage,
+    image_processor,
+    media_storage,
+)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+# Extension -> (Pillow format, save options) of every rendition.
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+class InvalidImageError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """
+    Renditions made for one kind of image: ``square`` crops to
+    ``size x size`` (avatars), otherwise images are scaled to ``size``
+    pixels wide (posters), never upscaled.
+    """
+
+    sizes: tuple[int, ...]
+    square: bool
+
+    def file_names(self) -> list[str]:
+        return [f"{size}.{ext}" for size in self.sizes for ext in OUTPUT_FORMATS]
+
+
+PROFILES = {
+    "avatars": ImageProfile(sizes=(64, 128, 256), square=True),
+    "posters": ImageProfile(sizes=(160, 320, 640), square=False),
+}
+
+
+def _open(source: str, max_pixels: int, largest: int) -> Image.Image:
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        image = Image.open(source)
+        if image.format not in ACCEPTED_FORMATS:
+            raise InvalidImageError(f"Unsupported image format: {image.format}.")
+        # Let the JPEG decoder downscale by up to 8x, never below ``largest``.
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except UnidentifiedImageError:
+        raise InvalidImageError("Not a valid image.") from None
+    except Image.DecompressionBombError:
+        raise InvalidImageError("Image dimensions are too large.") from None
+    except OSError:
+        raise InvalidImageError("Image could not be decoded.") from None
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_image(source: str, target: str, profile_name: str, max_pixels: int) -> None:
+    """
+    Write every rendition of ``profile_name`` for the image at ``source``
+    into the directory ``target``. Runs in a worker process.
+
+    Renditions are written to a sibling temporary directory renamed to
+    ``target`` at the end, so ``target`` either exists complete or not at
+    all; when a concurrent render of the same image won, its result is kept.
+    """
+    profile = PROFILES[profile_name]
+    image = _open(source, max_pixels, max(profile.sizes))
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        for size in profile.sizes:
+            if profile.square:
+                rendition = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            elif image.width > size:
+                height = max(1, round(image.height * size / image.width))
+                rendition = image.resize((size, height), Image.Resampling.LANCZOS)
+            else:
+                rendition = image
+            for ext, (image_format, options) in OUTPUT_FORMATS.items():
+                rendition.save(
+                    os.path.join(staging, f"{size}.{ext}"), image_format, **options
+                )
+        try:
+            os.rename(staging, target)
+        except OSError:
+            if not os.path.isdir(target):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,128 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from typing import Optional
+
+from starlette.requests import Request
+
+from src.config.dependencies import get_settings
+from src.media.images import PROFILES, render_image
+from src.media.uploads import receive_upload
+from src.metrics.registry import registry
+
+IMAGE_PROCESSING_REJECTED = registry.counter(
+    "image_processing_rejected_total",
+    "Image uploads rejected because the processing queue was full.",
+)
+
+
+class ImageProcessorBusyError(Exception):
+    pass
+
+
+class ImageProcessor:
+    """
+    Runs image decoding, resizing and encoding in a process pool, where
+    Pillow's CPU work neither blocks the event loop nor contends for its
+    GIL. Admission is bounded like ``PasswordHasher``: at most
+    ``max_pending`` renders run or wait, and a caller that cannot get a
+    slot within ``queue_timeout`` seconds gets ``ImageProcessorBusyError``.
+    """
+
+    def __init__(
+        self, workers: int, max_pending: int, queue_timeout: float, max_pixels: int
+    ) -> None:
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.max_pixels = max_pixels
+        self._slots = asyncio.Semaphore(max_pending)
+        # Started on first use; "spawn" keeps workers clear of the parent's
+        # event loop and database threads.
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def render(self, source: str, target: str, profile: str) -> None:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            IMAGE_PROCESSING_REJECTED.inc()
+            raise ImageProcessorBusyError("Image processing queue is full.")
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor, render_image, source, target, profile, self.max_pixels
+            )
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class MediaStorage:
+    """
+    Content-addressed image store under ``root``.
+
+    An upload is keyed by the SHA-256 of its bytes as ``<profile>/<digest>``
+    and its renditions live in ``<root>/<profile>/<digest[:2]>/<digest>/``,
+    so the same image uploaded again (by anyone) reuses the existing files
+    instead of being processed twice. Files never change once written.
+    """
+
+    def __init__(
+        self, root: str, processor: ImageProcessor, max_upload_bytes: int
+    ) -> None:
+        self.root = root
+        self.processor = processor
+        self.max_upload_bytes = max_upload_bytes
+
+    def directory(self, profile: str, digest: str) -> str:
+        return os.path.join(self.root, profile, digest[:2], digest)
+
+    def file_path(self, profile: str, digest: str, name: str) -> Optional[str]:
+        """
+        Path of one rendition, or None if it does not exist.
+        """
+        if profile not in PROFILES or name not in PROFILES[profile].file_names():
+            return None
+        path = os.path.join(self.directory(profile, digest), name)
+        return path if os.path.isfile(path) else None
+
+    async def store(self, request: Request, profile: str, field: str = "file") -> str:
+        """
+        Receive the image uploaded in ``request`` and make sure its
+        ``profile`` renditions exist. Returns the media key.
+        """
+        received = await receive_upload(
+            request,
+            field,
+            os.path.join(self.root, ".uploads"),
+            self.max_upload_bytes,
+        )
+        try:
+            target = self.directory(profile, received.digest)
+            if not os.path.isdir(target):
+                await self.processor.render(received.path, target, profile)
+        finally:
+            with suppress(FileNotFoundError):
+                os.unlink(received.path)
+        return f"{profile}/{received.digest}"
+
+
+settings = get_settings()
+image_processor = ImageProcessor(
+    workers=settings.MEDIA_PROCESS_WORKERS,
+    max_pending=settings.MEDIA_PROCESS_MAX_PENDING,
+    queue_timeout=settings.MEDIA_PROCESS_QUEUE_TIMEOUT,
+    max_pixels=settings.MEDIA_MAX_IMAGE_PIXELS,
+)
+media_storage = MediaStorage(
+    settings.MEDIA_ROOT, image_processor, settings.MEDIA_UPLOAD_MAX_BYTES
+)
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from python_multipart.multipart import (
+    MultipartParseError,
+    MultipartParser,
+    parse_options_header,
+)
+from starlette.requests import Request
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    pass
+
+
+@dataclass(frozen=True)
+class ReceivedFile:
+    path: str
+    digest: str
+    size: int
+
+
+class _FilePartCollector:
+    """
+    ``MultipartParser`` callbacks keeping only the bytes of the ``field``
+    part, hashed as they arrive and queued for the next disk write.
+    """
+
+    def __init__(self, field: str, max_bytes: int) -> None:
+        self.field = field.encode()
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.found = False
+        self.pending: list[bytes] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._capturing = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        self._capturing = (
+            not self.found
+            and options.get(b"name") == self.field
+            and b"filename" in options
+        )
+        self.found = self.found or self._capturing
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._capturing:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(f"File is larger than {self.max_bytes} bytes.")
+        self.digest.update(chunk)
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        self._capturing = False
+
+
+async def receive_upload(
+    request: Request, field: str, directory: str, max_bytes: int
+) -> ReceivedFile:
+    """
+    Stream the file sent as multipart field ``field`` into a temporary file
+    in ``directory`` while hashing it, one request body chunk at a time.
+
+    Nothing is buffered beyond the current chunk, other fields are skipped,
+    and an upload over ``max_bytes`` is rejected as soon as it crosses the
+    limit. The caller owns (and must remove) the returned file.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type"))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadError("Expected a multipart/form-data body.")
+
+    collector = _FilePartCollector(field, max_bytes)
+    parser = MultipartParser(options[b"boundary"], collector.callbacks())
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if collector.pending:
+                    data = b"".join(collector.pending)
+                    collector.pending.clear()
+                    await asyncio.to_thread(file.write, data)
+            parser.finalize()
+        if not collector.found:
+            raise UploadError(f"Missing file field '{field}'.")
+    except BaseException as error:
+        os.unlink(path)
+        if isinstance(error, MultipartParseError):
+            raise UploadError(f"Malformed multipart body: {error}") from None
+        raise
+    return ReceivedFile(path, collector.digest.hexdigest(), collector.size)
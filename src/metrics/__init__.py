@@ -0,0 +1,3 @@
+from src.metrics.registry import Counter, Histogram, MetricsRegistry, registry
+from src.metrics.sql import QueryStats, current_query_stats, instrument_engine
+from src.metrics.middleware import MetricsMiddleware
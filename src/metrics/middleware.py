@@ -0,0 +1,130 @@
+import logging
+import time
+from collections import Counter as StatementCounter
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics.registry import QUERY_COUNT_BUCKETS, SIZE_BUCKETS, registry
+from src.metrics.sql import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+LABELS = ("method", "route", "status")
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", LABELS
+)
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    LABELS,
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per request.",
+    LABELS,
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "Response body size.", LABELS, buckets=SIZE_BUCKETS
+)
+QUERY_THRESHOLD_EXCEEDED = registry.counter(
+    "http_requests_query_threshold_exceeded_total",
+    "Requests that executed more SQL statements than the threshold.",
+    ("method", "route"),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Full path template of the matched route, e.g. ``/api/v1/movies/{movie_id}/``.
+
+    Routes of an included router may only know their path relative to the
+    router, so the concrete suffix they matched is swapped for the template
+    and the rest of the request path is kept as the prefix.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    try:
+        matched = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError):
+        return template
+    if matched and path.endswith(matched):
+        return path[: len(path) - len(matched)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, SQL statement count and
+    time, and response size.
+
+    Routes are labelled by their path template (``/api/v1/movies/{movie_id}/``),
+    not the concrete URL, to keep label cardinality bounded. Requests issuing
+    more than ``query_threshold`` statements are logged with the statements
+    grouped by text, which is how N+1 loading patterns show up.
+    """
+
+    def __init__(self, app: ASGIApp, query_threshold: int) -> None:
+        self.app = app
+        self.query_threshold = query_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        response: dict[str, Any] = {"status": 500, "size": 0}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_query_stats.reset(token)
+            self._record(scope, stats, response, elapsed)
+
+    def _record(
+        self, scope: Scope, stats: QueryStats, response: dict[str, Any], elapsed: float
+    ) -> None:
+        labels = {
+            "method": scope["method"],
+            "route": route_template(scope),
+            "status": str(response["status"]),
+        }
+        REQUEST_LATENCY.observe(elapsed, **labels)
+        REQUEST_QUERIES.observe(stats.count, **labels)
+        REQUEST_DB_TIME.observe(stats.duration, **labels)
+        RESPONSE_SIZE.observe(response["size"], **labels)
+
+        if stats.count > self.query_threshold:
+            QUERY_THRESHOLD_EXCEEDED.inc(method=labels["method"], route=labels["route"])
+            grouped = StatementCounter(
+                " ".join(statement.split()) for statement in stats.statements
+            )
+            logger.warning(
+                "%s %s ran %d SQL statements (threshold %d) in %.1f ms:\n%s",
+                labels["method"],
+                scope["path"],
+                stats.count,
+                self.query_threshold,
+                stats.duration * 1000,
+                "\n".join(
+                    f"  {count}x {statement}"
+                    for statement, count in grouped.most_common()
+                ),
+            )
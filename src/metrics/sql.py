@@ -0,0 +1,74 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+START_TIMES_KEY = "metrics_query_start"
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statements issued while handling one request.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    statements: list[str] = field(default_factory=list)
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if current_query_stats.get() is not None:
+        conn.info.setdefault(START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stats = current_query_stats.get()
+    start_times = conn.info.get(START_TIMES_KEY)
+    if stats is None or not start_times:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - start_times.pop()
+    stats.statements.append(statement)
+
+
+def handle_error(exception_context: Any) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start.
+    conn = exception_context.connection
+    start_times = conn.info.get(START_TIMES_KEY) if conn is not None else None
+    if start_times:
+        start_times.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Attribute every statement run on ``engine`` to the request being served.
+
+    Outside a request (CLI scripts, background tasks) no stats object is
+    bound and the listeners return immediately.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
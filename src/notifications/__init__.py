@@ -0,0 +1,7 @@
+from src.notifications.mail import (
+    EmailSender,
+    FileEmailSender,
+    SMTPEmailSender,
+    create_email_sender,
+    render_email,
+)
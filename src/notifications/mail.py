@@ -0,0 +1,134 @@
+import asyncio
+import os
+import smtplib
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from src.config.settings import BaseAppSettings
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+SUBJECTS = {
+    "activation": "Activate your Online Cinema account",
+    "password_reset": "Reset your Online Cinema password",
+}
+
+templates = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    undefined=StrictUndefined,
+)
+
+
+def render_email(
+    template: str, recipient: str, sender: str, context: dict[str, Any]
+) -> EmailMessage:
+    """
+    Build a text + HTML message from ``<template>.txt`` and
+    ``<template>.html``.
+    """
+    message = EmailMessage()
+    message["Subject"] = SUBJECTS[template]
+    message["From"] = sender
+    message["To"] = recipient
+    message["Date"] = formatdate(localtime=False)
+    message["Message-ID"] = make_msgid()
+    message.set_content(templates.get_template(f"{template}.txt").render(context))
+    message.add_alternative(
+        templates.get_template(f"{template}.html").render(context), subtype="html"
+    )
+    return message
+
+
+class EmailSender(Protocol):
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Deliver ``message``; raises if it could not be handed over.
+        """
+
+    async def close(self) -> None:
+        """
+        Release whatever the sender holds open.
+        """
+
+
+class SMTPEmailSender:
+    """
+    Delivers through an SMTP server (or a local stand-in such as MailHog).
+    ``smtplib`` blocks, so each delivery runs in a thread.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        timeout: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def _send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as client:
+            if self.use_tls:
+                client.starttls()
+            if self.username:
+                client.login(self.username, self.password or "")
+            client.send_message(message)
+
+    async def send(self, message: EmailMessage) -> None:
+        await asyncio.to_thread(self._send, message)
+
+    async def close(self) -> None:
+        pass
+
+
+class FileEmailSender:
+    """
+    Writes every message as an ``.eml`` file into ``directory`` instead of
+    sending it; for development and tests.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _write(self, message: EmailMessage) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, f"{stamp}-{uuid.uuid4().hex[:8]}.eml")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as file:
+            file.write(message.as_bytes())
+        os.replace(temp_path, path)
+        return path
+
+    async def send(self, message: EmailMessage) -> None:
+        await asyncio.to_thread(self._write, message)
+
+    async def close(self) -> None:
+        pass
+
+
+def create_email_sender(settings: BaseAppSettings) -> EmailSender:
+    if settings.EMAIL_BACKEND == "smtp":
+        return SMTPEmailSender(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            settings.SMTP_USERNAME or None,
+            settings.SMTP_PASSWORD or None,
+            settings.SMTP_USE_TLS,
+            settings.SMTP_TIMEOUT,
+        )
+    return FileEmailSender(settings.EMAIL_FILE_DIR)
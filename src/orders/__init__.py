@@ -0,0 +1,20 @@
+from src.orders.checkout import (
+    CheckoutError,
+    CheckoutService,
+    EmptyCartError,
+    MoviesAlreadyOrderedError,
+    MoviesAlreadyPurchasedError,
+    PlacedOrder,
+)
+from src.orders.ownership import (
+    backfill_ownership,
+    grant_order,
+    ordered_movie_ids,
+    owned_movie_ids,
+    revoke_order,
+)
+from src.orders.popularity import (
+    current_trending_score,
+    reconcile_movie_stats,
+    record_order,
+)
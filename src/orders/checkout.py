@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, literal, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.carts import CartItemModel, CartModel
+from src.database.models.movies import MovieModel
+from src.database.models.orders import (
+    OrderItemModel,
+    OrderModel,
+    OrderStatusEnum,
+    PurchasedMovieModel,
+)
+
+
+class CheckoutError(Exception):
+    pass
+
+
+class EmptyCartError(CheckoutError):
+    pass
+
+
+class MoviesAlreadyPurchasedError(CheckoutError):
+    def __init__(self, movie_ids: list[int]) -> None:
+        super().__init__(f"Movies already purchased: {movie_ids}.")
+        self.movie_ids = movie_ids
+
+
+class MoviesAlreadyOrderedError(CheckoutError):
+    def __init__(self, movie_ids: list[int]) -> None:
+        super().__init__(f"Movies already in a pending order: {movie_ids}.")
+        self.movie_ids = movie_ids
+
+
+@dataclass(frozen=True)
+class PlacedOrder:
+    id: int
+    total_amount: Decimal
+    item_count: int
+
+
+class CheckoutService:
+    """
+    Turns a user's cart into a pending order.
+
+    Every step is a single set-based statement, so checkout issues the same
+    six statements whatever the size of the cart:
+
+    1. lock the cart row (``FOR UPDATE`` on PostgreSQL);
+    2. find cart movies the user already owns (``purchased_movies``) or has
+       in another pending order, which could otherwise be paid twice;
+    3. ``INSERT INTO orders ... SELECT`` grouped by cart, which inserts
+       nothing for an empty cart;
+    4. ``INSERT INTO order_items ... SELECT`` from the cart items joined to
+       movies, snapshotting ``price`` as ``price_at_order``;
+    5. set ``total_amount`` to the sum of the snapshotted prices;
+    6. empty the cart.
+
+    Everything runs in the session's transaction and is committed at the
+    end, or rolled back on any error.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def checkout(self, user_id: int) -> PlacedOrder:
+        try:
+            order = await self._place_order(user_id)
+        except BaseException:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        return order
+
+    async def _place_order(self, user_id: int) -> PlacedOrder:
+        cart_id = await self.session.scalar(
+            select(CartModel.id).where(CartModel.user_id == user_id).with_for_update()
+        )
+        if cart_id is None:
+            raise EmptyCartError("Cart is empty.")
+
+        purchased = (
+            select(CartItemModel.movie_id, literal(True).label("owned"))
+            .join(
+                PurchasedMovieModel,
+                (PurchasedMovieModel.user_id == user_id)
+                & (PurchasedMovieModel.movie_id == CartItemModel.movie_id),
+            )
+            .where(CartItemModel.cart_id == cart_id)
+        )
+        ordered = (
+            select(CartItemModel.movie_id, literal(False).label("owned"))
+            .join(OrderItemModel, OrderItemModel.movie_id == CartItemModel.movie_id)
+            .join(
+                OrderModel,
+                (OrderModel.id == OrderItemModel.order_id)
+                & (OrderModel.user_id == user_id)
+                & (OrderModel.status == OrderStatusEnum.PENDING),
+            )
+            .where(CartItemModel.cart_id == cart_id)
+        )
+        conflicts = (await self.session.execute(union_all(purchased, ordered))).all()
+        if any(owned for _, owned in conflicts):
+            raise MoviesAlreadyPurchasedError(
+                sorted({movie_id for movie_id, owned in conflicts if owned})
+            )
+        if conflicts:
+            raise MoviesAlreadyOrderedError(
+                sorted({movie_id for movie_id, _ in conflicts})
+            )
+
+        status_type = OrderModel.__table__.c.status.type
+        order_id = await self.session.scalar(
+            insert(OrderModel)
+            .from_select(
+                ["user_id", "cart_id", "status"],
+                select(
+                    literal(user_id),
+                    CartItemModel.cart_id,
+                    literal(OrderStatusEnum.PENDING, status_type),
+                )
+                .where(CartItemModel.cart_id == cart_id)
+                .group_by(CartItemModel.cart_id),
+            )
+            .returning(OrderModel.id)
+        )
+        if order_id is None:
+            raise EmptyCartError("Cart is empty.")
+
+        items = await self.session.execute(
+            insert(OrderItemModel).from_select(
+                ["order_id", "movie_id", "price_at_order"],
+                select(literal(order_id), CartItemModel.movie_id, MovieModel.price)
+                .join(MovieModel, MovieModel.id == CartItemModel.movie_id)
+                .where(CartItemModel.cart_id == cart_id),
+            )
+        )
+
+        # Summing the inserted rows rather than the movies keeps the total
+        # equal to the items even if a price changes mid-checkout.
+        total_amount = await self.session.scalar(
+            update(OrderModel)
+            .where(OrderModel.id == order_id)
+            .values(
+                total_amount=select(func.sum(OrderItemModel.price_at_order))
+                .where(OrderItemModel.order_id == order_id)
+                .scalar_subquery()
+            )
+            .returning(OrderModel.total_amount)
+        )
+
+        await self.session.execute(
+            delete(CartItemModel).where(CartItemModel.cart_id == cart_id)
+        )
+        return PlacedOrder(
+            id=order_id, total_amount=total_amount, item_count=items.rowcount
+        )
@@ -0,0 +1,180 @@
+"""
+Movie ownership kept in ``purchased_movies``.
+
+    python -m src.orders.ownership --batch-size 5000
+
+Rows are granted in the transaction that marks an order paid and revoked in
+the one that refunds it; running the module backfills them from paid orders
+already in the database.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import ColumnElement, Insert, delete, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import AsyncSessionLocal
+from src.database.models.orders import (
+    OrderItemModel,
+    OrderModel,
+    OrderStatusEnum,
+    PurchasedMovieModel,
+)
+from src.database.populate import insert_for
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def grant_paid_orders(
+    session: AsyncSession,
+    *criteria: ColumnElement[bool],
+    acquired_at: Optional[datetime] = None,
+) -> Insert:
+    """
+    ``INSERT ... SELECT`` giving each user the movies of their paid orders
+    matching ``criteria``. The earliest order wins, and is also the
+    acquisition time unless ``acquired_at`` is given; movies a user already
+    owns keep their original row.
+    """
+    acquired = (
+        func.min(OrderModel.created_at)
+        if acquired_at is None
+        else literal(acquired_at, PurchasedMovieModel.__table__.c.acquired_at.type)
+    )
+    return (
+        insert_for(session, PurchasedMovieModel.__table__)
+        .from_select(
+            ["user_id", "movie_id", "order_id", "acquired_at"],
+            select(
+                OrderModel.user_id,
+                OrderItemModel.movie_id,
+                func.min(OrderModel.id),
+                acquired,
+            )
+            .join(OrderModel, OrderModel.id == OrderItemModel.order_id)
+            .where(OrderModel.status == OrderStatusEnum.PAID, *criteria)
+            .group_by(OrderModel.user_id, OrderItemModel.movie_id),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "movie_id"])
+    )
+
+
+async def grant_order(session: AsyncSession, order_id: int) -> int:
+    """
+    Give the user of a just-paid order every movie in it.
+    """
+    result = await session.execute(
+        grant_paid_orders(
+            session, OrderModel.id == order_id, acquired_at=datetime.now(timezone.utc)
+        )
+    )
+    return result.rowcount
+
+
+async def revoke_order(session: AsyncSession, order_id: int) -> int:
+    """
+    Take back the movies granted by a refunded order. A movie the user also
+    bought in another paid order is re-granted from that order.
+    """
+    revoked = (
+        await session.execute(
+            delete(PurchasedMovieModel)
+            .where(PurchasedMovieModel.order_id == order_id)
+            .returning(PurchasedMovieModel.user_id, PurchasedMovieModel.movie_id)
+        )
+    ).all()
+    if revoked:
+        await session.execute(
+            grant_paid_orders(
+                session,
+                OrderModel.user_id == revoked[0].user_id,
+                OrderModel.id != order_id,
+                OrderItemModel.movie_id.in_([row.movie_id for row in revoked]),
+            )
+        )
+    return len(revoked)
+
+
+async def owned_movie_ids(
+    session: AsyncSession, user_id: int, movie_ids: Iterable[int]
+) -> set[int]:
+    """
+    Return which of ``movie_ids`` the user owns, with one primary key range
+    scan however many ids are asked about.
+    """
+    movie_ids = set(movie_ids)
+    if not movie_ids:
+        return set()
+    return set(
+        await session.scalars(
+            select(PurchasedMovieModel.movie_id).where(
+                PurchasedMovieModel.user_id == user_id,
+                PurchasedMovieModel.movie_id.in_(movie_ids),
+            )
+        )
+    )
+
+
+async def ordered_movie_ids(
+    session: AsyncSession, user_id: int, movie_ids: Iterable[int]
+) -> set[int]:
+    """
+    Return which of ``movie_ids`` are in one of the user's pending orders.
+    """
+    movie_ids = set(movie_ids)
+    if not movie_ids:
+        return set()
+    return set(
+        await session.scalars(
+            select(OrderItemModel.movie_id)
+            .join(OrderModel, OrderModel.id == OrderItemModel.order_id)
+            .where(
+                OrderModel.user_id == user_id,
+                OrderModel.status == OrderStatusEnum.PENDING,
+                OrderItemModel.movie_id.in_(movie_ids),
+            )
+        )
+    )
+
+
+async def backfill_ownership(
+    session: AsyncSession, batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """
+    Grant ownership for every paid order, walking the orders in id ranges of
+    ``batch_size`` and committing after each. Safe to re-run.
+    """
+    last_id = await session.scalar(select(func.coalesce(func.max(OrderModel.id), 0)))
+    granted = 0
+    for start in range(0, last_id, batch_size):
+        result = await session.execute(
+            grant_paid_orders(
+                session, OrderModel.id > start, OrderModel.id <= start + batch_size
+            )
+        )
+        await session.commit()
+        granted += result.rowcount
+    return granted
+
+
+async def main(batch_size: int) -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        granted = await backfill_ownership(session, batch_size)
+    print(
+        f"Granted {granted} purchased movies in {time.perf_counter() - started:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,185 @@
+"""
+Movie popularity aggregates in ``movie_stats``.
+
+    python -m src.orders.popularity
+
+Orders update the aggregates incrementally when they are paid or refunded;
+running the module (or the periodic task started by the app) rebuilds them
+from the paid orders, which also ages purchases out of the 30-day window.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.dependencies import get_settings
+from src.database import AsyncSessionLocal
+from src.database.models.movies import MovieStatsModel
+from src.database.models.orders import OrderItemModel, OrderModel, OrderStatusEnum
+from src.database.populate import chunked, insert_for
+
+RECENT_WINDOW = timedelta(days=30)
+# Trending weights double every half-life counted from this instant. Doubles
+# overflow after about 1000 half-lives, i.e. ~19 years at 7 days; move the
+# epoch forward (and reconcile) well before then.
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+RECONCILE_BATCH_SIZE = 5000
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def trending_weight(purchased_at: datetime, half_life_days: float) -> float:
+    elapsed = (as_utc(purchased_at) - TRENDING_EPOCH).total_seconds()
+    return 2.0 ** (elapsed / (half_life_days * 86400))
+
+
+def current_trending_score(
+    score: float, half_life_days: float, now: Optional[datetime] = None
+) -> float:
+    """
+    Convert a stored score into the decayed purchase count as of ``now``.
+    """
+    return score / trending_weight(now or datetime.now(timezone.utc), half_life_days)
+
+
+async def record_order(
+    session: AsyncSession,
+    order_id: int,
+    placed_at: datetime,
+    refund: bool = False,
+    half_life_days: Optional[float] = None,
+) -> None:
+    """
+    Add an order's items to the movie aggregates, or subtract them for a
+    refund, with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``.
+    """
+    half_life_days = half_life_days or get_settings().MOVIE_TRENDING_HALF_LIFE_DAYS
+    now = datetime.now(timezone.utc)
+    sign = -1 if refund else 1
+    recent = sign if now - as_utc(placed_at) <= RECENT_WINDOW else 0
+    table = MovieStatsModel.__table__
+
+    stmt = insert_for(session, table).from_select(
+        [
+            "movie_id",
+            "purchase_count",
+            "revenue",
+            "purchases_30d",
+            "trending_score",
+            "last_purchased_at",
+            "updated_at",
+        ],
+        select(
+            OrderItemModel.movie_id,
+            literal(sign),
+            OrderItemModel.price_at_order * sign,
+            literal(recent),
+            literal(sign * trending_weight(placed_at, half_life_days)),
+            literal(
+                None if refund else as_utc(placed_at), table.c.last_purchased_at.type
+            ),
+            literal(now, table.c.updated_at.type),
+        ).where(OrderItemModel.order_id == order_id),
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["movie_id"],
+            set_={
+                "purchase_count": table.c.purchase_count + stmt.excluded.purchase_count,
+                "revenue": table.c.revenue + stmt.excluded.revenue,
+                "purchases_30d": table.c.purchases_30d + stmt.excluded.purchases_30d,
+                "trending_score": table.c.trending_score + stmt.excluded.trending_score,
+                "last_purchased_at": func.coalesce(
+                    stmt.excluded.last_purchased_at, table.c.last_purchased_at
+                ),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+async def reconcile_movie_stats(
+    session: AsyncSession,
+    half_life_days: Optional[float] = None,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Recompute every movie's aggregates from the paid orders and replace the
+    table contents in one transaction. Returns the number of movies with
+    purchases.
+
+    Paid order items are streamed and folded in memory, one small entry per
+    movie, so the database only serves a sequential scan. Increments made
+    by orders paid while the scan runs may be overwritten; the next run
+    restores them.
+    """
+    half_life_days = half_life_days or get_settings().MOVIE_TRENDING_HALF_LIFE_DAYS
+    now = now or datetime.now(timezone.utc)
+    totals: dict[int, list] = {}
+    result = await session.stream(
+        select(
+            OrderItemModel.movie_id,
+            OrderItemModel.price_at_order,
+            OrderModel.created_at,
+        )
+        .join(OrderModel, OrderModel.id == OrderItemModel.order_id)
+        .where(OrderModel.status == OrderStatusEnum.PAID)
+        .execution_options(yield_per=batch_size)
+    )
+    async for movie_id, price, placed_at in result:
+        placed_at = as_utc(placed_at)
+        entry = totals.setdefault(movie_id, [0, Decimal(0), 0, 0.0, placed_at])
+        entry[0] += 1
+        entry[1] += price
+        entry[2] += now - placed_at <= RECENT_WINDOW
+        entry[3] += trending_weight(placed_at, half_life_days)
+        entry[4] = max(entry[4], placed_at)
+
+    await session.execute(delete(MovieStatsModel))
+    for batch in chunked(totals.items(), batch_size):
+        await session.execute(
+            insert(MovieStatsModel),
+            [
+                {
+                    "movie_id": movie_id,
+                    "purchase_count": count,
+                    "revenue": revenue,
+                    "purchases_30d": recent,
+                    "trending_score": score,
+                    "last_purchased_at": last,
+                    "updated_at": now,
+                }
+                for movie_id, (count, revenue, recent, score, last) in batch
+            ],
+        )
+    await session.commit()
+    return len(totals)
+
+
+async def main() -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        movies = await reconcile_movie_stats(session)
+    print(
+        f"Reconciled stats for {movies} movies in "
+        f"{time.perf_counter() - started:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
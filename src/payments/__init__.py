@@ -0,0 +1,15 @@
+from src.payments.provider import (
+    InvalidSignatureError,
+    PaymentProviderClient,
+    PaymentProviderError,
+    sign_payload,
+    verify_signature,
+)
+from src.payments.service import (
+    OrderNotFoundError,
+    OrderNotPayableError,
+    PaymentError,
+    PaymentNotReadyError,
+    PaymentRecord,
+    PaymentService,
+)
@@ -0,0 +1,161 @@
+"""
+Local stand-in for the payment provider.
+
+    python -m src.payments.fake_provider --port 8001 \
+        --webhook-url http://localhost:8000/api/v1/payments/webhook/
+
+Implements the slice of the provider API the app uses: idempotent payment
+creation, plus confirm and refund endpoints that settle a payment and deliver
+its signed webhook, optionally several times at once to mimic provider
+retries. In tests, build it with ``create_fake_provider`` and talk to it
+through ``httpx.ASGITransport`` without opening a socket.
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from decimal import Decimal
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Header, HTTPException, Query, status
+from pydantic import BaseModel
+
+from src.payments.provider import SIGNATURE_HEADER, sign_payload
+
+OUTCOMES = {"succeeded": "payment.succeeded", "failed": "payment.failed"}
+
+
+class PaymentCreateSchema(BaseModel):
+    amount: Decimal
+    metadata: dict[str, str] = {}
+
+
+def create_fake_provider(
+    webhook_url: str,
+    webhook_secret: str,
+    api_key: str = "test-key",
+    webhook_transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> FastAPI:
+    """
+    Build the provider app. Webhooks are posted to ``webhook_url`` through
+    ``webhook_transport`` when given, e.g. an ``ASGITransport`` wrapping the
+    app under test.
+    """
+    app = FastAPI(title="Fake payment provider")
+    payments: dict[str, dict] = {}
+    idempotency_keys: dict[str, str] = {}
+    app.state.payments = payments
+
+    def authorize(authorization: Optional[str]) -> None:
+        if authorization != f"Bearer {api_key}":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    async def deliver(event: dict, deliveries: int) -> list[int]:
+        payload = json.dumps(event).encode()
+        headers = {
+            "Content-Type": "application/json",
+            SIGNATURE_HEADER: sign_payload(webhook_secret, payload),
+        }
+        async with httpx.AsyncClient(transport=webhook_transport) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(webhook_url, content=payload, headers=headers)
+                    for _ in range(deliveries)
+                )
+            )
+        return [response.status_code for response in responses]
+
+    @app.post("/v1/payments")
+    async def create_payment(
+        data: PaymentCreateSchema,
+        idempotency_key: str = Header(...),
+        authorization: Optional[str] = Header(None),
+    ) -> dict:
+        authorize(authorization)
+        if idempotency_key in idempotency_keys:
+            return payments[idempotency_keys[idempotency_key]]
+        payment_id = f"pay_{secrets.token_hex(12)}"
+        payments[payment_id] = {
+            "id": payment_id,
+            "status": "pending",
+            "amount": str(data.amount),
+            "metadata": data.metadata,
+        }
+        idempotency_keys[idempotency_key] = payment_id
+        return payments[payment_id]
+
+    async def settle(
+        payment_id: str, new_status: str, event_type: str, deliveries: int
+    ) -> dict:
+        payment = payments.get(payment_id)
+        if payment is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        payment["status"] = new_status
+        event = {
+            "id": f"evt_{secrets.token_hex(12)}",
+            "type": event_type,
+            "created": int(time.time()),
+            "data": {"payment_id": payment_id},
+        }
+        return {
+            "payment": payment,
+            "event": event,
+            "responses": await deliver(event, deliveries),
+        }
+
+    @app.post("/v1/payments/{payment_id}/confirm")
+    async def confirm_payment(
+        payment_id: str,
+        outcome: str = Query("succeeded", pattern="^(succeeded|failed)$"),
+        deliveries: int = Query(1, ge=1, le=100),
+        authorization: Optional[str] = Header(None),
+    ) -> dict:
+        """
+        Settle the payment and post its webhook ``deliveries`` times
+        concurrently, all with the same event id.
+        """
+        authorize(authorization)
+        return await settle(payment_id, outcome, OUTCOMES[outcome], deliveries)
+
+    @app.post("/v1/payments/{payment_id}/refund")
+    async def refund_payment(
+        payment_id: str,
+        deliveries: int = Query(1, ge=1, le=100),
+        authorization: Optional[str] = Header(None),
+    ) -> dict:
+        authorize(authorization)
+        if payments.get(payment_id, {}).get("status") != "succeeded":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Only succeeded payments can be refunded.",
+            )
+        return await settle(payment_id, "refunded", "payment.refunded", deliveries)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    from src.config.dependencies import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--webhook-url", default="http://localhost:8000/api/v1/payments/webhook/"
+    )
+    args = parser.parse_args()
+    uvicorn.run(
+        create_fake_provider(
+            args.webhook_url,
+            settings.PAYMENT_WEBHOOK_SECRET,
+            settings.PAYMENT_PROVIDER_API_KEY,
+        ),
+        host=args.host,
+        port=args.port,
+    )
@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+import httpx
+
+from src.config.settings import BaseAppSettings
+
+SIGNATURE_HEADER = "Payment-Signature"
+
+
+class PaymentProviderError(Exception):
+    pass
+
+
+class InvalidSignatureError(Exception):
+    pass
+
+
+def sign_payload(secret: str, payload: bytes, timestamp: Optional[int] = None) -> str:
+    """
+    Build a ``t=<unix time>,v1=<hex HMAC-SHA256 of "t.payload">`` header value.
+    """
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(
+    secret: str,
+    payload: bytes,
+    header: Optional[str],
+    tolerance: int,
+    now: Optional[float] = None,
+) -> None:
+    """
+    Raise ``InvalidSignatureError`` unless ``header`` signs ``payload`` with
+    ``secret`` and its timestamp is within ``tolerance`` seconds of ``now``.
+    """
+    if not header:
+        raise InvalidSignatureError("Signature header is missing.")
+    try:
+        fields = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = int(fields["t"])
+        signature = fields["v1"]
+    except (KeyError, ValueError):
+        raise InvalidSignatureError("Signature header is malformed.")
+    now = time.time() if now is None else now
+    if abs(now - timestamp) > tolerance:
+        raise InvalidSignatureError("Signature timestamp is outside the tolerance.")
+    expected = sign_payload(secret, payload, timestamp).split("v1=", 1)[1]
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidSignatureError("Signature does not match.")
+
+
+@dataclass(frozen=True)
+class ProviderPayment:
+    id: str
+    status: str
+    amount: Decimal
+
+
+class PaymentProviderClient:
+    """
+    Minimal client for the provider's payments API.
+
+    Creation is idempotent on the provider side: repeating a request with the
+    same ``Idempotency-Key`` returns the payment created the first time, so a
+    timed-out call can be retried without charging twice.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def create_payment(
+        self, amount: Decimal, idempotency_key: str, metadata: dict[str, str]
+    ) -> ProviderPayment:
+        try:
+            response = await self._client.post(
+                "/v1/payments",
+                json={"amount": str(amount), "metadata": metadata},
+                headers={"Idempotency-Key": idempotency_key},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as error:
+            raise PaymentProviderError(f"Payment provider request failed: {error}")
+        data = response.json()
+        return ProviderPayment(
+            id=data["id"], status=data["status"], amount=Decimal(data["amount"])
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_payment_provider(settings: BaseAppSettings) -> PaymentProviderClient:
+    return PaymentProviderClient(
+        settings.PAYMENT_PROVIDER_URL,
+        settings.PAYMENT_PROVIDER_API_KEY,
+        settings.PAYMENT_PROVIDER_TIMEOUT,
+    )
@@ -0,0 +1,227 @@
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.orders import OrderItemModel, OrderModel, OrderStatusEnum
+from src.database.models.payments import (
+    PaymentItemsModel,
+    PaymentModel,
+    PaymentStatusEnum,
+    PaymentWebhookEventModel,
+)
+from src.database.populate import insert_for
+from src.orders.ownership import grant_order, revoke_order
+from src.orders.popularity import record_order
+from src.payments.provider import PaymentProviderClient
+
+logger = logging.getLogger(__name__)
+
+# Webhook event type -> (payment status it applies to, new payment status).
+EVENT_TRANSITIONS = {
+    "payment.succeeded": (PaymentStatusEnum.PENDING, PaymentStatusEnum.SUCCESSFUL),
+    "payment.failed": (PaymentStatusEnum.PENDING, PaymentStatusEnum.CANCELED),
+    "payment.refunded": (PaymentStatusEnum.SUCCESSFUL, PaymentStatusEnum.REFUNDED),
+}
+# New payment status -> (order status it applies to, new order status).
+# Orders have no refunded state; a refunded order is canceled.
+ORDER_TRANSITIONS = {
+    PaymentStatusEnum.SUCCESSFUL: (OrderStatusEnum.PENDING, OrderStatusEnum.PAID),
+    PaymentStatusEnum.REFUNDED: (OrderStatusEnum.PAID, OrderStatusEnum.CANCELED),
+}
+
+
+class PaymentError(Exception):
+    pass
+
+
+class OrderNotFoundError(PaymentError):
+    pass
+
+
+class OrderNotPayableError(PaymentError):
+    pass
+
+
+class PaymentNotReadyError(PaymentError):
+    pass
+
+
+@dataclass(frozen=True)
+class PaymentRecord:
+    id: int
+    order_id: int
+    external_payment_id: str
+    amount: Decimal
+    status: PaymentStatusEnum
+
+
+class PaymentService:
+    """
+    Starts payments for pending orders and applies provider webhooks.
+
+    Nothing here takes an explicit lock. Duplicate payment rows are prevented
+    by the unique ``external_payment_id``, duplicate webhook deliveries by the
+    unique event id, and every status change is a compare-and-set ``UPDATE
+    ... WHERE status = <expected>``, so concurrent writers for the same order
+    make exactly one transition and writers for other orders never wait on
+    each other. Movie ownership and popularity aggregates are updated in the
+    same transaction as the order status change.
+    """
+
+    def __init__(self, session: AsyncSession, provider: PaymentProviderClient) -> None:
+        self.session = session
+        self.provider = provider
+
+    async def _payment(self, where: ColumnElement[bool]) -> PaymentRecord | None:
+        row = (
+            await self.session.execute(
+                select(
+                    PaymentModel.id,
+                    PaymentModel.order_id,
+                    PaymentModel.external_payment_id,
+                    PaymentModel.amount,
+                    PaymentModel.status,
+                ).where(where)
+            )
+        ).first()
+        return PaymentRecord(**row._mapping) if row else None
+
+    async def start_payment(self, user_id: int, order_id: int) -> PaymentRecord:
+        """
+        Return the order's pending payment, creating it with the provider if
+        there is none. Safe to call repeatedly and concurrently.
+        """
+        order = (
+            await self.session.execute(
+                select(OrderModel.status, OrderModel.total_amount).where(
+                    OrderModel.id == order_id, OrderModel.user_id == user_id
+                )
+            )
+        ).first()
+        if order is None:
+            raise OrderNotFoundError("Order not found.")
+        if order.status != OrderStatusEnum.PENDING:
+            raise OrderNotPayableError(f"Order is {order.status.value}.")
+
+        pending = await self._payment(
+            (PaymentModel.order_id == order_id)
+            & (PaymentModel.status == PaymentStatusEnum.PENDING)
+        )
+        if pending is not None:
+            return pending
+        attempt = await self.session.scalar(
+            select(func.count()).where(PaymentModel.order_id == order_id)
+        )
+        # No transaction stays open across the provider round-trip.
+        await self.session.rollback()
+
+        # Callers racing on the same attempt send the same key, get the same
+        # provider payment back and insert it only once below.
+        external = await self.provider.create_payment(
+            order.total_amount,
+            idempotency_key=f"order-{order_id}-{attempt}",
+            metadata={"order_id": str(order_id)},
+        )
+        payment_id = await self.session.scalar(
+            insert_for(self.session, PaymentModel.__table__)
+            .values(
+                user_id=user_id,
+                order_id=order_id,
+                status=PaymentStatusEnum.PENDING,
+                amount=external.amount,
+                external_payment_id=external.id,
+            )
+            .on_conflict_do_nothing(index_elements=["external_payment_id"])
+            .returning(PaymentModel.id)
+        )
+        if payment_id is not None:
+            await self.session.execute(
+                insert_for(self.session, PaymentItemsModel.__table__).from_select(
+                    ["payment_id", "order_item_id", "price_at_payment"],
+                    select(
+                        literal(payment_id),
+                        OrderItemModel.id,
+                        OrderItemModel.price_at_order,
+                    ).where(OrderItemModel.order_id == order_id),
+                )
+            )
+        await self.session.commit()
+        return await self._payment(PaymentModel.external_payment_id == external.id)
+
+    async def _transition_order(
+        self,
+        order_id: int,
+        from_status: OrderStatusEnum,
+        to_status: OrderStatusEnum,
+    ) -> None:
+        placed_at = await self.session.scalar(
+            update(OrderModel)
+            .where(OrderModel.id == order_id, OrderModel.status == from_status)
+            .values(status=to_status)
+            .returning(OrderModel.created_at)
+        )
+        if placed_at is None:
+            logger.warning(
+                "Order %s was not %s when its payment moved it to %s; it needs "
+                "manual review.",
+                order_id,
+                from_status.value,
+                to_status.value,
+            )
+        elif to_status == OrderStatusEnum.PAID:
+            await grant_order(self.session, order_id)
+            await record_order(self.session, order_id, placed_at)
+        elif from_status == OrderStatusEnum.PAID:
+            await revoke_order(self.session, order_id)
+            await record_order(self.session, order_id, placed_at, refund=True)
+
+    async def handle_event(
+        self, event_id: str, event_type: str, external_payment_id: str
+    ) -> bool:
+        """
+        Apply a webhook event once. Returns False for a delivery of an event
+        that was already recorded, True otherwise.
+
+        Raises ``PaymentNotReadyError``, recording nothing, when the payment
+        is not in the status the event applies to: its row may not be
+        committed yet if the webhook overtook :meth:`start_payment`, and a
+        redelivery of the event then applies it.
+        """
+        recorded = await self.session.scalar(
+            insert_for(self.session, PaymentWebhookEventModel.__table__)
+            .values(
+                event_id=event_id,
+                event_type=event_type,
+                external_payment_id=external_payment_id,
+            )
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(PaymentWebhookEventModel.id)
+        )
+        if recorded is None:
+            await self.session.rollback()
+            return False
+
+        transition = EVENT_TRANSITIONS.get(event_type)
+        if transition is not None:
+            from_status, to_status = transition
+            order_id = await self.session.scalar(
+                update(PaymentModel)
+                .where(
+                    PaymentModel.external_payment_id == external_payment_id,
+                    PaymentModel.status == from_status,
+                )
+                .values(status=to_status)
+                .returning(PaymentModel.order_id)
+            )
+            if order_id is None:
+                await self.session.rollback()
+                raise PaymentNotReadyError(
+                    f"Payment {external_payment_id} is not {from_status.value}."
+                )
+            if to_status in ORDER_TRANSITIONS:
+                await self._transition_order(order_id, *ORDER_TRANSITIONS[to_status])
+        await self.session.commit()
+        return True
@@ -0,0 +1,9 @@
+from src.ratelimit.gcra import (
+    Decision,
+    MemoryRateLimitStore,
+    Rate,
+    RateLimitStore,
+    RedisRateLimitStore,
+)
+from src.ratelimit.limiter import RateLimiter, create_rate_limiter
+from src.ratelimit.dependencies import rate_limit
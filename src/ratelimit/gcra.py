@@ -0,0 +1,189 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    ``limit`` requests per ``period`` seconds, all of which may arrive at
+    once (the burst) before requests are spaced ``interval`` apart.
+    """
+
+    limit: int
+    period: float
+
+    def steps(self, unit: float) -> tuple[int, int]:
+        """
+        ``(interval, period)`` in whole ``unit`` seconds. The interval is
+        rounded down, so a burst of ``limit`` requests always fits.
+        """
+        period = round(self.period / unit)
+        return period // self.limit, period
+
+    @classmethod
+    def parse(cls, text: str) -> "Rate":
+        """
+        ``"<limit>/<seconds>"``, e.g. ``"10/60"``.
+        """
+        try:
+            limit, period = text.split("/")
+            rate = cls(int(limit), float(period))
+        except ValueError:
+            raise ValueError(f"Invalid rate {text!r}, expected '<limit>/<seconds>'.")
+        if rate.limit < 1 or rate.period <= 0:
+            raise ValueError(f"Invalid rate {text!r}, both parts must be positive.")
+        return rate
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    # Requests still allowed right now, and seconds until the next one is.
+    remaining: int
+    retry_after: float
+
+
+def gcra(tat: int, now: int, interval: int, period: int) -> tuple[int, bool, int]:
+    """
+    Generic cell rate algorithm: a token bucket kept as a single number, the
+    theoretical arrival time (``tat``) at which the bucket is full again.
+
+    A request is allowed unless it would push ``tat`` more than one
+    ``period`` ahead of ``now``. Returns the new ``tat`` (unchanged when the
+    request is refused), whether it is allowed, and the requests remaining
+    or, when refused, the wait until the next one is allowed. Times are
+    integers in any one unit, so bursts are exact.
+    """
+    tat = max(tat, now)
+    new_tat = tat + interval
+    allow_at = new_tat - period
+    if now < allow_at:
+        return tat, False, allow_at - now
+    return new_tat, True, (now - allow_at) // interval
+
+
+class RateLimitStore(ABC):
+    """
+    Where the ``tat`` of every bucket lives; ``hit`` must read and update it
+    atomically.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        """
+        Count one request against the bucket ``key`` and decide on it.
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Buckets of this process only: a dict of integers updated without any
+    ``await``, hence atomically within the event loop and without locks.
+
+    A bucket whose ``tat`` has passed is full, the same as a missing one, so
+    past ``max_keys`` those are dropped first; if that is not enough the
+    least recently hit buckets go, which can only let their clients through
+    earlier.
+    """
+
+    # Nanoseconds, the unit of ``timer``.
+    UNIT = 1e-9
+
+    def __init__(
+        self, max_keys: int, timer: Callable[[], int] = time.monotonic_ns
+    ) -> None:
+        self.max_keys = max_keys
+        self._timer = timer
+        self._tats: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        now = self._timer()
+        # Popped and re-inserted, refused or not, so the dict stays ordered
+        # from least to most recently hit.
+        tat, allowed, value = gcra(
+            self._tats.pop(key, now), now, *rate.steps(self.UNIT)
+        )
+        self._tats[key] = tat
+        if len(self._tats) > self.max_keys:
+            self._prune(now)
+        if not allowed:
+            return Decision(False, 0, value * self.UNIT)
+        return Decision(True, value, 0.0)
+
+    def _prune(self, now: int) -> None:
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        # Leave headroom so a store full of live buckets is not pruned on
+        # every request; the first keys are the least recently hit.
+        excess = len(self._tats) - self.max_keys * 9 // 10
+        for key in list(self._tats)[: max(excess, 0)]:
+            del self._tats[key]
+
+
+# :func:`gcra` in microseconds on the Redis clock, so workers with skewed
+# clocks share buckets correctly. Lua numbers are doubles, exact for integers
+# of this size; ``tat`` is written with an explicit format because
+# ``tostring`` keeps only 14 significant digits. The key expires once its
+# bucket is full again.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, allow_at - now}
+end
+local ttl = math.ceil((new_tat - now) / 1000)
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', ttl)
+return {1, math.floor((now - allow_at) / interval)}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Buckets shared by every worker, updated by one Lua script call per hit.
+    Needs Redis 5 or later, which replicates scripts by effect.
+    """
+
+    # Microseconds, the unit of the script.
+    UNIT = 1e-6
+
+    def __init__(self, client: Any, prefix: str) -> None:
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str) -> "RedisRateLimitStore":
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package to be "
+                "installed."
+            ) from exc
+        return cls(redis.from_url(url), prefix)
+
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        allowed, value = await self._script(
+            keys=[f"{self.prefix}:ratelimit:{key}"], args=rate.steps(self.UNIT)
+        )
+        if allowed:
+            return Decision(True, int(value), 0.0)
+        return Decision(False, 0, int(value) * self.UNIT)
+
+    async def close(self) -> None:
+        await self.client.aclose()
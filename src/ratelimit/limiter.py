@@ -0,0 +1,149 @@
+import logging
+from typing import Optional
+
+from src.config.settings import BaseAppSettings
+from src.database.models.users import UserGroupEnum
+from src.metrics.registry import registry
+from src.ratelimit.gcra import (
+    Decision,
+    MemoryRateLimitStore,
+    Rate,
+    RateLimitStore,
+    RedisRateLimitStore,
+)
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_DECISIONS = registry.counter(
+    "rate_limit_decisions_total",
+    "Requests checked against a rate limit, by outcome.",
+    ("route", "group", "outcome"),
+)
+
+# Group of requests without a valid access token.
+ANONYMOUS = "anonymous"
+
+# (limited route, group) -> rate, with ``None`` standing for every group
+# without an entry of its own. Staff get more room on shared limits.
+DEFAULT_RATE_LIMITS: dict[tuple[str, Optional[str]], Optional[Rate]] = {
+    ("login", None): Rate(10, 60),
+    ("register", None): Rate(5, 3600),
+    ("activation_resend", None): Rate(3, 3600),
+    ("password_reset", None): Rate(5, 3600),
+    ("password_reset_complete", None): Rate(10, 3600),
+    ("checkout", None): Rate(10, 60),
+    ("checkout", UserGroupEnum.MODERATOR.value): Rate(30, 60),
+    ("checkout", UserGroupEnum.ADMIN.value): Rate(120, 60),
+}
+
+
+def parse_rate_limits(text: str) -> dict[tuple[str, Optional[str]], Optional[Rate]]:
+    """
+    ``"login=20/60,checkout.admin=off"``: comma separated
+    ``<route>[.<group>]=<limit>/<seconds>`` entries, ``off`` lifting a limit.
+    """
+    limits: dict[tuple[str, Optional[str]], Optional[Rate]] = {}
+    for entry in filter(None, (part.strip() for part in text.split(","))):
+        target, _, value = entry.partition("=")
+        route, _, group = target.strip().partition(".")
+        if not route or not value:
+            raise ValueError(f"Invalid rate limit {entry!r}.")
+        value = value.strip()
+        limits[route, group or None] = None if value == "off" else Rate.parse(value)
+    return limits
+
+
+class ConcurrencyLimiter:
+    """
+    In-flight request count per key in this process; like the memory store
+    it is only touched between awaits, so it needs no lock.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._running: dict[str, int] = {}
+
+    def acquire(self, key: str) -> bool:
+        running = self._running.get(key, 0)
+        if running >= self.limit:
+            return False
+        self._running[key] = running + 1
+        return True
+
+    def release(self, key: str) -> None:
+        running = self._running.pop(key) - 1
+        if running:
+            self._running[key] = running
+
+
+class RateLimiter:
+    """
+    Applies the rate of a route for a group, keyed by client, to a store.
+
+    A store error lets the request through (and is counted as ``error``):
+    losing the limiter must not take the routes it protects down with it.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        limits: dict[tuple[str, Optional[str]], Optional[Rate]],
+        concurrency: int = 0,
+    ) -> None:
+        self.store = store
+        self.limits = limits
+        self.concurrency = ConcurrencyLimiter(concurrency) if concurrency else None
+
+    def rate(self, route: str, group: str) -> Optional[Rate]:
+        if (route, group) in self.limits:
+            return self.limits[route, group]
+        return self.limits.get((route, None))
+
+    async def hit(self, route: str, group: str, client: str) -> Optional[Decision]:
+        """
+        The decision for one request of ``client``, or None when the route
+        is not limited for ``group``.
+        """
+        rate = self.rate(route, group)
+        if rate is None:
+            return None
+        try:
+            decision = await self.store.hit(f"{route}:{client}", rate)
+        except Exception:
+            logger.exception("Rate limit store failed, letting the request through")
+            RATE_LIMIT_DECISIONS.inc(route=route, group=group, outcome="error")
+            return None
+        outcome = "allowed" if decision.allowed else "limited"
+        RATE_LIMIT_DECISIONS.inc(route=route, group=group, outcome=outcome)
+        return decision
+
+    def acquire(self, route: str, group: str, client: str) -> bool:
+        """
+        Take one of the client's concurrent slots for ``route``; False when
+        they are all in use. Every successful call needs a :meth:`release`.
+        """
+        if self.concurrency is None or self.concurrency.acquire(f"{route}:{client}"):
+            return True
+        RATE_LIMIT_DECISIONS.inc(route=route, group=group, outcome="concurrent")
+        return False
+
+    def release(self, route: str, client: str) -> None:
+        if self.concurrency is not None:
+            self.concurrency.release(f"{route}:{client}")
+
+    async def close(self) -> None:
+        await self.store.close()
+
+
+def create_rate_limiter(settings: BaseAppSettings) -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        store: RateLimitStore = RedisRateLimitStore.from_url(
+            settings.CACHE_REDIS_URL, settings.CACHE_KEY_PREFIX
+        )
+    else:
+        store = MemoryRateLimitStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    return RateLimiter(
+        store,
+        {**DEFAULT_RATE_LIMITS, **parse_rate_limits(settings.RATE_LIMITS)},
+        concurrency=settings.RATE_LIMIT_CONCURRENCY,
+    )
@@ -0,0 +1,13 @@
+from src.recommendations.index import (
+    FEATURE_TYPES,
+    FeatureEdges,
+    RecommendationIndex,
+)
+from src.recommendations.engine import (
+    RecommendationEngine,
+    build_index,
+    load_edges,
+    recommendation_engine,
+    refresh_index,
+    run_recommendation_refresh,
+)
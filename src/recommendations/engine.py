@@ -0,0 +1,220 @@
+"""
+Build or refresh the shared recommendation index file.
+
+    python -m src.recommendations.engine [--full]
+
+The app refreshes the index every ``RECOMMENDATION_REFRESH_INTERVAL``
+seconds; this command does the same on demand, or rebuilds it from scratch.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import Table, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cache.arrays import try_lock
+from src.config.dependencies import get_settings
+from src.database import AsyncSessionLocal
+from src.database.models.movies import (
+    MovieModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarsMoviesModel,
+)
+from src.database.populate import chunked
+from src.recommendations.index import FeatureEdges, RecommendationIndex
+
+logger = logging.getLogger(__name__)
+
+# (association table, entity column) per entry of FEATURE_TYPES.
+FEATURE_TABLES: tuple[tuple[Table, str], ...] = (
+    (MoviesGenresModel, "genre_id"),
+    (StarsMoviesModel, "star_id"),
+    (MoviesDirectorsModel, "director_id"),
+)
+FETCH_BATCH_SIZE = 10_000
+IN_CLAUSE_SIZE = 500
+
+
+async def _fetch_pairs(session: AsyncSession, stmt) -> np.ndarray:  # noqa: ANN001
+    chunks = []
+    result = await session.stream(stmt.execution_options(yield_per=FETCH_BATCH_SIZE))
+    async for partition in result.partitions():
+        chunks.append(np.asarray(partition, dtype=np.int64).reshape(-1, 2))
+    return np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int64)
+
+
+async def load_edges(
+    session: AsyncSession, movie_ids: Optional[list[int]] = None
+) -> list[FeatureEdges]:
+    """
+    Read the association tables into ``FeatureEdges``, for all movies or
+    only ``movie_ids``.
+    """
+    edges = []
+    for table, column in FEATURE_TABLES:
+        stmt = select(table.c.movie_id, table.c[column])
+        if movie_ids is None:
+            pairs = await _fetch_pairs(session, stmt)
+        else:
+            parts = [
+                await _fetch_pairs(session, stmt.where(table.c.movie_id.in_(batch)))
+                for batch in chunked(movie_ids, IN_CLAUSE_SIZE)
+            ]
+            pairs = np.concatenate(parts) if parts else np.empty((0, 2), np.int64)
+        edges.append(FeatureEdges(pairs[:, 0], pairs[:, 1]))
+    return edges
+
+
+async def _catalog_marker(session: AsyncSession) -> Optional[str]:
+    marker = await session.scalar(select(func.max(MovieModel.updated_at)))
+    return marker.isoformat() if marker else None
+
+
+async def _movie_ids(session: AsyncSession) -> np.ndarray:
+    return np.fromiter(
+        await session.scalars(select(MovieModel.id).order_by(MovieModel.id)),
+        dtype=np.int64,
+    )
+
+
+async def build_index(session: AsyncSession) -> RecommendationIndex:
+    # Read the marker first: a movie changed while loading is picked up
+    # again by the next refresh rather than missed.
+    marker = await _catalog_marker(session)
+    movie_ids = await _movie_ids(session)
+    return RecommendationIndex.build(movie_ids, await load_edges(session), marker)
+
+
+async def refresh_index(
+    session: AsyncSession, index: RecommendationIndex
+) -> Optional[RecommendationIndex]:
+    """
+    Rebuild ``index`` with only the movies added, changed (by
+    ``MovieModel.updated_at``) or deleted since it was built re-read from
+    the database. Returns None when nothing changed.
+    """
+    if index.catalog_marker is None:
+        return await build_index(session)
+    marker = await _catalog_marker(session)
+    changed = list(
+        await session.scalars(
+            select(MovieModel.id).where(
+                MovieModel.updated_at >= datetime.fromisoformat(index.catalog_marker)
+            )
+        )
+    )
+    movie_ids = await _movie_ids(session)
+    removed = np.setdiff1d(index.movie_ids, movie_ids, assume_unique=True)
+    if marker == index.catalog_marker and not removed.size:
+        return None
+
+    stale = np.concatenate([np.asarray(changed, dtype=np.int64), removed])
+    fresh = await load_edges(session, changed)
+    merged = []
+    for kept, new in zip(index.edges(), fresh):
+        keep = ~np.isin(kept.movie_ids, stale)
+        merged.append(
+            FeatureEdges(
+                np.concatenate([kept.movie_ids[keep], new.movie_ids]),
+                np.concatenate([kept.entity_ids[keep], new.entity_ids]),
+            )
+        )
+    return RecommendationIndex.build(movie_ids, merged, marker)
+
+
+class RecommendationEngine:
+    """
+    Per-process handle on the index file shared by all workers.
+
+    ``get`` maps the file and remaps it whenever another process replaced
+    it; ``refresh`` lets one process at a time (by ``flock``) update the
+    file, so workers neither rebuild the index at startup nor duplicate
+    each other's refreshes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._index: Optional[RecommendationIndex] = None
+        self._loaded_mtime: Optional[int] = None
+
+    def get(self) -> Optional[RecommendationIndex]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return self._index
+        if mtime != self._loaded_mtime:
+            self._index = RecommendationIndex.load(self.path)
+            self._loaded_mtime = mtime
+        return self._index
+
+    async def refresh(self, session: AsyncSession, full: bool = False) -> bool:
+        """
+        Bring the index file up to date with the catalog. Returns False if
+        another process holds the refresh lock or nothing changed.
+        """
+        with try_lock(f"{self.path}.lock") as locked:
+            if not locked:
+                return False
+            current = None if full else self.get()
+            if current is None:
+                index = await build_index(session)
+            else:
+                index = await refresh_index(session, current)
+            if index is None:
+                return False
+            # Writing is CPU and disk work; keep the event loop responsive.
+            await asyncio.to_thread(index.save, self.path)
+        self.get()
+        return True
+
+
+recommendation_engine = RecommendationEngine(get_settings().RECOMMENDATION_INDEX_PATH)
+
+
+async def run_recommendation_refresh(
+    session_factory: async_sessionmaker, interval: float
+) -> None:
+    """
+    Background loop running :meth:`RecommendationEngine.refresh` every
+    ``interval`` seconds until cancelled, starting immediately.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                if await recommendation_engine.refresh(session):
+                    logger.info(
+                        "Recommendation index refreshed (%s movies)",
+                        len(recommendation_engine.get()),
+                    )
+        except Exception:
+            logger.exception("Recommendation index refresh failed")
+        await asyncio.sleep(interval)
+
+
+async def main(full: bool) -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        updated = await recommendation_engine.refresh(session, full=full)
+    index = recommendation_engine.get()
+    state = "updated" if updated else "already up to date"
+    print(
+        f"Recommendation index {state}: {len(index) if index else 0} movies, "
+        f"{time.perf_counter() - started:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.full))
@@ -0,0 +1,225 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from src.cache.arrays import open_array_file, write_array_file
+
+# Feature families, in column order: each movie's row has a 1 for each of
+# its genres, stars and directors before weighting.
+FEATURE_TYPES = ("genre", "star", "director")
+QUERY_BATCH_SIZE = 32
+
+
+def _index_dtype(size: int) -> type:
+    return np.int32 if size < np.iinfo(np.int32).max else np.int64
+
+
+@dataclass(frozen=True)
+class FeatureEdges:
+    """
+    ``(movie_id, entity_id)`` pairs of one feature family, e.g. the rows of
+    ``movie_genres``.
+    """
+
+    movie_ids: np.ndarray
+    entity_ids: np.ndarray
+
+
+class RecommendationIndex:
+    """
+    Movies as L2-normalized TF-IDF vectors over their genres, stars and
+    directors, held as a CSR matrix so cosine similarity is a sparse
+    matrix product.
+
+    ``offsets[t]`` is the first column of feature family ``t``; entity ``e``
+    of that family lives in column ``offsets[t] + e``. Rare features (a
+    director) weigh more than common ones (the Drama genre).
+    """
+
+    def __init__(
+        self,
+        movie_ids: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        offsets: np.ndarray,
+        catalog_marker: Optional[str] = None,
+    ) -> None:
+        self.movie_ids = movie_ids
+        self.offsets = offsets
+        self.catalog_marker = catalog_marker
+        self.matrix = sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(movie_ids), int(offsets[-1]))
+        )
+
+    def __len__(self) -> int:
+        return len(self.movie_ids)
+
+    @classmethod
+    def build(
+        cls,
+        movie_ids: np.ndarray,
+        edges: Sequence[FeatureEdges],
+        catalog_marker: Optional[str] = None,
+    ) -> "RecommendationIndex":
+        """
+        Build the index for ``movie_ids`` from one ``FeatureEdges`` per entry
+        of ``FEATURE_TYPES``; edges of other movies are ignored.
+        """
+        movie_ids = np.unique(np.asarray(movie_ids, dtype=np.int64))
+        sizes = [int(edge.entity_ids.max(initial=-1)) + 1 for edge in edges]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+        rows, columns = [], []
+        for offset, edge in zip(offsets, edges):
+            position = np.searchsorted(movie_ids, edge.movie_ids)
+            position = np.minimum(position, max(len(movie_ids) - 1, 0))
+            known = (
+                movie_ids[position] == edge.movie_ids
+                if len(movie_ids)
+                else np.zeros(len(edge.movie_ids), dtype=bool)
+            )
+            rows.append(position[known])
+            columns.append(edge.entity_ids[known] + offset)
+        rows = np.concatenate(rows).astype(np.int64)
+        columns = np.concatenate(columns).astype(np.int64)
+
+        # One entry per (row, column), in CSR order.
+        keys = np.unique(rows * int(offsets[-1]) + columns)
+        rows, columns = np.divmod(keys, max(int(offsets[-1]), 1))
+        index_dtype = _index_dtype(max(len(keys), int(offsets[-1])))
+        indptr = np.zeros(len(movie_ids) + 1, dtype=index_dtype)
+        np.cumsum(np.bincount(rows, minlength=len(movie_ids)), out=indptr[1:])
+        indices = columns.astype(index_dtype)
+        data = cls._weigh(indptr, indices, len(movie_ids), int(offsets[-1]))
+        return cls(movie_ids, indptr, indices, data, offsets, catalog_marker)
+
+    @staticmethod
+    def _weigh(
+        indptr: np.ndarray, indices: np.ndarray, n_movies: int, n_features: int
+    ) -> np.ndarray:
+        frequency = np.bincount(indices, minlength=n_features)
+        idf = np.log((1.0 + n_movies) / (1.0 + frequency)) + 1.0
+        data = idf[indices].astype(np.float32)
+        rows = np.repeat(np.arange(n_movies), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data**2, minlength=n_movies))
+        data /= np.maximum(norms, 1e-12)[rows].astype(np.float32)
+        return data
+
+    def edges(self) -> list[FeatureEdges]:
+        """
+        Decode the matrix back into per-family edges, e.g. to rebuild the
+        index with some movies replaced.
+        """
+        movie_ids = np.repeat(self.movie_ids, np.diff(self.matrix.indptr))
+        columns = np.asarray(self.matrix.indices, dtype=np.int64)
+        family = np.searchsorted(self.offsets, columns, side="right") - 1
+        return [
+            FeatureEdges(
+                movie_ids[family == number],
+                columns[family == number] - self.offsets[number],
+            )
+            for number in range(len(FEATURE_TYPES))
+        ]
+
+    def rows_for(self, movie_ids: Iterable[int]) -> np.ndarray:
+        """
+        Matrix rows of ``movie_ids``; ids not in the index are dropped.
+        """
+        ids = np.asarray(list(movie_ids), dtype=np.int64)
+        if not len(self.movie_ids) or not len(ids):
+            return np.empty(0, dtype=np.int64)
+        rows = np.minimum(np.searchsorted(self.movie_ids, ids), len(self.movie_ids) - 1)
+        return rows[self.movie_ids[rows] == ids]
+
+    def _top_k(
+        self, queries: np.ndarray, exclude: list[np.ndarray], k: int
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Score every movie against each column of the dense ``queries``
+        (features x queries) and return the ``k`` best positive matches per
+        query, skipping that query's ``exclude`` rows.
+        """
+        scores = np.asarray(self.matrix @ queries, dtype=np.float32)
+        results = []
+        for column, excluded in enumerate(exclude):
+            column_scores = scores[:, column]
+            column_scores[excluded] = -np.inf
+            count = min(k, len(column_scores))
+            if count <= 0:
+                results.append([])
+                continue
+            best = np.argpartition(column_scores, -count)[-count:]
+            best = best[np.argsort(-column_scores[best], kind="stable")]
+            results.append(
+                [
+                    (int(self.movie_ids[row]), float(column_scores[row]))
+                    for row in best
+                    if column_scores[row] > 0
+                ]
+            )
+        return results
+
+    def similar(
+        self, movie_ids: Sequence[int], k: int = 10
+    ) -> dict[int, list[tuple[int, float]]]:
+        """
+        Top-``k`` ``(movie_id, cosine)`` neighbours of each movie, computed
+        ``QUERY_BATCH_SIZE`` movies per sparse-dense product.
+        """
+        found = {}
+        for start in range(0, len(movie_ids), QUERY_BATCH_SIZE):
+            batch = list(movie_ids[start : start + QUERY_BATCH_SIZE])
+            rows = self.rows_for(batch)
+            if not len(rows):
+                continue
+            queries = self.matrix[rows].T.toarray()
+            neighbours = self._top_k(queries, [np.array([row]) for row in rows], k)
+            for row, result in zip(rows, neighbours):
+                found[int(self.movie_ids[row])] = result
+        return {movie_id: found.get(movie_id, []) for movie_id in movie_ids}
+
+    def recommend(
+        self, owned: Sequence[Sequence[int]], k: int = 10
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Top-``k`` movies for each user, given the movies each user owns: the
+        user profile is the normalized sum of their movies' vectors, and
+        owned movies are never recommended.
+        """
+        results = []
+        for start in range(0, len(owned), QUERY_BATCH_SIZE):
+            batch = [
+                self.rows_for(ids) for ids in owned[start : start + QUERY_BATCH_SIZE]
+            ]
+            profiles = np.zeros((self.matrix.shape[1], len(batch)), dtype=np.float32)
+            for column, rows in enumerate(batch):
+                if len(rows):
+                    profile = np.asarray(self.matrix[rows].sum(axis=0)).ravel()
+                    profiles[:, column] = profile / max(np.linalg.norm(profile), 1e-12)
+            results.extend(self._top_k(profiles, batch, k))
+        return results
+
+    def save(self, path: str) -> None:
+        write_array_file(
+            path,
+            {
+                "movie_ids": self.movie_ids,
+                "indptr": self.matrix.indptr,
+                "indices": self.matrix.indices,
+                "data": self.matrix.data,
+                "offsets": self.offsets,
+            },
+            {"catalog_marker": self.catalog_marker},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "RecommendationIndex":
+        """
+        Map a saved index; its arrays stay in the shared page cache instead
+        of being copied into each worker.
+        """
+        arrays, meta = open_array_file(path)
+        return cls(catalog_marker=meta["catalog_marker"], **arrays)
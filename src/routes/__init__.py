@@ -0,0 +1,7 @@
+from src.routes.movies import router as movie_router
+from src.routes.accounts import router as accounts_router
+from src.routes.cart import router as cart_router
+from src.routes.payments import router as payments_router
+from src.routes.orders import router as orders_router
+from src.routes.media import router as media_router
+from src.routes.admin import router as admin_router
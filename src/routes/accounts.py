@@ -0,0 +1,348 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db, get_read_db
+from src.database.models.users import (
+    ActivationTokenModel,
+    PasswordResetToken,
+    UserGroupEnum,
+    UserGroupModel,
+    UserModel,
+)
+from src.database.populate import insert_for
+from src.jobs import enqueue
+from src.ratelimit import rate_limit
+from src.routes.http_cache import as_utc
+from src.schemas.accounts import (
+    ActivationRequestSchema,
+    ActivationResendRequestSchema,
+    MessageResponseSchema,
+    PasswordResetCompleteRequestSchema,
+    PasswordResetRequestSchema,
+    TokenPairResponseSchema,
+    TokenRefreshRequestSchema,
+    UserLoginRequestSchema,
+    UserRegistrationRequestSchema,
+    UserRegistrationResponseSchema,
+    UserSchema,
+)
+from src.security.access_tokens import AccessTokenClaims, access_tokens
+from src.security.dependencies import get_access_claims
+from src.security.passwords import PasswordHasherBusyError, password_hasher
+from src.security.tokens import RefreshTokenService, consume_one_time_token
+
+router = APIRouter()
+
+
+async def issue_token_pair(
+    db: AsyncSession, user_id: int, refresh_token: Optional[str] = None
+) -> TokenPairResponseSchema:
+    """
+    Load the user's group once and mint an access token for it, together
+    with ``refresh_token`` or a newly issued one. Inactive users get none.
+    """
+    row = (
+        await db.execute(
+            select(UserModel.is_active, UserGroupModel.name)
+            .join(UserGroupModel, UserModel.group_id == UserGroupModel.id)
+            .where(UserModel.id == user_id)
+        )
+    ).first()
+    service = RefreshTokenService(db)
+    if row is None or not row.is_active:
+        if refresh_token is not None:
+            await service.revoke(refresh_token)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is not active.",
+        )
+    if refresh_token is None:
+        refresh_token = await service.issue(user_id)
+    return TokenPairResponseSchema(
+        access_token=access_tokens.issue(user_id, row.name),
+        refresh_token=refresh_token,
+        expires_in=access_tokens.lifetime_seconds,
+    )
+
+
+async def hash_or_503(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, please retry shortly.",
+            headers={"Retry-After": "1"},
+        ) from None
+
+
+async def group_id(db: AsyncSession, name: UserGroupEnum) -> int:
+    await db.execute(
+        insert_for(db, UserGroupModel.__table__)
+        .values(name=name)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return (
+        await db.execute(select(UserGroupModel.id).where(UserGroupModel.name == name))
+    ).scalar_one()
+
+
+@router.post(
+    "/register/",
+    response_model=UserRegistrationResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register"))],
+)
+async def register(
+    data: UserRegistrationRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> UserRegistrationResponseSchema:
+    """
+    Create an inactive user. The activation email is sent by a background
+    job queued in the same transaction, so the response does not wait for
+    the mail server and the email is retried if delivery fails.
+    """
+    hashed_password = await hash_or_503(data.password)
+    user = UserModel(
+        email=data.email,
+        hashed_password=hashed_password,
+        group_id=await group_id(db, UserGroupEnum.USER),
+    )
+    db.add(user)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A user with the email {data.email} already exists.",
+        ) from None
+    await enqueue(db, "send_activation_email", {"user_id": user.id})
+    await db.commit()
+    return UserRegistrationResponseSchema(id=user.id, email=user.email)
+
+
+@router.post("/activate/", response_model=MessageResponseSchema)
+async def activate(
+    data: ActivationRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    user_id = await consume_one_time_token(db, ActivationTokenModel, data.token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Activation token is invalid or has expired.",
+        )
+    await db.execute(
+        update(UserModel).where(UserModel.id == user_id).values(is_active=True)
+    )
+    await db.commit()
+    return MessageResponseSchema(message="User account activated successfully.")
+
+
+@router.post(
+    "/activation/resend/",
+    response_model=MessageResponseSchema,
+    dependencies=[Depends(rate_limit("activation_resend"))],
+)
+async def resend_activation(
+    data: ActivationResendRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    """
+    Queue a new activation email for an inactive user; its token replaces
+    the previous one. Answered the same way for unknown or active emails.
+    """
+    user_id = (
+        await db.execute(
+            select(UserModel.id).where(
+                UserModel.email == data.email, UserModel.is_active.is_(False)
+            )
+        )
+    ).scalar_one_or_none()
+    if user_id is not None:
+        await enqueue(db, "send_activation_email", {"user_id": user_id})
+        await db.commit()
+    return MessageResponseSchema(
+        message="If your account awaits activation, you will receive a new email."
+    )
+
+
+@router.post(
+    "/password-reset/request/",
+    response_model=MessageResponseSchema,
+    dependencies=[Depends(rate_limit("password_reset"))],
+)
+async def request_password_reset(
+    data: PasswordResetRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    """
+    Queue a reset email for an active user. The response is the same for
+    unknown emails, so it does not reveal who has an account.
+    """
+    user_id = (
+        await db.execute(
+            select(UserModel.id).where(
+                UserModel.email == data.email, UserModel.is_active.is_(True)
+            )
+        )
+    ).scalar_one_or_none()
+    if user_id is not None:
+        await enqueue(db, "send_password_reset_email", {"user_id": user_id})
+        await db.commit()
+    return MessageResponseSchema(
+        message="If you are registered, you will receive an email with instructions."
+    )
+
+
+@router.post(
+    "/password-reset/complete/",
+    response_model=MessageResponseSchema,
+    dependencies=[Depends(rate_limit("password_reset_complete"))],
+)
+async def complete_password_reset(
+    data: PasswordResetCompleteRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    """
+    Set a new password with a reset token and sign the user out of every
+    session. The password is hashed before the token is checked, so that a
+    busy hasher does not burn the token, which is why the route is rate
+    limited like login.
+    """
+    hashed_password = await hash_or_503(data.password)
+    user_id = await consume_one_time_token(db, PasswordResetToken, data.token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Password reset token is invalid or has expired.",
+        )
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(hashed_password=hashed_password)
+    )
+    # Commits the new password together with the revocation.
+    await RefreshTokenService(db).revoke_all(user_id)
+    access_tokens.denylist.revoke_user(user_id)
+    return MessageResponseSchema(message="Password reset successfully.")
+
+
+@router.post(
+    "/login/",
+    response_model=TokenPairResponseSchema,
+    dependencies=[Depends(rate_limit("login"))],
+)
+async def login(
+    data: UserLoginRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> TokenPairResponseSchema:
+    """
+    Verify the password in the bounded hashing pool and issue a token pair.
+
+    A hash created with outdated cost parameters is replaced on success. When
+    the pool is saturated the request fails fast with 503 instead of queueing
+    behind other logins.
+    """
+    user = (
+        await db.execute(
+            select(UserModel.id, UserModel.hashed_password).where(
+                UserModel.email == data.email
+            )
+        )
+    ).first()
+    try:
+        valid, new_hash = await password_hasher.verify(
+            data.password, user.hashed_password if user else None
+        )
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, please retry shortly.",
+            headers={"Retry-After": "1"},
+        ) from None
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password.",
+        )
+    if new_hash is not None:
+        await db.execute(
+            update(UserModel)
+            .where(UserModel.id == user.id)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+    return await issue_token_pair(db, user.id)
+
+
+@router.post("/refresh/", response_model=TokenPairResponseSchema)
+async def refresh_access_token(
+    data: TokenRefreshRequestSchema,
+    db: AsyncSession = Depends(get_db),
+) -> TokenPairResponseSchema:
+    """
+    Exchange a refresh token for a new access token. The refresh token is
+    rotated: the one presented stops working and a new one is returned.
+    """
+    rotated = await RefreshTokenService(db).rotate(data.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token is invalid or has expired.",
+        )
+    user_id, refresh_token = rotated
+    return await issue_token_pair(db, user_id, refresh_token)
+
+
+@router.post("/logout/", response_model=MessageResponseSchema)
+async def logout(
+    data: TokenRefreshRequestSchema,
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    service = RefreshTokenService(db)
+    if await service.validate(data.refresh_token) == claims.user_id:
+        await service.revoke(data.refresh_token)
+    access_tokens.revoke(claims)
+    return MessageResponseSchema(message="Logged out successfully.")
+
+
+@router.post("/logout-all/", response_model=MessageResponseSchema)
+async def logout_everywhere(
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> MessageResponseSchema:
+    await RefreshTokenService(db).revoke_all(claims.user_id)
+    access_tokens.denylist.revoke_user(claims.user_id)
+    return MessageResponseSchema(message="Logged out from all sessions.")
+
+
+@router.get("/me/", response_model=UserSchema)
+async def get_current_user(
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_read_db),
+) -> UserSchema:
+    row = (
+        await db.execute(
+            select(
+                UserModel.id,
+                UserModel.email,
+                UserModel.is_active,
+                UserGroupModel.name.label("group"),
+                UserModel.created_at,
+            )
+            .join(UserGroupModel, UserModel.group_id == UserGroupModel.id)
+            .where(UserModel.id == claims.user_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
+        )
+    return UserSchema(**{**row._mapping, "created_at": as_utc(row.created_at)})
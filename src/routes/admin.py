@@ -0,0 +1,101 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from python_multipart.multipart import parse_options_header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import Cache, catalog_cache
+from src.config.dependencies import get_cache, get_settings
+from src.database import get_db, get_read_db
+from src.database.models.users import UserGroupEnum
+from src.database.search import SEARCH_CACHE_NAMESPACE
+from src.database.transfer import (
+    FORMATS,
+    export_catalog,
+    import_catalog,
+    parse_csv,
+    parse_ndjson,
+)
+from src.schemas.admin import CatalogImportResponseSchema, ImportErrorSchema
+from src.security.dependencies import require_groups
+
+router = APIRouter(dependencies=[Depends(require_groups(UserGroupEnum.ADMIN))])
+settings = get_settings()
+
+# Request content type -> body parser of the import endpoint.
+IMPORT_PARSERS = {
+    b"application/x-ndjson": parse_ndjson,
+    b"application/jsonl": parse_ndjson,
+    b"text/csv": parse_csv,
+}
+IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            content_type.decode(): {"schema": {"type": "string"}}
+            for content_type in IMPORT_PARSERS
+        },
+    }
+}
+
+
+@router.get("/catalog/export/", response_class=StreamingResponse)
+async def export_movies(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """
+    Stream every movie with its certification, genres, stars and directors,
+    page by page, in the format ``POST /catalog/import/`` accepts.
+    """
+    return StreamingResponse(
+        export_catalog(db, format, settings.CATALOG_EXPORT_PAGE_SIZE),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'},
+    )
+
+
+@router.post(
+    "/catalog/import/",
+    response_model=CatalogImportResponseSchema,
+    openapi_extra=IMPORT_OPENAPI,
+)
+async def import_movies(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+) -> CatalogImportResponseSchema:
+    """
+    Insert or update movies from an NDJSON or CSV body (by ``Content-Type``),
+    matched on name, year and duration.
+
+    The body is parsed as it arrives and written in batches, each committed
+    on its own. Invalid records are skipped and reported by line.
+    """
+    content_type, _ = parse_options_header(request.headers.get("content-type"))
+    parser = IMPORT_PARSERS.get(content_type)
+    if parser is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected an application/x-ndjson or text/csv body.",
+        )
+    try:
+        result = await import_catalog(
+            db, parser(request.stream()), settings.CATALOG_IMPORT_BATCH_SIZE
+        )
+    finally:
+        # Bulk upserts bypass the ORM events that invalidate the cache, and
+        # cached search results may miss or misrank the written movies.
+        catalog_cache.invalidate()
+        await cache.invalidate(SEARCH_CACHE_NAMESPACE)
+    return CatalogImportResponseSchema(
+        processed=result.processed,
+        imported=result.imported,
+        failed=result.failed,
+        errors=[
+            ImportErrorSchema(line=line, detail=detail)
+            for line, detail in result.errors
+        ],
+        aborted=result.aborted,
+    )
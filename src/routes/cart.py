@@ -0,0 +1,143 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db
+from src.database.models.carts import CartItemModel, CartModel
+from src.database.models.movies import MovieModel
+from src.database.populate import insert_for
+from src.orders.checkout import (
+    CheckoutService,
+    EmptyCartError,
+    MoviesAlreadyOrderedError,
+    MoviesAlreadyPurchasedError,
+)
+from src.orders.ownership import ordered_movie_ids, owned_movie_ids
+from src.ratelimit import rate_limit
+from src.schemas.orders import (
+    CartItemCreateSchema,
+    CartItemSchema,
+    CartResponseSchema,
+    OrderPlacedResponseSchema,
+)
+from src.security.access_tokens import AccessTokenClaims
+from src.security.dependencies import get_access_claims
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CartResponseSchema)
+async def get_cart(
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> CartResponseSchema:
+    rows = await db.execute(
+        select(
+            CartItemModel.movie_id,
+            MovieModel.name,
+            MovieModel.price,
+            CartItemModel.added_at,
+        )
+        .join(CartModel, CartModel.id == CartItemModel.cart_id)
+        .join(MovieModel, MovieModel.id == CartItemModel.movie_id)
+        .where(CartModel.user_id == claims.user_id)
+        .order_by(CartItemModel.added_at, CartItemModel.id)
+    )
+    items = [CartItemSchema(**row._mapping) for row in rows]
+    return CartResponseSchema(
+        items=items, total_amount=sum((item.price for item in items), Decimal(0))
+    )
+
+
+@router.post("/items/", status_code=status.HTTP_201_CREATED)
+async def add_cart_item(
+    data: CartItemCreateSchema,
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Add a movie to the cart, creating the cart on first use. Adding a movie
+    that is already in the cart is a no-op; one the user owns or has in a
+    pending order is refused.
+    """
+    if await owned_movie_ids(db, claims.user_id, [data.movie_id]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="You have already purchased this movie.",
+        )
+    if await ordered_movie_ids(db, claims.user_id, [data.movie_id]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This movie is already in an order awaiting payment.",
+        )
+    if await db.scalar(select(MovieModel.id).where(MovieModel.id == data.movie_id)):
+        await db.execute(
+            insert_for(db, CartModel.__table__)
+            .values(user_id=claims.user_id)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        await db.execute(
+            insert_for(db, CartItemModel.__table__)
+            .from_select(
+                ["cart_id", "movie_id"],
+                select(CartModel.id, literal(data.movie_id)).where(
+                    CartModel.user_id == claims.user_id
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=["cart_id", "movie_id"])
+        )
+        await db.commit()
+        return Response(status_code=status.HTTP_201_CREATED)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Movie with the given ID was not found.",
+    )
+
+
+@router.delete("/items/{movie_id}/", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_cart_item(
+    movie_id: int,
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    await db.execute(
+        delete(CartItemModel).where(
+            CartItemModel.movie_id == movie_id,
+            CartItemModel.cart_id.in_(
+                select(CartModel.id).where(CartModel.user_id == claims.user_id)
+            ),
+        )
+    )
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/checkout/",
+    response_model=OrderPlacedResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("checkout"))],
+)
+async def checkout(
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> OrderPlacedResponseSchema:
+    """
+    Turn the cart into a pending order with a fixed number of statements.
+    """
+    try:
+        order = await CheckoutService(db).checkout(claims.user_id)
+    except EmptyCartError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+    except (MoviesAlreadyPurchasedError, MoviesAlreadyOrderedError) as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(error), "movie_ids": error.movie_ids},
+        )
+    return OrderPlacedResponseSchema(
+        order_id=order.id,
+        total_amount=order.total_amount,
+        item_count=order.item_count,
+    )
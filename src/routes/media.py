@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db
+from src.database.models.movies import MovieModel
+from src.database.models.users import UserGroupEnum, UserProfileModel
+from src.database.populate import insert_for
+from src.media import (
+    PROFILES,
+    ImageProcessorBusyError,
+    InvalidImageError,
+    UploadError,
+    UploadTooLargeError,
+    media_storage,
+)
+from src.routes.http_cache import is_not_modified, not_modified
+from src.schemas.media import ImageUploadResponseSchema
+from src.security.access_tokens import AccessTokenClaims
+from src.security.dependencies import get_access_claims, require_groups
+
+router = APIRouter()
+
+# Renditions never change once written, so clients may keep them forever.
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# The body is streamed from the request, so document the form for OpenAPI.
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+async def store_image(request: Request, profile: str) -> str:
+    try:
+        return await media_storage.store(request, profile)
+    except UploadTooLargeError as error:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(error)
+        ) from None
+    except (UploadError, InvalidImageError) as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(error)
+        ) from None
+    except ImageProcessorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many images are being processed, please retry shortly.",
+        ) from None
+
+
+def upload_response(request: Request, key: str) -> ImageUploadResponseSchema:
+    profile, digest = key.split("/")
+    return ImageUploadResponseSchema(
+        key=key,
+        urls={
+            name: str(
+                request.url_for("get_image", profile=profile, digest=digest, name=name)
+            )
+            for name in PROFILES[profile].file_names()
+        },
+    )
+
+
+@router.put(
+    "/avatar/",
+    response_model=ImageUploadResponseSchema,
+    openapi_extra=UPLOAD_OPENAPI,
+)
+async def upload_avatar(
+    request: Request,
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+) -> ImageUploadResponseSchema:
+    """
+    Set the user's avatar from the ``file`` form field (JPEG, PNG, WebP or
+    GIF), creating the profile if needed.
+    """
+    key = await store_image(request, "avatars")
+    stmt = insert_for(db, UserProfileModel.__table__).values(
+        user_id=claims.user_id, avatar=key
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"], set_={"avatar": stmt.excluded.avatar}
+        )
+    )
+    await db.commit()
+    return upload_response(request, key)
+
+
+@router.put(
+    "/movies/{movie_id}/poster/",
+    response_model=ImageUploadResponseSchema,
+    openapi_extra=UPLOAD_OPENAPI,
+)
+async def upload_poster(
+    movie_id: int,
+    request: Request,
+    claims: AccessTokenClaims = Depends(
+        require_groups(UserGroupEnum.MODERATOR, UserGroupEnum.ADMIN)
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> ImageUploadResponseSchema:
+    """
+    Set a movie's poster. Goes through the ORM so the movie's version, and
+    with it the catalog ETags, changes.
+    """
+    # Look the movie up first so an unknown ID never leaves files behind.
+    movie = await db.get(MovieModel, movie_id)
+    if movie is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie with the given ID was not found.",
+        )
+    key = await store_image(request, "posters")
+    movie.poster = key
+    await db.commit()
+    return upload_response(request, key)
+
+
+@router.get("/{profile}/{digest}/{name}", name="get_image")
+async def get_image(
+    request: Request,
+    profile: str,
+    digest: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    name: str = Path(...),
+) -> Response:
+    """
+    One rendition, e.g. ``/posters/<sha256>/320.webp``, served with
+    immutable caching headers; its URL changes whenever the image does.
+    """
+    path = media_storage.file_path(profile, digest, name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Image not found."
+        )
+    etag = f'"{digest}-{name}"'
+    if is_not_modified(request, etag):
+        return not_modified(etag, None, IMMUTABLE_MAX_AGE)
+    return FileResponse(
+        path,
+        headers={
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={IMMUTABLE_MAX_AGE}, immutable",
+        },
+    )
@@ -0,0 +1,509 @@
+from typing import Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.cache import Cache, catalog_cache
+from src.cache.catalog_snapshot import CatalogSnapshot, catalog_snapshot
+from src.config.dependencies import get_cache, get_settings
+from src.database.models.movies import (
+    MovieModel,
+    MovieStatsModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarsMoviesModel,
+)
+from src.database.models.orders import PurchasedMovieModel
+from src.database.movie_items import load_movie_items
+from src.database.search import SEARCH_CACHE_NAMESPACE, search_movie_ids
+from src.database import get_read_db
+from src.orders.ownership import owned_movie_ids
+from src.orders.popularity import current_trending_score
+from src.recommendations import RecommendationIndex, recommendation_engine
+from src.routes.http_cache import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from src.routes.responses import respond
+from src.schemas.movies import (
+    CertificationSchema,
+    GenreWithCountSchema,
+    MovieDetailSchema,
+    MovieListResponseSchema,
+    MovieSearchResponseSchema,
+    RankedMovieSchema,
+    ScoredMovieSchema,
+    ScoredMoviesResponseSchema,
+    TopMoviesResponseSchema,
+)
+from src.security.access_tokens import AccessTokenClaims
+from src.security.dependencies import get_access_claims
+
+router = APIRouter()
+settings = get_settings()
+
+# Recommendations are based on the user's most recently bought movies only.
+RECOMMENDATION_PROFILE_SIZE = 200
+
+# Every page costs exactly five statements: the movies themselves plus one
+# ``IN (...)`` batch per relationship, regardless of the page size.
+MOVIE_LOAD_OPTIONS = (
+    selectinload(MovieModel.certification),
+    selectinload(MovieModel.genres),
+    selectinload(MovieModel.stars),
+    selectinload(MovieModel.directors),
+)
+
+
+def apply_movie_filters(
+    stmt: Select,
+    year: Optional[int] = None,
+    imdb_min: Optional[float] = None,
+    imdb_max: Optional[float] = None,
+    genre_id: Optional[int] = None,
+    star_id: Optional[int] = None,
+    director_id: Optional[int] = None,
+    certification_id: Optional[int] = None,
+) -> Select:
+    if year is not None:
+        stmt = stmt.where(MovieModel.year == year)
+    if imdb_min is not None:
+        stmt = stmt.where(MovieModel.imdb >= imdb_min)
+    if imdb_max is not None:
+        stmt = stmt.where(MovieModel.imdb <= imdb_max)
+    # Relationship filters are expressed as ``id IN (subquery)`` rather than
+    # ``EXISTS`` so the planner drives them from the reverse association
+    # indexes instead of probing every movie.
+    if genre_id is not None:
+        stmt = stmt.where(
+            MovieModel.id.in_(
+                select(MoviesGenresModel.c.movie_id).where(
+                    MoviesGenresModel.c.genre_id == genre_id
+                )
+            )
+        )
+    if star_id is not None:
+        stmt = stmt.where(
+            MovieModel.id.in_(
+                select(StarsMoviesModel.c.movie_id).where(
+                    StarsMoviesModel.c.star_id == star_id
+                )
+            )
+        )
+    if director_id is not None:
+        stmt = stmt.where(
+            MovieModel.id.in_(
+                select(MoviesDirectorsModel.c.movie_id).where(
+                    MoviesDirectorsModel.c.director_id == director_id
+                )
+            )
+        )
+    if certification_id is not None:
+        stmt = stmt.where(MovieModel.certification_id == certification_id)
+    return stmt
+
+
+async def resolve_filter_ids(
+    db: AsyncSession,
+    genre: Optional[str] = None,
+    star: Optional[str] = None,
+    director: Optional[str] = None,
+    certification: Optional[str] = None,
+) -> Optional[dict[str, int]]:
+    """
+    Translate name filters into ids through the catalog cache. Returns None
+    when any requested name does not exist, i.e. the result is empty.
+    """
+    lookups = {
+        "genre_id": (genre, catalog_cache.genre_id),
+        "star_id": (star, catalog_cache.star_id),
+        "director_id": (director, catalog_cache.director_id),
+        "certification_id": (certification, catalog_cache.certification_id),
+    }
+    ids = {}
+    for key, (name, lookup) in lookups.items():
+        if not name:
+            continue
+        ids[key] = await lookup(db, name)
+        if ids[key] is None:
+            return None
+    return ids
+
+
+def list_movies_from_snapshot(
+    snapshot: CatalogSnapshot,
+    request: Request,
+    response: Response,
+    cursor: Optional[int],
+    limit: int,
+    year: Optional[int],
+    imdb_min: Optional[float],
+    imdb_max: Optional[float],
+    names: dict[str, Optional[str]],
+) -> Union[MovieListResponseSchema, Response]:
+    filter_ids = {}
+    for kind, name in names.items():
+        if not name:
+            continue
+        filter_ids[f"{kind}_id"] = snapshot.entity_id(kind, name)
+        if filter_ids[f"{kind}_id"] is None:
+            return MovieListResponseSchema(movies=[], next_cursor=None, limit=limit)
+
+    rows = snapshot.movie_rows(
+        cursor, limit + 1, year, imdb_min, imdb_max, **filter_ids
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = int(snapshot.movie_ids[rows[-1]])
+
+    etag = make_etag(snapshot.versions(rows))
+    last_modified = snapshot.last_modified(rows)
+    max_age = settings.MOVIE_CACHE_MAX_AGE
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, max_age)
+    set_cache_headers(response, etag, last_modified, max_age)
+    return respond(
+        {
+            "movies": [snapshot.list_item(row) for row in rows.tolist()],
+            "next_cursor": next_cursor,
+            "limit": limit,
+        },
+        MovieListResponseSchema,
+        response,
+    )
+
+
+@router.get("/", response_model=MovieListResponseSchema)
+async def get_movie_list(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(
+        None, ge=1, description="`next_cursor` value from the previous page."
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    year: Optional[int] = Query(None),
+    imdb_min: Optional[float] = Query(None, ge=0, le=10),
+    imdb_max: Optional[float] = Query(None, ge=0, le=10),
+    genre: Optional[str] = Query(None),
+    star: Optional[str] = Query(None),
+    director: Optional[str] = Query(None),
+    certification: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+) -> Union[MovieListResponseSchema, Response]:
+    """
+    List movies newest first using keyset pagination on ``id``.
+
+    Pages are addressed by the last seen id instead of an OFFSET, so fetching
+    a deep page is a primary key range scan and costs the same as the first.
+
+    The page is first resolved to ``(id, version, updated_at)`` rows only;
+    its ETag covers those versions, so a matching ``If-None-Match`` is
+    answered with 304 before any movie graph is loaded.
+
+    While the catalog snapshot is enabled the same page is filtered and
+    built from its memory-mapped arrays instead, without a database query.
+    """
+    snapshot = (
+        catalog_snapshot.get()
+        if settings.CATALOG_SNAPSHOT_REFRESH_INTERVAL > 0
+        else None
+    )
+    if snapshot is not None:
+        return list_movies_from_snapshot(
+            snapshot,
+            request,
+            response,
+            cursor,
+            limit,
+            year,
+            imdb_min,
+            imdb_max,
+            {
+                "genre": genre,
+                "star": star,
+                "director": director,
+                "certification": certification,
+            },
+        )
+
+    filter_ids = await resolve_filter_ids(db, genre, star, director, certification)
+    if filter_ids is None:
+        return MovieListResponseSchema(movies=[], next_cursor=None, limit=limit)
+
+    stmt = select(MovieModel.id, MovieModel.version, MovieModel.updated_at)
+    stmt = apply_movie_filters(stmt, year, imdb_min, imdb_max, **filter_ids)
+    if cursor is not None:
+        stmt = stmt.where(MovieModel.id < cursor)
+    stmt = stmt.order_by(*MovieModel.default_order_by()).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+
+    etag = make_etag([(row.id, row.version) for row in rows])
+    last_modified = max((row.updated_at for row in rows), default=None)
+    max_age = settings.MOVIE_CACHE_MAX_AGE
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, max_age)
+    set_cache_headers(response, etag, last_modified, max_age)
+
+    items = await load_movie_items(db, [row.id for row in rows])
+    return respond(
+        {
+            "movies": [items[row.id] for row in rows if row.id in items],
+            "next_cursor": next_cursor,
+            "limit": limit,
+        },
+        MovieListResponseSchema,
+        response,
+    )
+
+
+@router.get("/genres/", response_model=list[GenreWithCountSchema])
+async def get_genres(
+    db: AsyncSession = Depends(get_read_db),
+) -> list[GenreWithCountSchema]:
+    rows = await catalog_cache.genres_with_counts(db)
+    return [
+        GenreWithCountSchema(id=id_, name=name, movies_count=count)
+        for id_, name, count in rows
+    ]
+
+
+@router.get("/certifications/", response_model=list[CertificationSchema])
+async def get_certifications(
+    db: AsyncSession = Depends(get_read_db),
+) -> list[CertificationSchema]:
+    rows = await catalog_cache.certifications(db)
+    return [CertificationSchema(id=id_, name=name) for id_, name in rows]
+
+
+@router.get("/search/", response_model=MovieSearchResponseSchema)
+async def search_movies(
+    q: str = Query(..., min_length=2, max_length=200),
+    page: int = Query(1, ge=1, le=50),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+) -> Union[MovieSearchResponseSchema, Response]:
+    """
+    Ranked full-text search over titles, descriptions, stars and directors.
+
+    Ranked id lists are kept in the shared cache for ``SEARCH_CACHE_TTL``
+    seconds, or until a catalog import or seeding invalidates them, so popular
+    queries are ranked once across all workers; the movies themselves are
+    always loaded fresh.
+    """
+    offset = (page - 1) * limit
+    ids = await cache.get_or_set(
+        SEARCH_CACHE_NAMESPACE,
+        f"{limit + 1}:{offset}:{q.strip().lower()}",
+        lambda: search_movie_ids(db, q, limit=limit + 1, offset=offset),
+        ttl=settings.SEARCH_CACHE_TTL,
+    )
+    next_page = page + 1 if len(ids) > limit else None
+    ids = ids[:limit]
+
+    items = await load_movie_items(db, ids)
+    return respond(
+        {
+            "movies": [items[movie_id] for movie_id in ids if movie_id in items],
+            "page": page,
+            "next_page": next_page,
+            "limit": limit,
+        },
+        MovieSearchResponseSchema,
+    )
+
+
+@router.get("/top/", response_model=TopMoviesResponseSchema)
+async def get_top_movies(
+    by: Literal["popular", "trending"] = Query("popular"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> TopMoviesResponseSchema:
+    """
+    Most purchased (``popular``) or currently trending movies.
+
+    Served from ``movie_stats``: the ranking is a backward scan of one of its
+    ``(score, movie_id)`` indexes, followed by the usual batched graph load
+    for just the ``limit`` movies.
+    """
+    score = (
+        MovieStatsModel.purchase_count
+        if by == "popular"
+        else MovieStatsModel.trending_score
+    )
+    ranking = (
+        await db.execute(
+            select(
+                MovieStatsModel.movie_id,
+                MovieStatsModel.purchase_count,
+                MovieStatsModel.purchases_30d,
+                MovieStatsModel.trending_score,
+            )
+            .where(score > 0)
+            .order_by(score.desc(), MovieStatsModel.movie_id.desc())
+            .limit(limit)
+        )
+    ).all()
+
+    movies = {}
+    if ranking:
+        result = await db.execute(
+            select(MovieModel)
+            .where(MovieModel.id.in_([row.movie_id for row in ranking]))
+            .options(*MOVIE_LOAD_OPTIONS)
+        )
+        movies = {movie.id: movie for movie in result.scalars()}
+
+    half_life = settings.MOVIE_TRENDING_HALF_LIFE_DAYS
+    return TopMoviesResponseSchema(
+        by=by,
+        movies=[
+            RankedMovieSchema(
+                movie=movies[row.movie_id],
+                purchase_count=row.purchase_count,
+                purchases_30d=row.purchases_30d,
+                trending_score=current_trending_score(row.trending_score, half_life),
+            )
+            for row in ranking
+            if row.movie_id in movies
+        ],
+    )
+
+
+def get_recommendation_index() -> RecommendationIndex:
+    index = recommendation_engine.get()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendations are not available yet.",
+        )
+    return index
+
+
+async def load_scored_movies(
+    db: AsyncSession, scored: list[tuple[int, float]]
+) -> ScoredMoviesResponseSchema:
+    movies = {}
+    if scored:
+        result = await db.execute(
+            select(MovieModel)
+            .where(MovieModel.id.in_([movie_id for movie_id, _ in scored]))
+            .options(*MOVIE_LOAD_OPTIONS)
+        )
+        movies = {movie.id: movie for movie in result.scalars()}
+    return ScoredMoviesResponseSchema(
+        movies=[
+            ScoredMovieSchema(movie=movies[movie_id], score=score)
+            for movie_id, score in scored
+            if movie_id in movies
+        ]
+    )
+
+
+@router.get("/recommended/", response_model=ScoredMoviesResponseSchema)
+async def get_recommended_movies(
+    limit: int = Query(10, ge=1, le=50),
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    index: RecommendationIndex = Depends(get_recommendation_index),
+    db: AsyncSession = Depends(get_read_db),
+) -> ScoredMoviesResponseSchema:
+    """
+    Movies closest to the ones the user bought, by shared genres, stars and
+    directors; movies the user owns are left out. Empty until the user has
+    bought something.
+    """
+    owned = list(
+        await db.scalars(
+            select(PurchasedMovieModel.movie_id)
+            .where(PurchasedMovieModel.user_id == claims.user_id)
+            .order_by(PurchasedMovieModel.acquired_at.desc())
+            .limit(RECOMMENDATION_PROFILE_SIZE)
+        )
+    )
+    if not owned:
+        return ScoredMoviesResponseSchema(movies=[])
+    if len(owned) < RECOMMENDATION_PROFILE_SIZE:
+        [scored] = index.recommend([owned], limit)
+        return await load_scored_movies(db, scored)
+    # Purchases older than the profile must not be recommended either.
+    [scored] = index.recommend([owned], limit + RECOMMENDATION_PROFILE_SIZE)
+    already_owned = await owned_movie_ids(
+        db, claims.user_id, [movie_id for movie_id, _ in scored]
+    )
+    return await load_scored_movies(
+        db, [entry for entry in scored if entry[0] not in already_owned][:limit]
+    )
+
+
+@router.get("/{movie_id}/similar/", response_model=ScoredMoviesResponseSchema)
+async def get_similar_movies(
+    movie_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    index: RecommendationIndex = Depends(get_recommendation_index),
+    db: AsyncSession = Depends(get_read_db),
+) -> ScoredMoviesResponseSchema:
+    """
+    Movies sharing the most (and rarest) genres, stars and directors with
+    the given one, ranked by cosine similarity from the shared index. Movies
+    added since the last index refresh have no neighbours yet.
+    """
+    scored = index.similar([movie_id], limit)[movie_id]
+    return await load_scored_movies(db, scored)
+
+
+@router.get("/{movie_id}/", response_model=MovieDetailSchema)
+async def get_movie_by_id(
+    movie_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+) -> Union[MovieDetailSchema, Response]:
+    """
+    Movie detail with ``ETag``/``Last-Modified`` validators.
+
+    Only the version marker is read before the conditional check, so a
+    revalidation that hits costs one primary key lookup.
+    """
+    marker = (
+        await db.execute(
+            select(MovieModel.version, MovieModel.updated_at).where(
+                MovieModel.id == movie_id
+            )
+        )
+    ).first()
+
+    if not marker:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie with the given ID was not found.",
+        )
+
+    etag = make_etag([(movie_id, marker.version)])
+    max_age = settings.MOVIE_CACHE_MAX_AGE
+    if is_not_modified(request, etag, marker.updated_at):
+        return not_modified(etag, marker.updated_at, max_age)
+    set_cache_headers(response, etag, marker.updated_at, max_age)
+
+    stmt = (
+        select(MovieModel).where(MovieModel.id == movie_id).options(*MOVIE_LOAD_OPTIONS)
+    )
+    result = await db.execute(stmt)
+    movie = result.scalars().first()
+
+    if not movie:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie with the given ID was not found.",
+        )
+
+    return MovieDetailSchema.model_validate(movie)
@@ -0,0 +1,96 @@
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_read_db
+from src.database.models.movies import MovieModel
+from src.database.models.orders import OrderItemModel, OrderModel
+from src.orders.ownership import owned_movie_ids
+from src.routes.http_cache import as_utc
+from src.routes.responses import respond
+from src.schemas.orders import OrderListResponseSchema, OwnedMoviesResponseSchema
+from src.security.access_tokens import AccessTokenClaims
+from src.security.dependencies import get_access_claims
+
+router = APIRouter()
+
+OWNERSHIP_LOOKUP_LIMIT = 50
+
+
+@router.get("/", response_model=OrderListResponseSchema)
+async def get_orders(
+    cursor: Optional[int] = Query(
+        None, ge=1, description="`next_cursor` value from the previous page."
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_read_db),
+) -> Union[OrderListResponseSchema, Response]:
+    """
+    The user's orders newest first with their items, keyset paginated on
+    ``id``: two statements per page whatever its size.
+    """
+    stmt = select(
+        OrderModel.id,
+        OrderModel.created_at,
+        OrderModel.status,
+        OrderModel.total_amount,
+    ).where(OrderModel.user_id == claims.user_id)
+    if cursor is not None:
+        stmt = stmt.where(OrderModel.id < cursor)
+    rows = (
+        await db.execute(stmt.order_by(OrderModel.id.desc()).limit(limit + 1))
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+
+    orders = {
+        row.id: {
+            "id": row.id,
+            "created_at": as_utc(row.created_at),
+            "status": row.status,
+            "total_amount": row.total_amount,
+            "items": [],
+        }
+        for row in rows
+    }
+    if orders:
+        items = await db.execute(
+            select(
+                OrderItemModel.order_id,
+                OrderItemModel.movie_id,
+                MovieModel.name,
+                OrderItemModel.price_at_order,
+            )
+            .join(MovieModel, MovieModel.id == OrderItemModel.movie_id)
+            .where(OrderItemModel.order_id.in_(list(orders)))
+            .order_by(OrderItemModel.order_id, OrderItemModel.id)
+        )
+        for order_id, movie_id, name, price in items:
+            orders[order_id]["items"].append(
+                {"movie_id": movie_id, "name": name, "price": price}
+            )
+
+    return respond(
+        {"orders": list(orders.values()), "next_cursor": next_cursor, "limit": limit},
+        OrderListResponseSchema,
+    )
+
+
+@router.get("/owned/", response_model=OwnedMoviesResponseSchema)
+async def get_owned_movies(
+    movie_id: list[int] = Query(..., max_length=OWNERSHIP_LOOKUP_LIMIT),
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_read_db),
+) -> OwnedMoviesResponseSchema:
+    """
+    Which of the given movies (``?movie_id=1&movie_id=2...``, up to 50) the
+    user owns, answered with a single primary key lookup.
+    """
+    owned = await owned_movie_ids(db, claims.user_id, movie_id)
+    return OwnedMoviesResponseSchema(movie_ids=sorted(owned))
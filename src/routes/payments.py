@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.dependencies import get_payment_provider, get_settings
+from src.database import get_db
+from src.payments.provider import (
+    SIGNATURE_HEADER,
+    InvalidSignatureError,
+    PaymentProviderClient,
+    PaymentProviderError,
+    verify_signature,
+)
+from src.payments.service import (
+    OrderNotFoundError,
+    OrderNotPayableError,
+    PaymentNotReadyError,
+    PaymentService,
+)
+from src.schemas.payments import (
+    PaymentCreateSchema,
+    PaymentResponseSchema,
+    WebhookAckSchema,
+    WebhookEventSchema,
+)
+from src.security.access_tokens import AccessTokenClaims
+from src.security.dependencies import get_access_claims
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.post(
+    "/",
+    response_model=PaymentResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_payment(
+    data: PaymentCreateSchema,
+    claims: AccessTokenClaims = Depends(get_access_claims),
+    db: AsyncSession = Depends(get_db),
+    provider: PaymentProviderClient = Depends(get_payment_provider),
+) -> PaymentResponseSchema:
+    """
+    Start paying for a pending order. Repeating the request returns the same
+    pending payment instead of creating another one.
+    """
+    try:
+        payment = await PaymentService(db, provider).start_payment(
+            claims.user_id, data.order_id
+        )
+    except OrderNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
+    except OrderNotPayableError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+    except PaymentProviderError as error:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(error))
+    return PaymentResponseSchema(**payment.__dict__)
+
+
+@router.post("/webhook/", response_model=WebhookAckSchema)
+async def payment_webhook(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    provider: PaymentProviderClient = Depends(get_payment_provider),
+) -> WebhookAckSchema:
+    """
+    Receive a signed provider event. Redeliveries of an event are
+    acknowledged with ``duplicate: true`` and change nothing. An event for a
+    payment that is not (yet) in the status it applies to is refused with a
+    409, so the provider delivers it again later.
+    """
+    payload = await request.body()
+    try:
+        verify_signature(
+            settings.PAYMENT_WEBHOOK_SECRET,
+            payload,
+            request.headers.get(SIGNATURE_HEADER),
+            settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS,
+        )
+        event = WebhookEventSchema.model_validate_json(payload)
+    except InvalidSignatureError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed event payload.",
+        )
+    try:
+        applied = await PaymentService(db, provider).handle_event(
+            event.id, event.type, event.data.payment_id
+        )
+    except PaymentNotReadyError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+    return WebhookAckSchema(duplicate=not applied)
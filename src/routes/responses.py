@@ -0,0 +1,100 @@
+"""
+JSON responses encoded straight from plain dicts and lists.
+
+Routes returning a pydantic model pay for it twice: the model is built
+(and validated) from the loaded rows, then FastAPI validates and
+serializes it again against the route's ``response_model``. Hot listing
+routes instead build their payload as dicts already in the schema's shape
+and hand it to :func:`respond`, which encodes it in one pass. The
+``response_model`` stays declared for the OpenAPI schema.
+"""
+
+import enum
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.config.dependencies import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+settings = get_settings()
+
+
+def _default(value: Any) -> Any:
+    # The representations pydantic uses in JSON mode, so both encoders
+    # produce the same documents.
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, with orjson when it is installed (the ``fast-json``
+    extra) and the standard library otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    :class:`JSONResponse` rendered with :func:`dumps`; besides what the
+    standard encoder accepts it takes ``Decimal``, ``datetime`` and enum
+    values, encoded the way pydantic would.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json_response(
+    content: Any, response: Optional[Response] = None
+) -> FastJSONResponse:
+    """
+    ``content`` as a :class:`FastJSONResponse`, carrying the headers the
+    endpoint set on its injected ``response`` (e.g. cache validators), which
+    FastAPI only applies to responses it builds itself.
+    """
+    fast = FastJSONResponse(content)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name not in ("content-length", "content-type"):
+                fast.headers.append(name, value)
+    return fast
+
+
+def respond(
+    content: dict[str, Any],
+    schema: type[BaseModel],
+    response: Optional[Response] = None,
+) -> Union[BaseModel, Response]:
+    """
+    A route's payload, already shaped like ``schema``: encoded directly
+    while ``FAST_JSON_RESPONSES`` is on, otherwise validated into ``schema``
+    and left to FastAPI's own serialization.
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(content, response)
+    return schema.model_validate(content)
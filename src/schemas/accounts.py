@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from src.database.models.users import UserGroupEnum
+
+
+class UserLoginRequestSchema(BaseModel):
+    email: str
+    password: str
+
+
+class TokenRefreshRequestSchema(BaseModel):
+    refresh_token: str
+
+
+class TokenPairResponseSchema(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class MessageResponseSchema(BaseModel):
+    message: str
+
+
+class UserRegistrationRequestSchema(BaseModel):
+    email: str
+    password: str = Field(min_length=8)
+
+
+class UserRegistrationResponseSchema(BaseModel):
+    id: int
+    email: str
+
+
+class UserSchema(BaseModel):
+    id: int
+    email: str
+    is_active: bool
+    group: UserGroupEnum
+    created_at: datetime
+
+
+class ActivationRequestSchema(BaseModel):
+    token: str
+
+
+class ActivationResendRequestSchema(BaseModel):
+    email: str
+
+
+class PasswordResetRequestSchema(BaseModel):
+    email: str
+
+
+class PasswordResetCompleteRequestSchema(BaseModel):
+    token: str
+    password: str = Field(min_length=8)
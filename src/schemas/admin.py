@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class ImportErrorSchema(BaseModel):
+    line: int
+    detail: str
+
+
+class CatalogImportResponseSchema(BaseModel):
+    processed: int
+    imported: int
+    failed: int
+    # The first failed records only; ``failed`` counts all of them.
+    errors: list[ImportErrorSchema]
+    aborted: bool
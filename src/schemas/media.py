@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class ImageUploadResponseSchema(BaseModel):
+    key: str
+    # Rendition file name (e.g. "128.webp") -> URL.
+    urls: dict[str, str]
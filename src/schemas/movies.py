@@ -0,0 +1,93 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class GenreSchema(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GenreWithCountSchema(GenreSchema):
+    movies_count: int
+
+
+class StarSchema(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DirectorSchema(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CertificationSchema(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MovieListItemSchema(BaseModel):
+    id: int
+    name: str
+    year: int
+    time: int
+    imdb: float
+    price: Decimal
+    certification: CertificationSchema
+    genres: list[GenreSchema]
+    stars: list[StarSchema]
+    directors: list[DirectorSchema]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MovieDetailSchema(MovieListItemSchema):
+    votes: int
+    meta_score: Optional[float]
+    gross: Optional[float]
+    description: str
+    poster: Optional[str] = None
+
+
+class MovieListResponseSchema(BaseModel):
+    movies: list[MovieListItemSchema]
+    next_cursor: Optional[int] = None
+    limit: int
+
+
+class MovieSearchResponseSchema(BaseModel):
+    movies: list[MovieListItemSchema]
+    page: int
+    next_page: Optional[int] = None
+    limit: int
+
+
+class RankedMovieSchema(BaseModel):
+    movie: MovieListItemSchema
+    purchase_count: int
+    purchases_30d: int
+    trending_score: float
+
+
+class TopMoviesResponseSchema(BaseModel):
+    by: str
+    movies: list[RankedMovieSchema]
+
+
+class ScoredMovieSchema(BaseModel):
+    movie: MovieListItemSchema
+    score: float
+
+
+class ScoredMoviesResponseSchema(BaseModel):
+    movies: list[ScoredMovieSchema]
@@ -0,0 +1,53 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.database.models.orders import OrderStatusEnum
+
+
+class CartItemCreateSchema(BaseModel):
+    movie_id: int
+
+
+class CartItemSchema(BaseModel):
+    movie_id: int
+    name: str
+    price: Decimal
+    added_at: datetime
+
+
+class CartResponseSchema(BaseModel):
+    items: list[CartItemSchema]
+    total_amount: Decimal
+
+
+class OrderPlacedResponseSchema(BaseModel):
+    order_id: int
+    total_amount: Decimal
+    item_count: int
+
+
+class OwnedMoviesResponseSchema(BaseModel):
+    movie_ids: list[int]
+
+
+class OrderItemSchema(BaseModel):
+    movie_id: int
+    name: str
+    price: Decimal
+
+
+class OrderSchema(BaseModel):
+    id: int
+    created_at: datetime
+    status: OrderStatusEnum
+    total_amount: Optional[Decimal] = None
+    items: list[OrderItemSchema]
+
+
+class OrderListResponseSchema(BaseModel):
+    orders: list[OrderSchema]
+    next_cursor: Optional[int] = None
+    limit: int
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from src.database.models.payments import PaymentStatusEnum
+
+
+class PaymentCreateSchema(BaseModel):
+    order_id: int
+
+
+class PaymentResponseSchema(BaseModel):
+    id: int
+    order_id: int
+    external_payment_id: str
+    amount: Decimal
+    status: PaymentStatusEnum
+
+
+class WebhookEventDataSchema(BaseModel):
+    payment_id: str
+
+
+class WebhookEventSchema(BaseModel):
+    id: str
+    type: str
+    data: WebhookEventDataSchema
+
+
+class WebhookAckSchema(BaseModel):
+    duplicate: bool
@@ -0,0 +1,19 @@
+from src.security.tokens import (
+    RefreshTokenService,
+    consume_one_time_token,
+    hash_token,
+    issue_one_time_token,
+    refresh_token_cache,
+)
+from src.security.purge import purge_expired_tokens
+from src.security.access_tokens import (
+    AccessTokenClaims,
+    AccessTokenManager,
+    InvalidTokenError,
+    access_tokens,
+)
+from src.security.passwords import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    password_hasher,
+)
@@ -0,0 +1,210 @@
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from src.config.dependencies import get_settings
+from src.database.models.users import UserGroupEnum
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class SigningKey:
+    """
+    HS256 key with its HMAC state prepared once.
+
+    ``hmac.new`` derives the inner and outer padded keys on construction;
+    signing copies that state instead of redoing the work per token. The
+    encoded JWT header naming this key is precomputed as well.
+    """
+
+    def __init__(self, secret: str) -> None:
+        secret_bytes = secret.encode()
+        self.kid = hashlib.sha256(secret_bytes).hexdigest()[:12]
+        self._mac = hmac.new(secret_bytes, digestmod=hashlib.sha256)
+        header = {"alg": "HS256", "typ": "JWT", "kid": self.kid}
+        self.header_segment = b64url_encode(
+            json.dumps(header, separators=(",", ":")).encode()
+        )
+
+    def sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+
+class KeyRing:
+    """
+    The active signing key plus retired keys still accepted for verification,
+    indexed by their encoded header so a token's key is found without
+    decoding the header.
+    """
+
+    def __init__(self, active: str, previous: Iterable[str] = ()) -> None:
+        self.active = SigningKey(active)
+        self._by_header = {self.active.header_segment: self.active}
+        for secret in previous:
+            key = SigningKey(secret)
+            self._by_header.setdefault(key.header_segment, key)
+
+    def for_header(self, header_segment: bytes) -> Optional[SigningKey]:
+        return self._by_header.get(header_segment)
+
+
+class Denylist:
+    """
+    In-memory revocation state for access tokens.
+
+    Revoked token ids are kept as 16-byte keys only until the token would
+    have expired anyway, so the structure stays as small as the number of
+    revocations inside one access token lifetime. ``revoke_user`` rejects
+    every token of a user issued before a point in time (logout everywhere,
+    password change, deactivation) with a single entry, kept for one
+    ``lifetime_seconds``; tokens issued later, even within the same second,
+    stay valid.
+    """
+
+    def __init__(self, lifetime_seconds: int) -> None:
+        self.lifetime_seconds = lifetime_seconds
+        self._tokens: dict[bytes, int] = {}
+        self._expiry_heap: list[tuple[int, bytes]] = []
+        # user id -> revocation time, oldest first.
+        self._users: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def _prune(self, now: float) -> None:
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, jti = heapq.heappop(self._expiry_heap)
+            self._tokens.pop(jti, None)
+        # Once a lifetime has passed, every token an entry rejects is expired.
+        while self._users:
+            user_id, revoked_at = next(iter(self._users.items()))
+            if revoked_at + self.lifetime_seconds > now:
+                break
+            del self._users[user_id]
+
+    def revoke(self, jti: str, expires_at: int) -> None:
+        now = time.time()
+        self._prune(now)
+        if expires_at > now:
+            key = bytes.fromhex(jti)
+            self._tokens[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+    def revoke_user(self, user_id: int, issued_before: Optional[float] = None) -> None:
+        now = time.time()
+        self._prune(now)
+        # Re-inserted so the entries stay ordered by time.
+        self._users.pop(user_id, None)
+        self._users[user_id] = issued_before or now
+
+    def is_revoked(self, jti: str, user_id: int, issued_at: float) -> bool:
+        if issued_at < self._users.get(user_id, 0):
+            return True
+        return bool(self._tokens) and bytes.fromhex(jti) in self._tokens
+
+
+@dataclass(frozen=True)
+class AccessTokenClaims:
+    user_id: int
+    group: UserGroupEnum
+    jti: str
+    # Fractional seconds, so a revocation can tell apart tokens issued
+    # within the same second.
+    issued_at: float
+    expires_at: int
+
+
+class AccessTokenManager:
+    """
+    Issues and verifies short-lived HS256 access tokens carrying the user id
+    and group, so authenticated requests need no user lookup. Renewal goes
+    through the refresh token flow, which is where the database is consulted.
+    """
+
+    def __init__(
+        self, keys: KeyRing, lifetime_seconds: int, denylist: Denylist
+    ) -> None:
+        self.keys = keys
+        self.lifetime_seconds = lifetime_seconds
+        self.denylist = denylist
+
+    def issue(self, user_id: int, group: UserGroupEnum) -> str:
+        now = time.time()
+        claims = {
+            "sub": str(user_id),
+            "grp": group.value,
+            "iat": now,
+            "exp": int(now) + self.lifetime_seconds,
+            "jti": secrets.token_hex(16),
+        }
+        key = self.keys.active
+        payload = b64url_encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = key.header_segment + b"." + payload
+        return (signing_input + b"." + b64url_encode(key.sign(signing_input))).decode()
+
+    def verify(self, token: str) -> AccessTokenClaims:
+        try:
+            header, payload, signature = token.encode("ascii").split(b".")
+        except (UnicodeEncodeError, ValueError):
+            raise InvalidTokenError("Malformed token.")
+        key = self.keys.for_header(header)
+        if key is None:
+            raise InvalidTokenError("Unknown signing key.")
+        signing_input = token.encode("ascii")[: len(header) + 1 + len(payload)]
+        try:
+            valid = hmac.compare_digest(
+                key.sign(signing_input), b64url_decode(signature)
+            )
+            claims = json.loads(b64url_decode(payload)) if valid else None
+        except ValueError:
+            raise InvalidTokenError("Malformed token.")
+        if not valid:
+            raise InvalidTokenError("Invalid signature.")
+
+        try:
+            parsed = AccessTokenClaims(
+                user_id=int(claims["sub"]),
+                group=UserGroupEnum(claims["grp"]),
+                jti=claims["jti"],
+                issued_at=float(claims["iat"]),
+                expires_at=int(claims["exp"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise InvalidTokenError("Malformed claims.")
+        if parsed.expires_at <= time.time():
+            raise InvalidTokenError("Token has expired.")
+        if self.denylist.is_revoked(parsed.jti, parsed.user_id, parsed.issued_at):
+            raise InvalidTokenError("Token has been revoked.")
+        return parsed
+
+    def revoke(self, claims: AccessTokenClaims) -> None:
+        self.denylist.revoke(claims.jti, claims.expires_at)
+
+
+settings = get_settings()
+access_tokens = AccessTokenManager(
+    keys=KeyRing(
+        settings.JWT_SECRET_KEY,
+        [key for key in settings.JWT_PREVIOUS_SECRET_KEYS.split(",") if key],
+    ),
+    lifetime_seconds=settings.ACCESS_TOKEN_LIFETIME_MINUTES * 60,
+    denylist=Denylist(settings.ACCESS_TOKEN_LIFETIME_MINUTES * 60),
+)
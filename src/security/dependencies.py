@@ -0,0 +1,55 @@
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.database.models.users import UserGroupEnum
+from src.security.access_tokens import (
+    AccessTokenClaims,
+    InvalidTokenError,
+    access_tokens,
+)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_access_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> AccessTokenClaims:
+    """
+    Authenticate a request from its bearer token alone; no database access.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authorization header is missing.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return access_tokens.verify(credentials.credentials)
+    except InvalidTokenError as error:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(error),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def require_groups(
+    *groups: UserGroupEnum,
+) -> Callable[..., Awaitable[AccessTokenClaims]]:
+    """
+    Dependency factory accepting only tokens issued to one of ``groups``.
+    """
+
+    async def check_group(
+        claims: AccessTokenClaims = Depends(get_access_claims),
+    ) -> AccessTokenClaims:
+        if claims.group not in groups:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to perform this action.",
+            )
+        return claims
+
+    return check_group
@@ -0,0 +1,174 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.config.dependencies import get_settings
+from src.metrics.registry import registry
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+HASH_REJECTED = registry.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected because the hashing queue was full.",
+)
+
+
+class PasswordHasherBusyError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ScryptParams:
+    n: int
+    r: int
+    p: int
+
+    @property
+    def maxmem(self) -> int:
+        # scrypt needs 128 * n * r bytes; leave headroom over OpenSSL's default.
+        return 256 * self.n * self.r + 1024 * 1024
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def hash_password(password: str, params: ScryptParams) -> str:
+    """
+    Encode as ``scrypt$n$r$p$salt$key`` (84 characters with the default
+    parameters, within ``UserModel.hashed_password``).
+    """
+    salt = os.urandom(SALT_BYTES)
+    key = hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=params.n,
+        r=params.r,
+        p=params.p,
+        maxmem=params.maxmem,
+        dklen=KEY_BYTES,
+    )
+    fields = (SCHEME, params.n, params.r, params.p, _b64encode(salt), _b64encode(key))
+    return "$".join(str(field) for field in fields)
+
+
+def parse_hash(hashed: str) -> Optional[tuple[ScryptParams, bytes, bytes]]:
+    try:
+        scheme, n, r, p, salt, key = hashed.split("$")
+        if scheme != SCHEME:
+            return None
+        return ScryptParams(int(n), int(r), int(p)), _b64decode(salt), _b64decode(key)
+    except ValueError:
+        return None
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    parsed = parse_hash(hashed)
+    if parsed is None:
+        return False
+    params, salt, key = parsed
+    candidate = hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=params.n,
+        r=params.r,
+        p=params.p,
+        maxmem=params.maxmem,
+        dklen=len(key),
+    )
+    return hmac.compare_digest(candidate, key)
+
+
+def needs_rehash(hashed: str, params: ScryptParams) -> bool:
+    parsed = parse_hash(hashed)
+    return parsed is None or parsed[0] != params
+
+
+class PasswordHasher:
+    """
+    Runs password hashing off the event loop in a bounded thread pool.
+
+    ``hashlib.scrypt`` releases the GIL, so ``workers`` threads hash in
+    parallel while the loop keeps serving other requests. At most
+    ``max_pending`` calls may be running or queued; a caller that cannot get
+    a slot within ``queue_timeout`` seconds gets ``PasswordHasherBusyError``,
+    so a login storm is shed instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        params: ScryptParams,
+        workers: int,
+        max_pending: int,
+        queue_timeout: float,
+    ) -> None:
+        self.params = params
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = asyncio.Semaphore(max_pending)
+        # Verified against when the user does not exist, so unknown emails
+        # take as long as wrong passwords. Created on first use.
+        self._dummy_hash: Optional[str] = None
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            HASH_REJECTED.inc()
+            raise PasswordHasherBusyError("Password hashing queue is full.")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, function, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.params)
+
+    async def verify(
+        self, password: str, hashed: Optional[str]
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Check ``password`` against ``hashed``. On success with outdated cost
+        parameters, also return a replacement hash to store; otherwise the
+        second item is None.
+        """
+        if hashed is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("")
+            await self._run(verify_password, password, self._dummy_hash)
+            return False, None
+        if not await self._run(verify_password, password, hashed):
+            return False, None
+        if needs_rehash(hashed, self.params):
+            return True, await self.hash(password)
+        return True, None
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+settings = get_settings()
+password_hasher = PasswordHasher(
+    ScryptParams(
+        n=settings.PASSWORD_SCRYPT_N,
+        r=settings.PASSWORD_SCRYPT_R,
+        p=settings.PASSWORD_SCRYPT_P,
+    ),
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.database.models.users import (
+    ActivationTokenModel,
+    PasswordResetToken,
+    RefreshTokenModel,
+)
+
+EXPIRING_TOKEN_MODELS = (RefreshTokenModel, ActivationTokenModel, PasswordResetToken)
+
+
+async def purge_expired_tokens(
+    session_factory: async_sessionmaker,
+    batch_size: int,
+    now: Optional[datetime] = None,
+) -> dict[str, int]:
+    """
+    Delete expired token rows, ``batch_size`` at a time.
+
+    Every batch is its own short transaction picking ids from the
+    ``expires_at`` index, so the purge never holds a long write lock and
+    request traffic interleaves with it.
+    """
+    now = now or datetime.now(timezone.utc)
+    deleted = {}
+    for model in EXPIRING_TOKEN_MODELS:
+        total = 0
+        while True:
+            expired_ids = (
+                select(model.id).where(model.expires_at < now).limit(batch_size)
+            )
+            async with session_factory() as session:
+                result = await session.execute(
+                    delete(model)
+                    .where(model.id.in_(expired_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                break
+            await asyncio.sleep(0)
+        deleted[model.__tablename__] = total
+    return deleted
@@ -0,0 +1,207 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache.memory import MISSING, TTLCache
+from src.config.dependencies import get_settings
+from src.database.models.users import (
+    ActivationTokenModel,
+    PasswordResetToken,
+    RefreshTokenModel,
+)
+from src.database.models.utils import generate_token
+from src.database.populate import insert_for
+
+settings = get_settings()
+
+
+def hash_token(token: str) -> str:
+    """
+    SHA-256 hex digest of a token. Tokens are 256 random bits, so an unsalted
+    fast hash is enough to make a leaked table useless; the digest fits the
+    existing ``String(64)`` column.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class RefreshTokenRecord:
+    user_id: int
+    expires_at: datetime
+
+
+# Token hash -> RefreshTokenRecord, or None for hashes known not to exist.
+refresh_token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
+
+class RefreshTokenService:
+    """
+    Issue, validate, rotate and revoke refresh tokens.
+
+    Only ``hash_token(token)`` is stored. Validation is answered from a
+    short-lived per-process cache holding positive and negative lookups, so
+    repeated checks of the same token cost no query. Rotation consumes the
+    old token with a single ``DELETE ... RETURNING``, which makes a replayed
+    token fail even when two workers race on it.
+
+    Methods that write commit the session they were given.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: TTLCache = refresh_token_cache,
+        lifetime: timedelta = timedelta(days=settings.REFRESH_TOKEN_LIFETIME_DAYS),
+        negative_ttl: float = settings.TOKEN_CACHE_NEGATIVE_TTL,
+    ) -> None:
+        self.session = session
+        self.cache = cache
+        self.lifetime = lifetime
+        self.negative_ttl = negative_ttl
+
+    def _remember(self, key: str, record: Optional[RefreshTokenRecord]) -> None:
+        if record is None:
+            self.cache.set(key, None, self.negative_ttl)
+            return
+        remaining = (record.expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining > 0:
+            self.cache.set(key, record, min(remaining, self.cache.ttl))
+
+    async def issue(self, user_id: int) -> str:
+        token = generate_token()
+        key = hash_token(token)
+        expires_at = datetime.now(timezone.utc) + self.lifetime
+        self.session.add(
+            RefreshTokenModel(user_id=user_id, token=key, expires_at=expires_at)
+        )
+        await self.session.commit()
+        self._remember(key, RefreshTokenRecord(user_id, expires_at))
+        return token
+
+    async def validate(self, token: str) -> Optional[int]:
+        """
+        Return the owner's user id, or None for an unknown or expired token.
+        """
+        key = hash_token(token)
+        record = self.cache.get(key)
+        if record is MISSING:
+            row = (
+                await self.session.execute(
+                    select(
+                        RefreshTokenModel.user_id, RefreshTokenModel.expires_at
+                    ).where(RefreshTokenModel.token == key)
+                )
+            ).first()
+            record = (
+                RefreshTokenRecord(row.user_id, _as_utc(row.expires_at))
+                if row
+                else None
+            )
+            self._remember(key, record)
+        if record is None or record.expires_at <= datetime.now(timezone.utc):
+            return None
+        return record.user_id
+
+    async def rotate(self, token: str) -> Optional[tuple[int, str]]:
+        """
+        Consume ``token`` and issue its replacement. Returns ``(user_id,
+        new_token)``, or None when the token is unknown, expired or was
+        already used.
+        """
+        key = hash_token(token)
+        user_id = (
+            await self.session.execute(
+                delete(RefreshTokenModel)
+                .where(
+                    RefreshTokenModel.token == key,
+                    RefreshTokenModel.expires_at > datetime.now(timezone.utc),
+                )
+                .returning(RefreshTokenModel.user_id)
+            )
+        ).scalar_one_or_none()
+        self._remember(key, None)
+        if user_id is None:
+            await self.session.rollback()
+            return None
+        return user_id, await self.issue(user_id)
+
+    async def revoke(self, token: str) -> None:
+        key = hash_token(token)
+        await self.session.execute(
+            delete(RefreshTokenModel).where(RefreshTokenModel.token == key)
+        )
+        await self.session.commit()
+        self._remember(key, None)
+
+    async def revoke_all(self, user_id: int) -> int:
+        keys = (
+            (
+                await self.session.execute(
+                    delete(RefreshTokenModel)
+                    .where(RefreshTokenModel.user_id == user_id)
+                    .returning(RefreshTokenModel.token)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await self.session.commit()
+        for key in keys:
+            self._remember(key, None)
+        return len(keys)
+
+
+OneTimeTokenModel = Union[type[ActivationTokenModel], type[PasswordResetToken]]
+
+
+async def issue_one_time_token(
+    session: AsyncSession, model: OneTimeTokenModel, user_id: int, lifetime: timedelta
+) -> str:
+    """
+    Create the user's activation or password reset token, replacing any
+    previous one with a single upsert. Only its hash is stored; the caller
+    commits.
+    """
+    token = generate_token()
+    stmt = insert_for(session, model.__table__).values(
+        user_id=user_id,
+        token=hash_token(token),
+        expires_at=datetime.now(timezone.utc) + lifetime,
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"token": stmt.excluded.token, "expires_at": stmt.excluded.expires_at},
+        )
+    )
+    return token
+
+
+async def consume_one_time_token(
+    session: AsyncSession, model: OneTimeTokenModel, token: str
+) -> Optional[int]:
+    """
+    Delete an unexpired token and return its user id, or None if it is
+    unknown or expired. A single ``DELETE ... RETURNING`` makes a token
+    usable once even under concurrent requests; the caller commits.
+    """
+    return (
+        await session.execute(
+            delete(model)
+            .where(
+                model.token == hash_token(token),
+                model.expires_at > datetime.now(timezone.utc),
+            )
+            .returning(model.user_id)
+        )
+    ).scalar_one_or_none()
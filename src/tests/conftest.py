@@ -0,0 +1,81 @@
+import os
+import tempfile
+from typing import Any, AsyncIterator, Iterator
+
+# Settings are read once, when ``src`` is first imported, so the throwaway
+# database and mail directory have to be in place before that; pytest-env
+# sets the rest.
+TEST_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = os.path.join(TEST_DIR, "test.db")
+os.environ["EMAIL_FILE_DIR"] = os.path.join(TEST_DIR, "emails")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from src.cache import catalog_cache  # noqa: E402
+from src.config.dependencies import get_cache, get_rate_limiter  # noqa: E402
+from src.database import engine  # noqa: E402
+from src.database.models.base import Base  # noqa: E402
+from src.database.models.users import UserGroupEnum  # noqa: E402
+from src.database.search import drop_search_index  # noqa: E402
+from src.database.session_sqlite import sqlite_read_engine  # noqa: E402
+from src.database.synthetic import seed_synthetic  # noqa: E402
+from src.main import app  # noqa: E402
+from src.security import access_tokens  # noqa: E402
+
+SEED_MOVIES = 200
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[None]:
+    """
+    A freshly created schema with ``SEED_MOVIES`` synthetic movies and
+    ``SEED_MOVIES // 10`` users, dropped again after the test.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await seed_synthetic(connection, SEED_MOVIES)
+    yield
+    async with engine.begin() as connection:
+        await connection.run_sync(drop_search_index)
+        await connection.run_sync(Base.metadata.drop_all)
+    # Pooled connections belong to this test's event loop.
+    await engine.dispose()
+    await sqlite_read_engine.dispose()
+    catalog_cache.invalidate()
+    get_cache.cache_clear()
+    get_rate_limiter.cache_clear()
+
+
+@pytest.fixture
+async def client(database: None) -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def user_headers() -> dict[str, str]:
+    token = access_tokens.issue(1, UserGroupEnum.USER)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    """
+    SQL of every statement run on the read or write engine during the test;
+    clear it to count from a later point.
+    """
+    executed: list[str] = []
+
+    def record(connection: Any, cursor: Any, statement: str, *args: Any) -> None:
+        executed.append(statement)
+
+    engines = (engine.sync_engine, sqlite_read_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    yield executed
+    for target in engines:
+        event.remove(target, "before_cursor_execute", record)
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from src.database.models.users import UserGroupEnum
+from src.security.access_tokens import (
+    AccessTokenManager,
+    Denylist,
+    InvalidTokenError,
+    KeyRing,
+)
+
+LIFETIME = 900
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.25
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def manager() -> AccessTokenManager:
+    return AccessTokenManager(KeyRing("secret"), LIFETIME, Denylist(LIFETIME))
+
+
+def test_tokens_issued_after_a_user_revocation_stay_valid(
+    clock: Clock, manager: AccessTokenManager
+) -> None:
+    before = manager.issue(1, UserGroupEnum.USER)
+    clock.now += 0.001
+    manager.denylist.revoke_user(1)
+    clock.now += 0.001
+    # Logging in again within the same second as the revocation.
+    after = manager.issue(1, UserGroupEnum.USER)
+
+    with pytest.raises(InvalidTokenError):
+        manager.verify(before)
+    assert manager.verify(after).user_id == 1
+    assert manager.verify(manager.issue(2, UserGroupEnum.USER)).user_id == 2
+
+
+def test_user_revocations_are_dropped_after_a_token_lifetime(
+    clock: Clock, manager: AccessTokenManager
+) -> None:
+    denylist = manager.denylist
+    denylist.revoke_user(1)
+    clock.now += LIFETIME / 2
+    denylist.revoke_user(2)
+    denylist.revoke_user(1)
+    assert len(denylist) == 2
+
+    clock.now += LIFETIME / 2
+    denylist.revoke_user(3)
+    # User 1's second revocation replaced the first, so none has expired.
+    assert len(denylist) == 3
+
+    clock.now += LIFETIME
+    denylist.revoke_user(4)
+    assert len(denylist) == 1
@@ -0,0 +1,32 @@
+import httpx
+import pytest
+
+from src.ratelimit.limiter import DEFAULT_RATE_LIMITS
+from src.security.passwords import password_hasher
+
+
+async def test_password_reset_completion_is_rate_limited(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hashed = []
+
+    async def fake_hash(password: str) -> str:
+        hashed.append(password)
+        return "hashed"
+
+    monkeypatch.setattr(password_hasher, "hash", fake_hash)
+    limit = DEFAULT_RATE_LIMITS["password_reset_complete", None].limit
+
+    codes = [
+        (
+            await client.post(
+                "/api/v1/accounts/password-reset/complete/",
+                json={"token": f"guess-{attempt}", "password": "new-password"},
+            )
+        ).status_code
+        for attempt in range(limit + 3)
+    ]
+
+    assert codes == [400] * limit + [429] * 3
+    # Refused guesses never reach the password hasher.
+    assert len(hashed) == limit
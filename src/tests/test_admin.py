@@ -0,0 +1,55 @@
+import json
+
+import httpx
+import pytest
+
+from src.database.models.users import UserGroupEnum
+from src.security import access_tokens
+
+EXPORT_URL = "/api/v1/admin/catalog/export/"
+IMPORT_URL = "/api/v1/admin/catalog/import/"
+
+
+@pytest.fixture
+def admin_headers() -> dict[str, str]:
+    token = access_tokens.issue(1, UserGroupEnum.ADMIN)
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def export_records(
+    client: httpx.AsyncClient, headers: dict[str, str]
+) -> list[dict]:
+    response = await client.get(EXPORT_URL, headers=headers)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_import_replaces_the_links_of_existing_movies(
+    client: httpx.AsyncClient, admin_headers: dict[str, str]
+) -> None:
+    records = await export_records(client, admin_headers)
+    record = next(
+        record
+        for record in records
+        if len(record["genres"]) > 1 and record["stars"] and record["directors"]
+    )
+    record.update(
+        genres=record["genres"][:1], stars=[], directors=["Director Replacement"]
+    )
+
+    response = await client.post(
+        IMPORT_URL,
+        content=json.dumps(record),
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == 1
+
+    exported = {
+        (movie["name"], movie["year"], movie["time"]): movie
+        for movie in await export_records(client, admin_headers)
+    }
+    movie = exported[record["name"], record["year"], record["time"]]
+    assert len(exported) == len(records)
+    assert movie["genres"] == record["genres"]
+    assert movie["stars"] == []
+    assert movie["directors"] == ["Director Replacement"]
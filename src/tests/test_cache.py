@@ -0,0 +1,184 @@
+import asyncio
+import json
+import pickle
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import insert
+
+from src.cache import Cache, RedisBackend, catalog_cache
+from src.cache.fake_redis import FakeRedis
+from src.cache.shared import COMPRESSED, RAW
+from src.database import AsyncSessionLocal, engine
+from src.database.models.movies import GenreModel, StarModel
+from src.database.models.users import UserGroupEnum
+from src.database.search import create_search_index
+from src.security import access_tokens
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def worker_caches(redis: FakeRedis, count: int = 2) -> list[Cache]:
+    """
+    Caches of ``count`` workers sharing one Redis.
+    """
+    return [
+        Cache(RedisBackend(redis), prefix="test", lock_poll_interval=0.001)
+        for _ in range(count)
+    ]
+
+
+async def test_values_are_stored_as_json() -> None:
+    redis = FakeRedis()
+    cache, _ = worker_caches(redis)
+    small, large = [1, 2, 3], list(range(1000))
+
+    await cache.set("search", "small", small)
+    await cache.set("search", "large", large)
+
+    stored = {key: value for key, (_, value) in redis._data.items()}
+    small_payload = stored[await cache.make_key("search", "small")]
+    assert small_payload == RAW + b"[1,2,3]"
+    assert stored[await cache.make_key("search", "large")][:1] == COMPRESSED
+    assert await cache.get("search", "small") == small
+    assert await cache.get("search", "large") == large
+    assert await cache.get("search", "missing", "default") == "default"
+
+
+async def test_values_that_are_not_data_are_refused() -> None:
+    cache, _ = worker_caches(FakeRedis())
+
+    with pytest.raises(TypeError):
+        await cache.set("search", "key", datetime(2024, 1, 1))
+    with pytest.raises(ValueError):
+        await cache.set("search", "key", float("nan"))
+
+
+async def test_payloads_in_another_format_are_misses() -> None:
+    redis = FakeRedis()
+    cache, _ = worker_caches(redis)
+    key = await cache.make_key("search", "old")
+    await redis.set(key, b"\x00" + pickle.dumps([1, 2]))
+
+    assert await cache.get("search", "old") is None
+
+    async def load() -> list[int]:
+        return [3, 4]
+
+    assert await cache.get_or_set("search", "old", load) == [3, 4]
+    assert json.loads((await redis.get(key))[1:]) == [3, 4]
+
+
+async def test_invalidation_is_seen_by_every_worker() -> None:
+    first, second = worker_caches(FakeRedis())
+    await first.set("search", "query", [1])
+    await first.set("genres", "all", ["Drama"])
+
+    assert await second.get("search", "query") == [1]
+    await second.invalidate("search")
+
+    assert await first.get("search", "query") is None
+    assert await first.get("genres", "all") == ["Drama"]
+
+
+async def test_invalidation_after_a_lost_generation_stays_invalid() -> None:
+    cache, _ = worker_caches(FakeRedis())
+    await cache.invalidate("search")
+    await cache.set("search", "query", [1])
+    # The generation key expired or was evicted.
+    await cache.backend.delete("test:search:generation")
+
+    await cache.invalidate("search")
+
+    assert await cache.get("search", "query") is None
+
+
+async def test_entries_expire_with_their_ttl() -> None:
+    clock = Clock()
+    cache, _ = worker_caches(FakeRedis(timer=clock))
+    await cache.set("search", "query", [1], ttl=10)
+
+    clock.now += 9.9
+    assert await cache.get("search", "query") == [1]
+    clock.now += 0.2
+    assert await cache.get("search", "query") is None
+
+
+async def test_concurrent_misses_load_once_across_workers() -> None:
+    caches = worker_caches(FakeRedis(), count=3)
+    loads = 0
+
+    async def load() -> list[int]:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.02)
+        return [7]
+
+    results = await asyncio.gather(
+        *(cache.get_or_set("search", "query", load) for cache in caches for _ in "ab")
+    )
+
+    assert results == [[7]] * 6
+    assert loads == 1
+    assert sum(cache.counters["coalesced"] for cache in caches) == 3
+    assert sum(cache.counters["lock_waits"] for cache in caches) == 2
+
+
+async def test_catalog_import_invalidates_search_results(
+    client: httpx.AsyncClient,
+) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(create_search_index)
+    admin_headers = {
+        "Authorization": f"Bearer {access_tokens.issue(1, UserGroupEnum.ADMIN)}"
+    }
+    search = {"q": "zephyrine"}
+    assert (await client.get("/api/v1/movies/search/", params=search)).json()[
+        "movies"
+    ] == []
+
+    export = await client.get("/api/v1/admin/catalog/export/", headers=admin_headers)
+    record = json.loads(export.text.splitlines()[0])
+    record.update(name="Zephyrine", year=2031)
+    response = await client.post(
+        "/api/v1/admin/catalog/import/",
+        content=json.dumps(record),
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == 1
+
+    found = await client.get("/api/v1/movies/search/", params=search)
+    assert [movie["name"] for movie in found.json()["movies"]] == ["Zephyrine"]
+
+
+async def test_catalog_names_added_by_core_writes_are_found(database: None) -> None:
+    async with AsyncSessionLocal() as session:
+        assert await catalog_cache.star_id(session, "New Star") is None
+        assert await catalog_cache.genre_id(session, "New Genre") is None
+        genre_count = len(await catalog_cache.genres_with_counts(session))
+
+    # Bulk writes bypass the ORM flush events that invalidate the cache.
+    async with engine.begin() as connection:
+        star_id = (
+            await connection.execute(
+                insert(StarModel).values(name="New Star").returning(StarModel.id)
+            )
+        ).scalar_one()
+        genre_id = (
+            await connection.execute(
+                insert(GenreModel).values(name="New Genre").returning(GenreModel.id)
+            )
+        ).scalar_one()
+
+    async with AsyncSessionLocal() as session:
+        assert await catalog_cache.star_id(session, "New Star") == star_id
+        assert await catalog_cache.genre_id(session, "New Genre") == genre_id
+        genres = await catalog_cache.genres_with_counts(session)
+        assert len(genres) == genre_count + 1
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.cache.catalog_snapshot import CatalogSnapshotStore
+from src.database import AsyncSessionLocal
+from src.database.synthetic import RARE_CERTIFICATION
+from src.routes import movies
+
+QUERIES = [
+    "limit=10",
+    "limit=10&cursor=150",
+    "limit=100",
+    "limit=5&cursor=2",
+    "year=1994",
+    "imdb_min=7.5&imdb_max=9",
+    "year=1994&imdb_min=5&limit=3",
+    "genre=Drama",
+    "genre=Drama&cursor=120&limit=7",
+    "star=Star 7",
+    "director=Director 7",
+    f"certification={RARE_CERTIFICATION}",
+    "genre=Drama&star=Star 3&imdb_min=2",
+    "genre=Unknown",
+]
+
+
+@pytest.fixture
+async def snapshot_store(
+    client: httpx.AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> CatalogSnapshotStore:
+    store = CatalogSnapshotStore(str(tmp_path / "catalog.snapshot"))
+    async with AsyncSessionLocal() as session:
+        assert await store.refresh(session)
+    monkeypatch.setattr(movies, "catalog_snapshot", store)
+    return store
+
+
+def enable_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(movies.settings, "CATALOG_SNAPSHOT_REFRESH_INTERVAL", 30)
+
+
+async def test_snapshot_is_rebuilt_only_when_the_catalog_changes(
+    snapshot_store: CatalogSnapshotStore,
+) -> None:
+    async with AsyncSessionLocal() as session:
+        assert not await snapshot_store.refresh(session)
+        assert await snapshot_store.refresh(session, force=True)
+    assert len(snapshot_store.get()) == 200
+
+
+@pytest.mark.parametrize("query", QUERIES)
+async def test_snapshot_pages_match_the_database(
+    client: httpx.AsyncClient,
+    snapshot_store: CatalogSnapshotStore,
+    statements: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    query: str,
+) -> None:
+    url = f"/api/v1/movies/?{query}"
+    expected = await client.get(url)
+    assert expected.status_code == 200
+    enable_snapshot(monkeypatch)
+    statements.clear()
+
+    response = await client.get(url)
+    not_modified = await client.get(
+        url, headers={"If-None-Match": expected.headers.get("ETag", "")}
+    )
+
+    assert statements == []
+    assert response.status_code == 200
+    assert response.content == expected.content
+    for header in ("ETag", "Last-Modified", "Cache-Control"):
+        assert response.headers.get(header) == expected.headers.get(header)
+    if "ETag" in expected.headers:
+        assert not_modified.status_code == 304
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import func, insert, select
+
+from src.database import AsyncSessionLocal
+from src.database.models.carts import CartItemModel, CartModel
+from src.database.models.movies import MovieModel
+from src.database.models.orders import OrderItemModel
+from src.orders.checkout import CheckoutService, EmptyCartError
+
+
+async def fill_cart(user_id: int, movie_ids: list[int]) -> Decimal:
+    """
+    Put ``movie_ids`` in the user's cart and return what they cost.
+    """
+    async with AsyncSessionLocal() as session:
+        cart_id = await session.scalar(
+            insert(CartModel).values(user_id=user_id).returning(CartModel.id)
+        )
+        if movie_ids:
+            await session.execute(
+                insert(CartItemModel),
+                [{"cart_id": cart_id, "movie_id": id_} for id_ in movie_ids],
+            )
+        total = await session.scalar(
+            select(func.sum(MovieModel.price)).where(MovieModel.id.in_(movie_ids))
+        )
+        await session.commit()
+    return total
+
+
+async def test_checkout_statement_count_does_not_grow_with_the_cart(
+    database: None, statements: list[str]
+) -> None:
+    counts = {}
+    for user_id, size in enumerate((1, 5, 50), start=1):
+        movie_ids = list(range(user_id * 50, user_id * 50 + size))
+        total = await fill_cart(user_id, movie_ids)
+        statements.clear()
+
+        async with AsyncSessionLocal() as session:
+            order = await CheckoutService(session).checkout(user_id)
+        counts[size] = len(statements)
+
+        assert order.item_count == size
+        assert order.total_amount == total
+        async with AsyncSessionLocal() as session:
+            ordered = await session.scalars(
+                select(OrderItemModel.movie_id)
+                .where(OrderItemModel.order_id == order.id)
+                .order_by(OrderItemModel.movie_id)
+            )
+            assert ordered.all() == movie_ids
+
+    assert counts == {1: 6, 5: 6, 50: 6}
+
+
+async def test_checkout_of_an_empty_cart_places_nothing(database: None) -> None:
+    await fill_cart(1, [])
+
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(EmptyCartError):
+            await CheckoutService(session).checkout(1)
+
+
+async def test_movie_in_a_pending_order_cannot_be_ordered_again(
+    client: httpx.AsyncClient, user_headers: dict[str, str]
+) -> None:
+    response = await client.post(
+        "/api/v1/cart/items/", json={"movie_id": 10}, headers=user_headers
+    )
+    assert response.status_code == 201
+    response = await client.post("/api/v1/cart/checkout/", headers=user_headers)
+    assert response.status_code == 201
+
+    response = await client.post(
+        "/api/v1/cart/items/", json={"movie_id": 10}, headers=user_headers
+    )
+    assert response.status_code == 409
+
+    # A cart that got the movie anyway (e.g. added before the first checkout
+    # committed) is refused at checkout.
+    async with AsyncSessionLocal() as session:
+        cart_id = await session.scalar(
+            select(CartModel.id).where(CartModel.user_id == 1)
+        )
+        await session.execute(
+            insert(CartItemModel),
+            [
+                {"cart_id": cart_id, "movie_id": 10},
+                {"cart_id": cart_id, "movie_id": 11},
+            ],
+        )
+        await session.commit()
+    response = await client.post("/api/v1/cart/checkout/", headers=user_headers)
+    assert response.status_code == 409
+    assert response.json()["detail"]["movie_ids"] == [10]
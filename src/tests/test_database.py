@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+from pydantic.v1 import ValidationError
+from sqlalchemy import text
+
+from src.config.settings import BaseAppSettings
+from src.database.session_postgresql import create_pooled_engine
+
+
+async def test_pooled_engine_runs_queries_on_sqlite(tmp_path: Path) -> None:
+    settings = BaseAppSettings(
+        DB_POOL_SIZE=2, DB_MAX_OVERFLOW=1, DB_POOL_TIMEOUT=5, DB_POOL_RECYCLE=60
+    )
+    engine = create_pooled_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pooled.db'}", settings
+    )
+    try:
+        async with engine.connect() as connection:
+            assert await connection.scalar(text("SELECT 1")) == 1
+        pool = engine.pool
+        assert (pool.size(), pool._max_overflow, pool.timeout()) == (2, 1, 5)
+        assert pool._recycle == 60
+        assert pool._pre_ping
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("DB_POOL_SIZE", 0),
+        ("DB_POOL_SIZE", -3),
+        ("DB_POOL_TIMEOUT", 0),
+        ("DB_POOL_TIMEOUT", -1.5),
+        ("DB_POOL_RECYCLE", 0),
+        ("DB_POOL_RECYCLE", -2),
+    ],
+)
+def test_pool_settings_reject_bad_values(field: str, value: float) -> None:
+    with pytest.raises(ValidationError, match=field):
+        BaseAppSettings(**{field: value})
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("DB_POOL_SIZE", 1), ("DB_POOL_TIMEOUT", 0.5), ("DB_POOL_RECYCLE", -1)],
+)
+def test_pool_settings_accept_their_limits(field: str, value: float) -> None:
+    assert getattr(BaseAppSettings(**{field: value}), field) == value
@@ -0,0 +1,62 @@
+import httpx
+import pytest
+from sqlalchemy import update
+
+from src.database import AsyncSessionLocal
+from src.database.models.movies import MovieModel
+
+
+async def test_movie_detail_not_modified_reads_only_the_marker(
+    client: httpx.AsyncClient, statements: list[str]
+) -> None:
+    first = await client.get("/api/v1/movies/5/")
+    statements.clear()
+
+    response = await client.get(
+        "/api/v1/movies/5/", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert len(statements) == 1
+    assert statements[0].startswith("SELECT movies.version, movies.updated_at")
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["limit=10", "limit=10&cursor=150", "year=1994&imdb_min=5", "genre=Drama"],
+)
+async def test_movie_list_not_modified_reads_only_the_marker(
+    client: httpx.AsyncClient, statements: list[str], query: str
+) -> None:
+    url = f"/api/v1/movies/?{query}"
+    first = await client.get(url)
+    assert first.json()["movies"]
+    statements.clear()
+
+    response = await client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert statements[0].startswith(
+        "SELECT movies.id, movies.version, movies.updated_at"
+    )
+
+
+async def test_changed_movie_is_sent_again(client: httpx.AsyncClient) -> None:
+    first = await client.get("/api/v1/movies/?limit=10")
+    movie_id = first.json()["movies"][0]["id"]
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(MovieModel)
+            .where(MovieModel.id == movie_id)
+            .values(version=MovieModel.version + 1)
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/api/v1/movies/?limit=10", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
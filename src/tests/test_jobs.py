@@ -0,0 +1,148 @@
+import asyncio
+import email
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+
+from src.config.dependencies import get_settings
+from src.database import AsyncSessionLocal
+from src.database.models.jobs import JobModel, JobStatusEnum
+from src.database.models.users import ActivationTokenModel, UserModel
+from src.jobs.queue import (
+    JobContext,
+    claim_jobs,
+    enqueue,
+    fail_job,
+    recover_expired_leases,
+    retry_delay,
+)
+from src.jobs.tasks import send_activation_email
+from src.notifications.mail import FileEmailSender
+
+LEASE = timedelta(minutes=5)
+
+
+async def add_jobs(count: int, max_attempts: int = 5) -> None:
+    async with AsyncSessionLocal() as session:
+        for index in range(count):
+            await enqueue(session, "noop", {"index": index}, max_attempts=max_attempts)
+        await session.commit()
+
+
+async def job_states() -> dict[int, tuple[JobStatusEnum, int, datetime]]:
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(
+                JobModel.id, JobModel.status, JobModel.attempts, JobModel.run_at
+            ).order_by(JobModel.id)
+        )
+        return {
+            id_: (status, attempts, run_at) for id_, status, attempts, run_at in rows
+        }
+
+
+async def make_due() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(JobModel).values(run_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+
+async def test_concurrent_workers_never_claim_the_same_job(database: None) -> None:
+    await add_jobs(40)
+
+    async def work(worker: str) -> list[int]:
+        claimed = []
+        async with AsyncSessionLocal() as session:
+            while jobs := await claim_jobs(session, worker, 3, LEASE):
+                claimed.extend(job.id for job in jobs)
+                await asyncio.sleep(0)
+        return claimed
+
+    claims = await asyncio.gather(*(work(f"worker-{n}") for n in range(4)))
+
+    claimed = [job_id for worker_claims in claims for job_id in worker_claims]
+    assert sorted(claimed) == sorted(await job_states())
+    assert len(set(claimed)) == len(claimed)
+
+
+async def test_failed_job_backs_off_until_attempts_run_out(database: None) -> None:
+    settings = get_settings()
+    await add_jobs(1, max_attempts=3)
+
+    for attempt in range(1, 4):
+        async with AsyncSessionLocal() as session:
+            (job,) = await claim_jobs(session, "worker", 1, LEASE)
+            assert job.attempts == attempt
+            again = await fail_job(session, job, "worker", "boom", settings)
+            assert again == (attempt < 3)
+        ((status, attempts, run_at),) = (await job_states()).values()
+        assert attempts == attempt
+        if again:
+            assert status == JobStatusEnum.QUEUED
+            # At least half the full backoff, base * 2^(attempts - 1).
+            wait = run_at.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+            full = settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+            assert wait.total_seconds() > full / 2 - 1
+            async with AsyncSessionLocal() as session:
+                assert await claim_jobs(session, "worker", 1, LEASE) == []
+            await make_due()
+        else:
+            assert status == JobStatusEnum.FAILED
+
+
+def test_retry_delay_grows_exponentially_up_to_the_cap() -> None:
+    settings = get_settings()
+    base, cap = settings.JOB_RETRY_BASE_SECONDS, settings.JOB_RETRY_MAX_SECONDS
+    for attempts in range(1, 20):
+        delay = retry_delay(attempts, settings).total_seconds()
+        full = min(base * 2 ** (attempts - 1), cap)
+        assert full / 2 <= delay <= full
+
+
+async def test_expired_leases_are_queued_again_or_failed(database: None) -> None:
+    await add_jobs(1, max_attempts=1)
+    await add_jobs(1, max_attempts=2)
+    async with AsyncSessionLocal() as session:
+        jobs = await claim_jobs(session, "dead-worker", 2, timedelta(seconds=-1))
+        assert len(jobs) == 2
+        assert await recover_expired_leases(session) == 2
+
+    states = await job_states()
+    assert [status for status, _, _ in states.values()] == [
+        JobStatusEnum.FAILED,
+        JobStatusEnum.QUEUED,
+    ]
+    async with AsyncSessionLocal() as session:
+        assert await recover_expired_leases(session) == 0
+        (job,) = await claim_jobs(session, "worker", 2, LEASE)
+    assert job.attempts == 2
+
+
+async def test_activation_email_is_written_to_the_file_sink(
+    database: None, tmp_path: Path
+) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(UserModel).where(UserModel.id == 1).values(is_active=False)
+        )
+        address = await session.scalar(select(UserModel.email).where(UserModel.id == 1))
+        await session.commit()
+    context = JobContext(
+        AsyncSessionLocal,
+        get_settings(),
+        {"email_sender": FileEmailSender(str(tmp_path))},
+    )
+
+    await send_activation_email(context, {"user_id": 1})
+
+    (path,) = tmp_path.glob("*.eml")
+    message = email.message_from_bytes(path.read_bytes())
+    assert message["To"] == address
+    async with AsyncSessionLocal() as session:
+        tokens = await session.scalar(
+            select(func.count()).where(ActivationTokenModel.user_id == 1)
+        )
+    assert tokens == 1
@@ -0,0 +1,40 @@
+import io
+from pathlib import Path
+
+import httpx
+import pytest
+from PIL import Image
+
+from src.database.models.users import UserGroupEnum
+from src.media import media_storage
+from src.security import access_tokens
+
+
+@pytest.fixture
+def moderator_headers() -> dict[str, str]:
+    token = access_tokens.issue(1, UserGroupEnum.MODERATOR)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def test_poster_for_an_unknown_movie_stores_nothing(
+    client: httpx.AsyncClient,
+    moderator_headers: dict[str, str],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(media_storage, "root", str(tmp_path))
+
+    response = await client.put(
+        "/api/v1/media/movies/999999/poster/",
+        files={"file": ("poster.png", png(), "image/png")},
+        headers=moderator_headers,
+    )
+
+    assert response.status_code == 404
+    assert list(tmp_path.iterdir()) == []
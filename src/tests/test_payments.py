@@ -0,0 +1,183 @@
+import json
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+from src.config.dependencies import get_payment_provider, get_settings
+from src.database import AsyncSessionLocal
+from src.database.models.orders import (
+    OrderModel,
+    OrderStatusEnum,
+    PurchasedMovieModel,
+)
+from src.database.models.payments import PaymentWebhookEventModel
+from src.main import app
+from src.payments import PaymentProviderClient, sign_payload
+from src.payments.fake_provider import create_fake_provider
+from src.payments.provider import SIGNATURE_HEADER
+
+WEBHOOK_URL = "http://test/api/v1/payments/webhook/"
+
+
+@pytest.fixture
+async def provider(database: None) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Client of a fake provider that the app under test talks to and that
+    delivers its webhooks straight to the app.
+    """
+    fake = create_fake_provider(
+        WEBHOOK_URL,
+        get_settings().PAYMENT_WEBHOOK_SECRET,
+        "test-key",
+        webhook_transport=httpx.ASGITransport(app=app),
+    )
+    client = PaymentProviderClient(
+        "http://provider", "test-key", transport=httpx.ASGITransport(app=fake)
+    )
+    app.dependency_overrides[get_payment_provider] = lambda: client
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake),
+        base_url="http://provider",
+        headers={"Authorization": "Bearer test-key"},
+    ) as provider_client:
+        yield provider_client
+    del app.dependency_overrides[get_payment_provider]
+    await client.close()
+
+
+async def place_order(
+    client: httpx.AsyncClient, headers: dict[str, str], movie_ids: list[int]
+) -> int:
+    for movie_id in movie_ids:
+        response = await client.post(
+            "/api/v1/cart/items/", json={"movie_id": movie_id}, headers=headers
+        )
+        assert response.status_code == 201
+    response = await client.post("/api/v1/cart/checkout/", headers=headers)
+    assert response.status_code == 201
+    return response.json()["order_id"]
+
+
+async def start_payment(
+    client: httpx.AsyncClient, headers: dict[str, str], order_id: int
+) -> str:
+    response = await client.post(
+        "/api/v1/payments/", json={"order_id": order_id}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["external_payment_id"]
+
+
+async def deliver(client: httpx.AsyncClient, event: dict) -> httpx.Response:
+    payload = json.dumps(event).encode()
+    return await client.post(
+        WEBHOOK_URL,
+        content=payload,
+        headers={
+            "Content-Type": "application/json",
+            SIGNATURE_HEADER: sign_payload(
+                get_settings().PAYMENT_WEBHOOK_SECRET, payload
+            ),
+        },
+    )
+
+
+async def order_state(order_id: int) -> tuple[OrderStatusEnum, int, int]:
+    """
+    The order's status, the movies it granted and the webhook events
+    recorded overall.
+    """
+    async with AsyncSessionLocal() as session:
+        return (
+            await session.scalar(
+                select(OrderModel.status).where(OrderModel.id == order_id)
+            ),
+            await session.scalar(
+                select(func.count()).where(PurchasedMovieModel.order_id == order_id)
+            ),
+            await session.scalar(
+                select(func.count()).select_from(PaymentWebhookEventModel)
+            ),
+        )
+
+
+async def test_duplicate_deliveries_apply_once(
+    client: httpx.AsyncClient,
+    provider: httpx.AsyncClient,
+    user_headers: dict[str, str],
+) -> None:
+    order_id = await place_order(client, user_headers, [1, 2, 3])
+    payment_id = await start_payment(client, user_headers, order_id)
+
+    response = await provider.post(
+        f"/v1/payments/{payment_id}/confirm", params={"deliveries": 5}
+    )
+
+    assert response.json()["responses"] == [200] * 5
+    assert await order_state(order_id) == (OrderStatusEnum.PAID, 3, 1)
+    redelivered = await deliver(client, response.json()["event"])
+    assert redelivered.status_code == 200
+    assert redelivered.json()["duplicate"] is True
+
+
+async def test_duplicate_refund_deliveries_revoke_once(
+    client: httpx.AsyncClient,
+    provider: httpx.AsyncClient,
+    user_headers: dict[str, str],
+) -> None:
+    order_id = await place_order(client, user_headers, [4, 5])
+    payment_id = await start_payment(client, user_headers, order_id)
+    await provider.post(f"/v1/payments/{payment_id}/confirm")
+
+    response = await provider.post(
+        f"/v1/payments/{payment_id}/refund", params={"deliveries": 5}
+    )
+
+    assert response.json()["responses"] == [200] * 5
+    assert await order_state(order_id) == (OrderStatusEnum.CANCELED, 0, 2)
+
+
+async def test_early_webhook_is_refused_until_payment_is_stored(
+    client: httpx.AsyncClient,
+    provider: httpx.AsyncClient,
+    user_headers: dict[str, str],
+) -> None:
+    order_id = await place_order(client, user_headers, [6])
+    # The provider settles the payment the app is about to create, under the
+    # idempotency key of the app's first attempt, before the app stores it.
+    created = await provider.post(
+        "/v1/payments",
+        json={"amount": "1.00"},
+        headers={"Idempotency-Key": f"order-{order_id}-0"},
+    )
+    payment_id = created.json()["id"]
+    response = await provider.post(f"/v1/payments/{payment_id}/confirm")
+
+    assert response.json()["responses"] == [409]
+    assert await order_state(order_id) == (OrderStatusEnum.PENDING, 0, 0)
+
+    assert await start_payment(client, user_headers, order_id) == payment_id
+    redelivered = await deliver(client, response.json()["event"])
+
+    assert redelivered.status_code == 200
+    assert redelivered.json()["duplicate"] is False
+    assert await order_state(order_id) == (OrderStatusEnum.PAID, 1, 1)
+
+
+async def test_failed_payment_leaves_order_pending(
+    client: httpx.AsyncClient,
+    provider: httpx.AsyncClient,
+    user_headers: dict[str, str],
+) -> None:
+    order_id = await place_order(client, user_headers, [7])
+    payment_id = await start_payment(client, user_headers, order_id)
+
+    response = await provider.post(
+        f"/v1/payments/{payment_id}/confirm",
+        params={"outcome": "failed", "deliveries": 3},
+    )
+
+    assert response.json()["responses"] == [200] * 3
+    assert await order_state(order_id) == (OrderStatusEnum.PENDING, 0, 1)
@@ -0,0 +1,226 @@
+"""
+EXPLAIN based check that the hot queries of the app are served by indexes.
+
+The queries are explained against a throwaway SQLite database seeded with
+synthetic data, or against an existing, already seeded database (SQLite or
+PostgreSQL) given as ``QUERY_PLAN_DATABASE_URL``. A query that falls back to
+a full scan of the table it searches fails its test.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Callable, Optional
+
+import pytest
+from sqlalchemy import Select, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.database.models.base import Base
+from src.database.models.movies import (
+    CertificationModel,
+    DirectorModel,
+    GenreModel,
+    MovieModel,
+    StarModel,
+)
+from src.database.models.orders import (
+    OrderItemModel,
+    OrderModel,
+    OrderStatusEnum,
+    PurchasedMovieModel,
+)
+from src.database.models.payments import (
+    PaymentModel,
+    PaymentStatusEnum,
+    PaymentWebhookEventModel,
+)
+from src.database.models.users import RefreshTokenModel
+from src.database.synthetic import (
+    RARE_CERTIFICATION,
+    seed_synthetic,
+    seed_synthetic_orders,
+)
+from src.routes.movies import apply_movie_filters
+
+SEED_MOVIES = 10_000
+
+
+def _catalog_page(**filters) -> Select:
+    stmt = select(MovieModel.id).order_by(*MovieModel.default_order_by())
+    return apply_movie_filters(stmt, **filters).limit(21)
+
+
+def _orders_page(cursor: Optional[int] = None) -> Select:
+    stmt = select(
+        OrderModel.id, OrderModel.created_at, OrderModel.status, OrderModel.total_amount
+    ).where(OrderModel.user_id == 7)
+    if cursor is not None:
+        stmt = stmt.where(OrderModel.id < cursor)
+    return stmt.order_by(OrderModel.id.desc()).limit(21)
+
+
+# name -> (table expected to be searched, statement builder). Builders get the
+# ids of the reference rows used as filter values, as the routes resolve names
+# to ids before querying.
+HOT_QUERIES: dict[str, tuple[str, Callable[[dict], Select]]] = {
+    "movies by year": ("movies", lambda ids: _catalog_page(year=1994)),
+    "movies by imdb range": (
+        "movies",
+        lambda ids: _catalog_page(imdb_min=9.8, imdb_max=10),
+    ),
+    "movies by certification": (
+        "movies",
+        lambda ids: _catalog_page(certification_id=ids["certification"]),
+    ),
+    "movies by genre": (
+        "movie_genres",
+        lambda ids: _catalog_page(genre_id=ids["genre"]),
+    ),
+    "movies by star": (
+        "movie_stars",
+        lambda ids: _catalog_page(star_id=ids["star"]),
+    ),
+    "movies by director": (
+        "movie_directors",
+        lambda ids: _catalog_page(director_id=ids["director"]),
+    ),
+    "refresh tokens by user": (
+        "refresh_tokens",
+        lambda ids: select(RefreshTokenModel.id).where(RefreshTokenModel.user_id == 7),
+    ),
+    "expired refresh tokens": (
+        "refresh_tokens",
+        lambda ids: select(RefreshTokenModel.id)
+        .where(RefreshTokenModel.expires_at < datetime(2000, 1, 1))
+        .limit(500),
+    ),
+    "orders by user": ("orders", lambda ids: _orders_page()),
+    "orders by user after cursor": ("orders", lambda ids: _orders_page(cursor=20)),
+    "pending orders by user": (
+        "orders",
+        lambda ids: select(OrderModel.id).where(
+            OrderModel.user_id == 7, OrderModel.status == OrderStatusEnum.PENDING
+        ),
+    ),
+    "order items by order": (
+        "order_items",
+        lambda ids: select(
+            OrderItemModel.order_id, OrderItemModel.movie_id, MovieModel.name
+        )
+        .join(MovieModel, MovieModel.id == OrderItemModel.movie_id)
+        .where(OrderItemModel.order_id.in_([19, 20, 21]))
+        .order_by(OrderItemModel.order_id, OrderItemModel.id),
+    ),
+    "order items by movie": (
+        "order_items",
+        lambda ids: select(OrderItemModel.order_id).where(OrderItemModel.movie_id == 7),
+    ),
+    "pending payment by order": (
+        "payments",
+        lambda ids: select(PaymentModel.id).where(
+            PaymentModel.order_id == 21,
+            PaymentModel.status == PaymentStatusEnum.PENDING,
+        ),
+    ),
+    "payment by provider id": (
+        "payments",
+        lambda ids: select(PaymentModel.order_id).where(
+            PaymentModel.external_payment_id == "pay_synthetic_21"
+        ),
+    ),
+    "webhook event by id": (
+        "payment_webhook_events",
+        lambda ids: select(PaymentWebhookEventModel.id).where(
+            PaymentWebhookEventModel.event_id == "evt_1"
+        ),
+    ),
+    "owned movies by user": (
+        "purchased_movies",
+        lambda ids: select(PurchasedMovieModel.movie_id).where(
+            PurchasedMovieModel.user_id == 7,
+            PurchasedMovieModel.movie_id.in_([1, 2, 3]),
+        ),
+    ),
+    "owned movies by order": (
+        "purchased_movies",
+        lambda ids: select(PurchasedMovieModel.movie_id).where(
+            PurchasedMovieModel.order_id == 20
+        ),
+    ),
+}
+
+FILTER_VALUES = {
+    "certification": (CertificationModel, RARE_CERTIFICATION),
+    "genre": (GenreModel, "Western"),
+    "star": (StarModel, "Star 7"),
+    "director": (DirectorModel, "Director 7"),
+}
+
+
+async def explain(connection: AsyncConnection, stmt: Select) -> list[str]:
+    dialect = connection.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        result = await connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return [row[-1] for row in result]
+    result = await connection.execute(text(f"EXPLAIN {sql}"))
+    return [row[0] for row in result]
+
+
+def is_full_scan(plan: list[str], table: str) -> bool:
+    for line in plan:
+        # SQLite: "SCAN movies" or "SCAN movies USING COVERING INDEX ..." (a
+        # full index walk). PostgreSQL: "Seq Scan on movies".
+        if line.startswith(f"SCAN {table}") or f"Seq Scan on {table}" in line:
+            return True
+    return False
+
+
+async def explain_hot_queries(database_url: str, seed: bool) -> dict[str, list[str]]:
+    engine = create_async_engine(database_url)
+    try:
+        if seed:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await seed_synthetic(connection, SEED_MOVIES)
+                await seed_synthetic_orders(connection)
+        async with engine.connect() as connection:
+            await connection.execute(text("ANALYZE"))
+            ids = {}
+            for key, (model, value) in FILTER_VALUES.items():
+                result = await connection.execute(
+                    select(model.id).where(model.name == value)
+                )
+                ids[key] = result.scalar_one_or_none() or 0
+            plans = {
+                name: await explain(connection, build(ids))
+                for name, (_, build) in HOT_QUERIES.items()
+            }
+            plans["unindexed"] = await explain(
+                connection, select(MovieModel.id).where(MovieModel.votes > 1000)
+            )
+            return plans
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def plans(tmp_path_factory: pytest.TempPathFactory) -> dict[str, list[str]]:
+    database_url = os.getenv("QUERY_PLAN_DATABASE_URL")
+    if database_url:
+        return asyncio.run(explain_hot_queries(database_url, seed=False))
+    path = tmp_path_factory.mktemp("query-plans") / "plans.db"
+    return asyncio.run(explain_hot_queries(f"sqlite+aiosqlite:///{path}", seed=True))
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_avoids_full_scan(plans: dict[str, list[str]], name: str) -> None:
+    table, _ = HOT_QUERIES[name]
+    plan = plans[name]
+    assert not is_full_scan(plan, table), f"Full scan of {table}: {' | '.join(plan)}"
+
+
+def test_full_scan_is_detected(plans: dict[str, list[str]]) -> None:
+    # Movies are not indexed by votes; the check must notice the scan.
+    assert is_full_scan(plans["unindexed"], "movies")
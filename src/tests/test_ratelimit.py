@@ -0,0 +1,19 @@
+from src.ratelimit import MemoryRateLimitStore, Rate
+
+ONCE_A_MINUTE = Rate(1, 60)
+
+
+async def test_memory_store_evicts_the_least_recently_hit_buckets() -> None:
+    store = MemoryRateLimitStore(10, timer=lambda: 0)
+    for n in range(10):
+        assert (await store.hit(f"client-{n}", ONCE_A_MINUTE)).allowed
+    # A refused hit is still a hit: client 0 is now the most recent.
+    assert not (await store.hit("client-0", ONCE_A_MINUTE)).allowed
+
+    # The 11th bucket prunes the store to 9, dropping clients 1 and 2.
+    await store.hit("client-10", ONCE_A_MINUTE)
+
+    assert len(store) == 9
+    assert not (await store.hit("client-0", ONCE_A_MINUTE)).allowed
+    assert (await store.hit("client-1", ONCE_A_MINUTE)).allowed
+    assert not (await store.hit("client-3", ONCE_A_MINUTE)).allowed
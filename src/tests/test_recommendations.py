@@ -0,0 +1,193 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from src.database import AsyncSessionLocal
+from src.database.models.movies import (
+    MovieModel,
+    MoviesDirectorsModel,
+    MoviesGenresModel,
+    StarsMoviesModel,
+)
+from src.recommendations.engine import build_index, refresh_index
+from src.recommendations.index import FeatureEdges, RecommendationIndex
+
+
+@pytest.fixture
+def index() -> RecommendationIndex:
+    """
+    200 movies with even ids from 6 upwards, a few genres and directors each
+    and a long tail of stars; the first five have no features at all.
+    """
+    rng = np.random.default_rng(7)
+    movie_ids = np.arange(3, 203) * 2
+
+    def edges(entities: int, per_movie: int) -> FeatureEdges:
+        pairs = {
+            (int(movie_id), int(entity))
+            for movie_id in movie_ids[5:]
+            for entity in rng.integers(0, entities, rng.integers(1, per_movie + 1))
+        }
+        movies, entity_ids = zip(*sorted(pairs))
+        return FeatureEdges(np.array(movies), np.array(entity_ids))
+
+    return RecommendationIndex.build(
+        movie_ids, [edges(8, 3), edges(300, 5), edges(60, 2)], "marker"
+    )
+
+
+def assert_same_index(
+    actual: RecommendationIndex, expected: RecommendationIndex
+) -> None:
+    assert np.array_equal(actual.movie_ids, expected.movie_ids)
+    assert np.array_equal(actual.offsets, expected.offsets)
+    assert np.array_equal(actual.matrix.indptr, expected.matrix.indptr)
+    assert np.array_equal(actual.matrix.indices, expected.matrix.indices)
+    assert np.allclose(actual.matrix.data, expected.matrix.data)
+
+
+def brute_force(
+    index: RecommendationIndex, query: np.ndarray, excluded: set[int], k: int
+) -> list[tuple[int, float]]:
+    scores = index.matrix.toarray() @ query
+    ranked = sorted(
+        (
+            (int(movie_id), float(score))
+            for movie_id, score in zip(index.movie_ids, scores)
+            if score > 0 and int(movie_id) not in excluded
+        ),
+        key=lambda item: -item[1],
+    )
+    return ranked[:k]
+
+
+def assert_same_ranking(
+    actual: list[tuple[int, float]], expected: list[tuple[int, float]]
+) -> None:
+    # Ties may come in any order, so rankings are compared by score.
+    assert np.allclose([s for _, s in actual], [s for _, s in expected], atol=1e-5)
+
+
+def test_edges_round_trip(index: RecommendationIndex) -> None:
+    rebuilt = RecommendationIndex.build(index.movie_ids, index.edges())
+
+    assert_same_index(rebuilt, index)
+
+
+def test_saved_index_loads_through_mmap(
+    index: RecommendationIndex, tmp_path: Path
+) -> None:
+    path = str(tmp_path / "recommendations.idx")
+    index.save(path)
+
+    loaded = RecommendationIndex.load(path)
+
+    assert_same_index(loaded, index)
+    assert loaded.catalog_marker == "marker"
+    some = [int(movie_id) for movie_id in index.movie_ids[::17]]
+    assert loaded.similar(some) == index.similar(some)
+
+
+def test_similar_matches_brute_force_cosine(index: RecommendationIndex) -> None:
+    dense = index.matrix.toarray()
+    movie_ids = [int(movie_id) for movie_id in index.movie_ids] + [1, 5]
+
+    found = index.similar(movie_ids, k=8)
+
+    assert found[1] == found[5] == []
+    for row, movie_id in enumerate(index.movie_ids):
+        expected = brute_force(index, dense[row], {int(movie_id)}, 8)
+        actual = found[int(movie_id)]
+        assert_same_ranking(actual, expected)
+        scores = dict(zip(index.movie_ids.tolist(), dense @ dense[row]))
+        for neighbour, score in actual:
+            assert neighbour != movie_id
+            assert score == pytest.approx(scores[neighbour], abs=1e-5)
+
+
+def test_recommend_ranks_by_profile_and_skips_owned(
+    index: RecommendationIndex,
+) -> None:
+    rng = np.random.default_rng(11)
+    owned = [
+        [int(movie_id) for movie_id in rng.choice(index.movie_ids, size)]
+        for size in (1, 3, 10, 40)
+    ] + [[], [1, 999]]
+    dense = index.matrix.toarray()
+
+    results = index.recommend(owned, k=10)
+
+    assert results[-2:] == [[], []]
+    for movie_ids, result in zip(owned, results):
+        if not result:
+            continue
+        profile = dense[index.rows_for(movie_ids)].sum(axis=0)
+        profile /= np.linalg.norm(profile)
+        assert_same_ranking(result, brute_force(index, profile, set(movie_ids), 10))
+        assert not {movie_id for movie_id, _ in result} & set(movie_ids)
+
+
+async def test_refresh_matches_a_full_build(database: None) -> None:
+    async with AsyncSessionLocal() as session:
+        index = await build_index(session)
+        assert await refresh_index(session, index) is None
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=1)
+        # Movie 10 loses its genres and stars but one, movie 11 is deleted
+        # and a new movie copies movie 12's features.
+        for table in (MoviesGenresModel, StarsMoviesModel):
+            await session.execute(delete(table).where(table.c.movie_id == 10))
+        await session.execute(insert(StarsMoviesModel).values(movie_id=10, star_id=1))
+        await session.execute(
+            update(MovieModel).where(MovieModel.id == 10).values(updated_at=later)
+        )
+        for table in (MoviesGenresModel, StarsMoviesModel, MoviesDirectorsModel):
+            await session.execute(delete(table).where(table.c.movie_id == 11))
+        await session.execute(delete(MovieModel).where(MovieModel.id == 11))
+        template = (
+            await session.execute(select(MovieModel).where(MovieModel.id == 12))
+        ).scalar_one()
+        new_id = await session.scalar(
+            insert(MovieModel)
+            .values(
+                uuid=uuid.uuid4(),
+                name="Copy",
+                year=template.year,
+                time=template.time,
+                imdb=template.imdb,
+                votes=template.votes,
+                description=template.description,
+                price=template.price,
+                certification_id=template.certification_id,
+                updated_at=later,
+            )
+            .returning(MovieModel.id)
+        )
+        for table, column in (
+            (MoviesGenresModel, "genre_id"),
+            (StarsMoviesModel, "star_id"),
+            (MoviesDirectorsModel, "director_id"),
+        ):
+            await session.execute(
+                insert(table).from_select(
+                    ["movie_id", column],
+                    select(MovieModel.id, table.c[column])
+                    .select_from(table)
+                    .join(MovieModel, MovieModel.id == new_id)
+                    .where(table.c.movie_id == 12),
+                )
+            )
+        await session.commit()
+
+        refreshed = await refresh_index(session, index)
+        rebuilt = await build_index(session)
+
+    assert refreshed is not None
+    assert 11 not in refreshed.movie_ids
+    assert_same_index(refreshed, rebuilt)
+    assert refreshed.catalog_marker == rebuilt.catalog_marker
+    assert dict(refreshed.similar([new_id])[new_id])[12] == pytest.approx(1.0)